@@ -17,10 +17,125 @@ SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
+# Seconds per blocking SMTP socket operation (connect, STARTTLS, login, send)
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
 
 # Database paths (hardcoded, will be in git)
 PORTFOLIO_DB_PATH = "portfolio.db"
 ALERTS_DB_PATH = "alerts.db"
+TX_DB_PATH = "transactions.db"
 
 # API endpoints
 COINGECKO_MCP_URL = os.getenv("COINGECKO_MCP_URL", "https://mcp.api.coingecko.com/mcp")
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+
+# Alert checker: max CoinGecko ids per /simple/price request
+COINGECKO_PRICE_BATCH_SIZE = int(os.getenv("COINGECKO_PRICE_BATCH_SIZE", "50"))
+
+# CoinGecko symbol -> id index: refresh interval (seconds) and how many
+# 250-coin pages of /coins/markets supply market-cap ranks
+COIN_INDEX_TTL = float(os.getenv("COIN_INDEX_TTL", "86400"))
+COIN_INDEX_RANK_PAGES = int(os.getenv("COIN_INDEX_RANK_PAGES", "4"))
+
+# Combine all of a recipient's alerts triggered in one check into one email
+ALERT_EMAIL_DIGEST = os.getenv("ALERT_EMAIL_DIGEST", "1") == "1"
+
+# Alert email outbox delivery
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "30"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+# Seconds a claimed row may sit in 'sending' before it is presumed lost.
+# Renewed before every send, and kept well above SMTP_TIMEOUT: one send
+# (reconnect, STARTTLS, login, resend) may wait out several timeouts
+OUTBOX_LEASE_SECONDS = max(
+    float(os.getenv("OUTBOX_LEASE_SECONDS", "300")), 10 * SMTP_TIMEOUT
+)
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+
+# Resident alert daemon schedule (seconds)
+ALERT_POLL_INTERVAL = float(os.getenv("ALERT_POLL_INTERVAL", "60"))
+ALERT_POLL_JITTER = float(os.getenv("ALERT_POLL_JITTER", "5"))
+
+# Chain scanner endpoints
+ETHERSCAN_API_URL = os.getenv("ETHERSCAN_API_URL", "https://api.etherscan.io/v2/api")
+# Etherscan caps action=balancemulti at 20 addresses per request
+ETHERSCAN_BALANCEMULTI_SIZE = int(os.getenv("ETHERSCAN_BALANCEMULTI_SIZE", "20"))
+BLOCKSTREAM_API_URL = os.getenv("BLOCKSTREAM_API_URL", "https://blockstream.info/api")
+SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+# Addresses per getMultipleAccounts request (the RPC maximum is 100), and
+# calls per JSON-RPC batch request
+SOLANA_RPC_BATCH_SIZE = int(os.getenv("SOLANA_RPC_BATCH_SIZE", "100"))
+# Confirmed txs per Esplora /txs page. Fixed by the server (25 on
+# blockstream.info and mempool.space), not a setting: a shorter page is how
+# the pager knows the history has ended.
+BTC_TXS_PAGE_SIZE = 25
+
+# Shared HTTP client: pooled hosts, connections kept per host, and
+# connect / read timeouts (seconds)
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "12"))
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36",
+)
+
+# Per-host request rates (requests/second) enforced by the shared HTTP
+# client; hosts not listed are unthrottled. Override with
+# HTTP_RATE_LIMITS="api.etherscan.io=5,blockstream.info=4"
+HTTP_RATE_LIMITS = {
+    "api.etherscan.io": 5.0,
+    "blockstream.info": 4.0,
+    "api.mainnet-beta.solana.com": 4.0,
+    "api.coingecko.com": 0.5,
+    "api.dexscreener.com": 5.0,
+    "api.alternative.me": 1.0,
+}
+for _item in filter(None, os.getenv("HTTP_RATE_LIMITS", "").split(",")):
+    _host, _, _rate = _item.partition("=")
+    HTTP_RATE_LIMITS[_host.strip().lower()] = float(_rate)
+
+# Retries after 429/503: attempts, and backoff (seconds) when the response
+# has no Retry-After
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+
+# Chain scans: overall deadline (seconds) for a scan's concurrent upstream
+# requests, and the thread pool they share
+SCAN_DEADLINE = float(os.getenv("SCAN_DEADLINE", "15"))
+SCAN_LEG_WORKERS = int(os.getenv("SCAN_LEG_WORKERS", "16"))
+
+# Scan result cache: max entries, max age (seconds), and how often each
+# chain's tip height is re-polled to invalidate entries
+SCAN_CACHE_SIZE = int(os.getenv("SCAN_CACHE_SIZE", "1024"))
+SCAN_CACHE_TTL = float(os.getenv("SCAN_CACHE_TTL", "30"))
+SCAN_TIP_POLL_INTERVAL = float(os.getenv("SCAN_TIP_POLL_INTERVAL", "5"))
+# Approximate seconds per block. A chain producing blocks faster than
+# SCAN_CACHE_TTL moves its tip on nearly every poll, so its entries rely
+# on the TTL alone instead of paying a tip request per cache hit
+CHAIN_BLOCK_TIMES = {
+    "btc": 600,
+    "ethereum": 12,
+    "polygon": 2,
+    "bsc": 3,
+    "arbitrum": 0.25,
+    "optimism": 2,
+    "base": 2,
+    "avalanche": 2,
+}
+
+# Portfolio refresh: worker threads, jobs in flight per address family,
+# and the overall deadline (seconds) after which unfinished addresses fall
+# back to their last stored balance.
+# PORTFOLIO_FAMILY_CONCURRENCY="btc=4,evm=2"
+PORTFOLIO_REFRESH_WORKERS = int(os.getenv("PORTFOLIO_REFRESH_WORKERS", "8"))
+PORTFOLIO_FAMILY_CONCURRENCY = {"evm": 2, "btc": 4, "solana": 2}
+for _item in filter(None, os.getenv("PORTFOLIO_FAMILY_CONCURRENCY", "").split(",")):
+    _family, _, _cap = _item.partition("=")
+    PORTFOLIO_FAMILY_CONCURRENCY[_family.strip().lower()] = int(_cap)
+PORTFOLIO_REFRESH_DEADLINE = float(os.getenv("PORTFOLIO_REFRESH_DEADLINE", "20"))
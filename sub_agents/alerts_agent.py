@@ -3,16 +3,36 @@ from google.adk.agents import LlmAgent
 from google.adk.tools import FunctionTool, ToolContext
 
 from ..config import DEFAULT_MODEL
-from .helper_func_tools.alert_storage import add_alert, cancel_alert, get_active_alerts
+from .helper_func_tools.alert_storage import (
+    add_alert,
+    cancel_alert,
+    get_active_alerts,
+    get_alerts_for_email,
+)
 from .helper_func_tools.smtp_tools import send_email
 from .helper_func_tools.alert_tools import run_alert_checker_tool
+from .helper_func_tools.coin_index import index_available, resolve_coin_id
 
 
 
 def tool_add_alert(token: str, target: float, direction: str, email: str,
                    tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
-    add_alert(token, target, direction, email)
-    return {"status": "saved"}
+    coin_id = resolve_coin_id(token)
+    if not coin_id and index_available():
+        return {
+            "status": "error",
+            "error": f"Could not find '{token}' on CoinGecko. Try the full coin name.",
+        }
+    add_alert(token, target, direction, email, coin_id=coin_id)
+    if not coin_id:
+        # CoinGecko's coin list could not be downloaded; the alert checker
+        # resolves the token once it can
+        return {
+            "status": "saved",
+            "coin_id": None,
+            "note": "CoinGecko is unreachable right now; the token will be resolved on the next check.",
+        }
+    return {"status": "saved", "coin_id": coin_id}
 
 
 def tool_cancel_alert(token: str, tool_context: Optional[ToolContext] = None):
@@ -20,7 +40,9 @@ def tool_cancel_alert(token: str, tool_context: Optional[ToolContext] = None):
     return {"status": "cancelled"}
 
 
-def tool_list_alerts(tool_context: Optional[ToolContext] = None):
+def tool_list_alerts(email: Optional[str] = None, tool_context: Optional[ToolContext] = None):
+    if email:
+        return {"alerts": get_alerts_for_email(email)}
     return {"alerts": get_active_alerts()}
 
 
@@ -68,7 +90,7 @@ Workflow:
    - Call cancel_alert tool.
 
 3. When user says "show alerts":
-   - Call list_alerts tool.
+   - Call list_alerts tool (pass the user's email if they gave one).
 
 4. When user says "check alerts now":
    - Call run_alert_checker_script tool.
@@ -81,7 +103,7 @@ alerts_agent = LlmAgent(
     model=DEFAULT_MODEL,
     name="alerts_agent",
     instruction=ALERT_AGENT_INSTRUCTIONS,
-    description="Sets and manages price alerts for tokens using DB + SMTP + one-shot price checker script.",
+    description="Sets and manages price alerts for tokens using DB + SMTP + an in-process one-shot price checker.",
     tools=[
         add_alert_tool,
         cancel_alert_tool,
@@ -1,53 +1,80 @@
-from google.adk.agents import LlmAgent, SequentialAgent
+import re
+from typing import Any, AsyncGenerator, Dict
+
+from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 
 from ..config import DEFAULT_MODEL
+from .helper_func_tools.address_classifier import extract_addresses
 from .helper_func_tools.general_helper_tools import (
-    evm_scan_tool,
-    btc_scan_tool,
-    sol_scan_tool,
+    CHAIN_IDS,
+    btc_scan_address_async,
+    evm_scan_address_async,
+    evm_scan_all_chains_async,
+    sol_scan_address_async,
 )
 
 
-SCAN_INSTRUCTION = """
-You are the BLOCKCHAIN SCAN AGENT.
-
-Goal:
-- Given a single public address from the user,
-  detect which chain it belongs to (BTC / EVM / Solana),
-  then call the correct FunctionTool.
-
-Detection rules:
-- If address starts with '0x' and length ~42  -> EVM.
-- If address starts with 'bc1', '1', or '3'   -> BTC.
-- Otherwise (base58-like, length ~32–44)      -> Solana.
-
-What to do:
-1. Extract the address from the user message.
-2. Decide its family (btc / evm / solana).
-3. Call exactly one of:
-     - evm_scan_address(address, chain="ethereum", limit=20)  # unless user says another EVM chain
-     - btc_scan_address(address, limit=20)
-     - sol_scan_address(address, limit=20)
-4. Store the tool's return JSON into state as 'blockchain_scan_snapshot'.
-5. Do NOT explain the result; just perform the scan.
-"""
+_CHAIN_NAME_RE = re.compile(r"\b(" + "|".join(map(re.escape, CHAIN_IDS)) + r")\b", re.IGNORECASE)
 
-blockchain_scan_agent = LlmAgent(
-    model=DEFAULT_MODEL,
+
+async def scan_request(text: str) -> Dict[str, Any]:
+    """
+    Scan the first valid address in `text` with its family's scanner.
+
+    EVM addresses are scanned on the chain the text names, or on every
+    chain if it names none. Failures come back as {"error": ...} so the
+    summary step can report them.
+    """
+    addresses = extract_addresses(text)
+    if not addresses:
+        return {"error": "No valid EVM, Bitcoin or Solana address found in the request."}
+
+    address, family = addresses[0]
+    try:
+        if family == "evm":
+            named = _CHAIN_NAME_RE.search(text)
+            if named:
+                return await evm_scan_address_async(address, chain=named.group(1).lower())
+            return await evm_scan_all_chains_async(address)
+        if family == "btc":
+            return await btc_scan_address_async(address)
+        return await sol_scan_address_async(address)
+    except Exception as e:
+        return {"family": family, "address": address, "error": str(e) or type(e).__name__}
+
+
+class AddressScanAgent(BaseAgent):
+    """
+    Routes an address check without a model call: the address is found
+    and classified deterministically (address_classifier) and the
+    matching scanner's snapshot goes to state['blockchain_scan_snapshot'].
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        parts = ctx.user_content.parts if ctx.user_content and ctx.user_content.parts else []
+        snapshot = await scan_request(" ".join(p.text for p in parts if p.text))
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={"blockchain_scan_snapshot": snapshot}),
+        )
+
+
+blockchain_scan_agent = AddressScanAgent(
     name="blockchain_scan_agent",
-    instruction=SCAN_INSTRUCTION,
     description="Detects chain from address and scans it with the correct helper tool.",
-    tools=[evm_scan_tool, btc_scan_tool, sol_scan_tool],
-    output_key="blockchain_scan_snapshot",
 )
 
 
-
 SUMMARY_INSTRUCTION = """
 You are the BLOCKCHAIN TRANSACTION SUMMARY AGENT.
 
 Context:
-- 'blockchain_scan_snapshot' is already in state.
+- The scan result ('blockchain_scan_snapshot'):
+  {blockchain_scan_snapshot}
   It has fields like:
   {
     "family": "evm" | "btc" | "solana",
@@ -57,7 +84,14 @@ Context:
     "native_unit": "wei" | "sats" | "lamports",
     "tx_count": N,
     "latest_timestamp": 1234567890,
-    "transactions": [...]
+    "transactions": [...],
+    "error": "..."   # only present if part of the scan failed
+  }
+  or, for an EVM address scanned on every chain:
+  {
+    "address": "...",
+    "active_chains": ["polygon", ...],
+    "chains": [<one snapshot like the above per chain>, ...]
   }
 
 Your job:
@@ -67,7 +101,11 @@ Your job:
     * how many recent transactions we saw,
     * how recent the last activity is (roughly),
     * 1-3 example transactions (direction + approximate size),
+- For a multi-chain scan, summarize each chain in "active_chains" and
+  just list the chains with no activity.
 - For BTC/SOL, you usually only have txid and time; describe confirmed vs unconfirmed.
+- If "error" is present, say which data is missing instead of treating it as zero.
+  If there is nothing but an "error", explain it (e.g. no valid address given).
 - Keep it concise (under ~250 words).
 - Do NOT provide financial advice; only describe activity.
 """
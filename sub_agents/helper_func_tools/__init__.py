@@ -1,11 +1,25 @@
 from .general_helper_tools import (
     evm_scan_tool,
+    evm_multichain_scan_tool,
     btc_scan_tool,
     sol_scan_tool,
     evm_scan_address,
+    evm_get_balances,
+    sol_get_balances,
+    sol_get_signatures,
     btc_scan_address,
     sol_scan_address,
+    evm_scan_address_async,
+    evm_scan_chains_async,
+    evm_scan_all_chains_async,
+    btc_scan_address_async,
+    sol_scan_address_async,
+    btc_tx_pages,
+    btc_tx_pages_async,
 )
+from .scan_cache import scan_cache_stats
+from .rate_limit import rate_limit_stats
+from .single_flight import single_flight_stats
 from .alert_storage import (
     add_alert,
     cancel_alert,
@@ -13,23 +27,40 @@ from .alert_storage import (
     mark_triggered,
     init_db,
 )
+from .alert_checker import run_alert_check, run_alert_check_async
 from .alert_tools import run_alert_checker_tool
 from .smtp_tools import send_email
 
 __all__ = [
     # Blockchain scan tools
     "evm_scan_tool",
+    "evm_multichain_scan_tool",
     "btc_scan_tool",
     "sol_scan_tool",
     "evm_scan_address",
+    "evm_get_balances",
+    "sol_get_balances",
+    "sol_get_signatures",
     "btc_scan_address",
     "sol_scan_address",
+    "evm_scan_address_async",
+    "evm_scan_chains_async",
+    "evm_scan_all_chains_async",
+    "btc_scan_address_async",
+    "sol_scan_address_async",
+    "btc_tx_pages",
+    "btc_tx_pages_async",
+    "scan_cache_stats",
+    "rate_limit_stats",
+    "single_flight_stats",
     # Alert management
     "add_alert",
     "cancel_alert",
     "get_active_alerts",
     "mark_triggered",
     "init_db",
+    "run_alert_check",
+    "run_alert_check_async",
     "run_alert_checker_tool",
     # Email
     "send_email",
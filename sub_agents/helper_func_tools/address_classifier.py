@@ -0,0 +1,231 @@
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+# Deterministic address detection for the three families the scanners
+# support, with real validation rather than prefix/length guesses:
+#   evm     -> 0x + 40 hex; mixed case must match its EIP-55 checksum
+#   btc     -> bech32/bech32m segwit (bc1...) or base58check P2PKH/P2SH
+#   solana  -> base58 string decoding to a 32-byte public key
+
+# ---- Keccak-256 (EIP-55 needs the original Keccak padding, which
+# hashlib.sha3_256 does not use) ----
+
+_KECCAK_ROUNDS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+# Rotation offsets, indexed [x][y]
+_KECCAK_ROTATIONS = (
+    (0, 36, 3, 41, 18),
+    (1, 44, 10, 45, 2),
+    (62, 6, 43, 15, 61),
+    (28, 55, 25, 21, 56),
+    (27, 20, 39, 8, 14),
+)
+_MASK64 = (1 << 64) - 1
+_KECCAK_RATE = 136
+
+
+def _rotl(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (64 - shift))) & _MASK64 if shift else value
+
+
+def _keccak_f(lanes: List[int]) -> List[int]:
+    # lanes[x + 5 * y]
+    for rc in _KECCAK_ROUNDS:
+        c = [lanes[x] ^ lanes[x + 5] ^ lanes[x + 10] ^ lanes[x + 15] ^ lanes[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ _rotl(c[(x + 1) % 5], 1) for x in range(5)]
+        lanes = [lanes[i] ^ d[i % 5] for i in range(25)]
+
+        b = [0] * 25
+        for x in range(5):
+            for y in range(5):
+                b[y + 5 * ((2 * x + 3 * y) % 5)] = _rotl(lanes[x + 5 * y], _KECCAK_ROTATIONS[x][y])
+
+        lanes = [
+            b[i] ^ ((b[(i + 1) % 5 + i - i % 5] ^ _MASK64) & b[(i + 2) % 5 + i - i % 5])
+            for i in range(25)
+        ]
+        lanes[0] ^= rc
+    return lanes
+
+
+def keccak256(data: bytes) -> bytes:
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % _KECCAK_RATE))
+    padded[-1] |= 0x80
+
+    lanes = [0] * 25
+    for start in range(0, len(padded), _KECCAK_RATE):
+        block = padded[start:start + _KECCAK_RATE]
+        for i in range(_KECCAK_RATE // 8):
+            lanes[i] ^= int.from_bytes(block[8 * i:8 * i + 8], "little")
+        lanes = _keccak_f(lanes)
+    return b"".join(lane.to_bytes(8, "little") for lane in lanes[:4])
+
+
+# ---- EVM ----
+
+_EVM_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+def evm_checksum_address(address: str) -> str:
+    """
+    EIP-55 mixed-case form of a 0x address.
+    """
+    body = address[2:].lower()
+    digest = keccak256(body.encode()).hex()
+    return "0x" + "".join(
+        ch.upper() if ch.isalpha() and int(digest[i], 16) >= 8 else ch
+        for i, ch in enumerate(body)
+    )
+
+
+def is_evm_address(address: str) -> bool:
+    if not _EVM_RE.match(address):
+        return False
+    body = address[2:]
+    if body == body.lower() or body == body.upper():
+        # No checksum to verify
+        return True
+    return evm_checksum_address(address) == address
+
+
+# ---- Bitcoin ----
+
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_CONST = 1
+_BECH32M_CONST = 0x2BC830A3
+
+
+def _bech32_polymod(values: List[int]) -> int:
+    generator = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= generator[i]
+    return chk
+
+
+def _convert_bits(data: List[int], from_bits: int, to_bits: int) -> Optional[List[int]]:
+    # Regroup 5-bit words into bytes; None on non-zero padding
+    acc = bits = 0
+    out: List[int] = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            out.append((acc >> bits) & maxv)
+    if bits >= from_bits or (acc << (to_bits - bits)) & maxv:
+        return None
+    return out
+
+
+def _is_segwit_address(address: str, hrp: str = "bc") -> bool:
+    if address.lower() != address and address.upper() != address:
+        return False
+    address = address.lower()
+    pos = address.rfind("1")
+    if address[:pos] != hrp or pos + 7 > len(address) or len(address) > 90:
+        return False
+    if any(ch not in _BECH32_CHARSET for ch in address[pos + 1:]):
+        return False
+
+    data = [_BECH32_CHARSET.index(ch) for ch in address[pos + 1:]]
+    expanded = [ord(ch) >> 5 for ch in hrp] + [0] + [ord(ch) & 31 for ch in hrp]
+    const = _bech32_polymod(expanded + data)
+    version, program = data[0], _convert_bits(data[1:-6], 5, 8)
+    if program is None or version > 16 or not 2 <= len(program) <= 40:
+        return False
+    if version == 0:
+        return const == _BECH32_CONST and len(program) in (20, 32)
+    return const == _BECH32M_CONST
+
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {ch: i for i, ch in enumerate(_BASE58_ALPHABET)}
+
+
+def b58decode(text: str) -> Optional[bytes]:
+    """
+    Base58 (Bitcoin alphabet) to bytes; None if `text` is not base58.
+    """
+    num = 0
+    for ch in text:
+        digit = _BASE58_INDEX.get(ch)
+        if digit is None:
+            return None
+        num = num * 58 + digit
+    body = num.to_bytes((num.bit_length() + 7) // 8, "big") if num else b""
+    return b"\x00" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def _is_base58check_address(address: str) -> bool:
+    raw = b58decode(address)
+    if raw is None or len(raw) != 25 or raw[0] not in (0x00, 0x05):
+        return False
+    payload, checksum = raw[:-4], raw[-4:]
+    return hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] == checksum
+
+
+def is_btc_address(address: str) -> bool:
+    if address[:3].lower() == "bc1":
+        return _is_segwit_address(address)
+    return address[:1] in ("1", "3") and _is_base58check_address(address)
+
+
+# ---- Solana ----
+
+def is_solana_address(address: str) -> bool:
+    if not 32 <= len(address) <= 44:
+        return False
+    raw = b58decode(address)
+    return raw is not None and len(raw) == 32
+
+
+def classify_address(address: str) -> Optional[str]:
+    """
+    "evm", "btc" or "solana" for a valid address, else None.
+    """
+    address = (address or "").strip()
+    if address.startswith("0x"):
+        return "evm" if is_evm_address(address) else None
+    if is_btc_address(address):
+        return "btc"
+    if is_solana_address(address):
+        return "solana"
+    return None
+
+
+# Candidates only; every match is validated by classify_address
+_CANDIDATE_RE = re.compile(
+    r"0x[0-9a-fA-F]{40}(?![0-9a-zA-Z])"
+    r"|(?<![0-9a-zA-Z])(?:bc1|BC1)[0-9a-zA-Z]{6,87}(?![0-9a-zA-Z])"
+    r"|(?<![0-9a-zA-Z])[1-9A-HJ-NP-Za-km-z]{25,44}(?![0-9a-zA-Z])"
+)
+
+
+def extract_addresses(text: str) -> List[Tuple[str, str]]:
+    """
+    Every valid (address, family) in `text`, in order, without repeats.
+    """
+    found: List[Tuple[str, str]] = []
+    seen = set()
+    for match in _CANDIDATE_RE.finditer(text or ""):
+        address = match.group()
+        family = classify_address(address)
+        if family is not None and address not in seen:
+            seen.add(address)
+            found.append((address, family))
+    return found
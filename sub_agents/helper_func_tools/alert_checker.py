@@ -0,0 +1,321 @@
+import asyncio
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import requests
+
+from ...config import COINGECKO_API_URL, COINGECKO_PRICE_BATCH_SIZE
+from . import alert_storage, http_client
+from .alert_index import AlertIndex, price_key
+from .alert_storage import get_active_alerts, trigger_alert
+from .coin_index import backfill_alert_coin_ids
+from .outbox_sender import drain_outbox
+
+
+def get_prices(
+    tokens: Iterable[str],
+    api_url: Optional[str] = None,
+) -> Tuple[Dict[str, float], int]:
+    """
+    Fetch USD prices for many tokens with chunked /simple/price requests.
+
+    Tokens are de-duplicated (case-insensitive) and sent
+    COINGECKO_PRICE_BATCH_SIZE ids at a time. A failing chunk is skipped so
+    the remaining chunks still resolve.
+
+    `tokens` should be CoinGecko ids (see coin_index / price_key).
+    `api_url` overrides COINGECKO_API_URL.
+
+    Returns (prices, upstream_calls) where prices maps the lower-cased
+    id -> USD price. Ids CoinGecko doesn't know are simply absent.
+    """
+    api_url = api_url or COINGECKO_API_URL
+    ids = sorted({t.lower() for t in tokens if t})
+    prices: Dict[str, float] = {}
+    calls = 0
+
+    for i in range(0, len(ids), COINGECKO_PRICE_BATCH_SIZE):
+        chunk = ids[i:i + COINGECKO_PRICE_BATCH_SIZE]
+        calls += 1
+        try:
+            data = http_client.get_json(
+                f"{api_url}/simple/price",
+                params={"ids": ",".join(chunk), "vs_currencies": "usd"},
+                timeout=10,
+            ) or {}
+        except (requests.RequestException, ValueError):
+            continue
+
+        for coin_id, quote in data.items():
+            usd = (quote or {}).get("usd")
+            if usd is not None:
+                prices[coin_id] = float(usd)
+
+    return prices, calls
+
+
+async def get_prices_async(tokens: Iterable[str]) -> Tuple[Dict[str, float], int]:
+    """
+    get_prices on the shared async client, with all chunks in flight at
+    once (the per-host rate limiter still spaces them out).
+    """
+    ids = sorted({t.lower() for t in tokens if t})
+    chunks = [
+        ids[i:i + COINGECKO_PRICE_BATCH_SIZE]
+        for i in range(0, len(ids), COINGECKO_PRICE_BATCH_SIZE)
+    ]
+
+    async def fetch(chunk: List[str]) -> Dict[str, Any]:
+        try:
+            return await http_client.aget_json(
+                f"{COINGECKO_API_URL}/simple/price",
+                params={"ids": ",".join(chunk), "vs_currencies": "usd"},
+                timeout=10,
+            ) or {}
+        except (httpx.HTTPError, ValueError):
+            return {}
+
+    prices: Dict[str, float] = {}
+    for data in await asyncio.gather(*(fetch(c) for c in chunks)):
+        for coin_id, quote in data.items():
+            usd = (quote or {}).get("usd")
+            if usd is not None:
+                prices[coin_id] = float(usd)
+
+    return prices, len(chunks)
+
+
+def get_price(token: str) -> float:
+    prices, _ = get_prices([token])
+    return prices[token.lower()]
+
+
+def is_hit(alert: Dict[str, Any], price: float) -> bool:
+    target = alert["target"]
+    direction = alert["direction"]
+    return (
+        price >= target if direction == "above"
+        else price <= target if direction == "below"
+        else False
+    )
+
+
+def evaluate_alerts(
+    alerts: Iterable[Dict[str, Any]],
+    prices: Dict[str, float],
+) -> List[Dict[str, Any]]:
+    """
+    Linear scan: every alert whose token has a price and whose condition
+    holds. AlertIndex.match is the indexed equivalent.
+    """
+    hits: List[Dict[str, Any]] = []
+    for a in alerts:
+        price = prices.get(price_key(a))
+        if price is not None and is_hit(a, price):
+            hits.append(a)
+    return hits
+
+
+def format_alert_email(alert: Dict[str, Any], price: float) -> Tuple[str, str]:
+    token = alert["token"]
+    subject = f"ALERT: {token} price hit target!"
+    body = (
+        f"Your alert for {token} ({alert['direction']} {alert['target']}) has been triggered.\n"
+        f"Current price: ${price}\n"
+    )
+    return subject, body
+
+
+def run_alert_check(
+    index: Optional[AlertIndex] = None,
+    deliver: bool = True,
+) -> Dict[str, Any]:
+    """
+    Evaluate every active alert against one batched price snapshot.
+
+    Without an index the alerts table is read and scanned linearly, after
+    resolving CoinGecko ids for active rows stored without one. A resident
+    caller (the alert daemon) can pass a loaded AlertIndex so each token's
+    triggered set comes from a bisect instead.
+
+    A hit is marked triggered and its email queued in the outbox in one
+    transaction; mail delivery is decoupled from evaluation. With
+    deliver=True (one-shot checks) the outbox is drained before returning;
+    the daemon passes deliver=False and drains it in the background.
+    """
+    alerts, keys = _check_inputs(index)
+    if not keys:
+        return _no_alerts(deliver)
+
+    # One lookup per distinct coin, shared by every alert on that coin
+    prices, upstream_calls = get_prices(keys)
+    return _finish_check(index, alerts, keys, prices, upstream_calls, deliver)
+
+
+def _check_inputs(index: Optional[AlertIndex]) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    # (alerts, price keys); alerts is None when an index supplies them
+    if index is not None:
+        return None, index.keys()
+    # Rows stored without a CoinGecko id would be priced by their symbol
+    backfill_alert_coin_ids()
+    alerts = get_active_alerts()
+    return alerts, sorted({price_key(a) for a in alerts})
+
+
+def _no_alerts(deliver: bool) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"status": "no-alerts", "upstream_calls": 0}
+    if deliver:
+        # Still retry anything left in the outbox by earlier checks
+        result["delivery"] = drain_outbox()
+    return result
+
+
+def _finish_check(
+    index: Optional[AlertIndex],
+    alerts: Optional[List[Dict[str, Any]]],
+    keys: List[str],
+    prices: Dict[str, float],
+    upstream_calls: int,
+    deliver: bool,
+) -> Dict[str, Any]:
+    if index is not None:
+        hits = [
+            (a, prices[k])
+            for k in keys if k in prices
+            for a in index.match(k, prices[k])
+        ]
+    else:
+        hits = [(a, prices[price_key(a)]) for a in evaluate_alerts(alerts, prices)]
+
+    triggered: List[int] = []
+    for alert, price in hits:
+        subject, body = format_alert_email(alert, price)
+        if trigger_alert(alert["id"], alert["email"], subject, body):
+            triggered.append(alert["id"])
+
+    result = {
+        "status": "completed",
+        "triggered": triggered,
+        "checked": len(index) if index is not None else len(alerts),
+        "tokens": len(keys),
+        "upstream_calls": upstream_calls,
+        "unpriced_tokens": [k for k in keys if k not in prices],
+    }
+    if deliver:
+        result["delivery"] = drain_outbox()
+    return result
+
+
+def shard_of(alert: Dict[str, Any], shards: int, by: str = "token") -> int:
+    """
+    Stable shard number for an alert. crc32 (unlike hash()) is identical
+    in every process, so partitions never overlap.
+    """
+    key = price_key(alert) if by == "token" else str(alert["id"])
+    return zlib.crc32(key.encode()) % shards
+
+
+def _check_shard(db_name: str, api_url: str, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Worker: price and evaluate one shard. Runs in a child process.
+
+    The database and price endpoint are passed in rather than inherited:
+    under spawn/forkserver the child re-imports this module and would
+    otherwise see the configured defaults.
+    """
+    alert_storage.DB_NAME = db_name
+    keys = sorted({price_key(a) for a in alerts})
+    prices, upstream_calls = get_prices(keys, api_url=api_url)
+    return _finish_check(None, alerts, keys, prices, upstream_calls, deliver=False)
+
+
+def run_alert_check_sharded(
+    shards: Optional[int] = None,
+    by: str = "token",
+    deliver: bool = True,
+) -> Dict[str, Any]:
+    """
+    Evaluate active alerts split across a process pool.
+
+    Alerts are partitioned by a stable hash of their price key (by="token",
+    the default: each coin is priced by exactly one worker) or of their id
+    (by="id": even shard sizes, but a coin may be priced by several
+    workers). Partitions are disjoint, so no alert is evaluated twice, and
+    trigger_alert only flips still-active rows, so concurrent workers can't
+    double-trigger.
+    """
+    if by not in ("token", "id"):
+        raise ValueError("by must be 'token' or 'id'")
+    shards = max(1, shards or os.cpu_count() or 1)
+
+    backfill_alert_coin_ids()
+    alerts = get_active_alerts()
+    partitions: List[List[Dict[str, Any]]] = [[] for _ in range(shards)]
+    for a in alerts:
+        partitions[shard_of(a, shards, by)].append(a)
+    partitions = [p for p in partitions if p]
+
+    result: Dict[str, Any] = {
+        "status": "completed" if alerts else "no-alerts",
+        "triggered": [],
+        "checked": 0,
+        "upstream_calls": 0,
+        "unpriced_tokens": [],
+        "shards": len(partitions),
+    }
+    if partitions:
+        with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+            futures = [
+                pool.submit(_check_shard, alert_storage.DB_NAME, COINGECKO_API_URL, p)
+                for p in partitions
+            ]
+            for future in futures:
+                part = future.result()
+                result["triggered"].extend(part["triggered"])
+                result["checked"] += part["checked"]
+                result["upstream_calls"] += part["upstream_calls"]
+                result["unpriced_tokens"].extend(part["unpriced_tokens"])
+        result["unpriced_tokens"].sort()
+
+    if deliver:
+        result["delivery"] = drain_outbox()
+    return result
+
+
+def run_alert_check_timed() -> Dict[str, Any]:
+    """
+    Run one alert check in-process and report how long it took.
+    """
+    started = time.perf_counter()
+    result = run_alert_check()
+    return {
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "result": result,
+    }
+
+
+async def run_alert_check_async() -> Dict[str, Any]:
+    """
+    Async entry point for the alert checker.
+
+    Prices are fetched on the shared async HTTP client; the SQLite and
+    SMTP work around it runs in worker threads, so the caller's event loop
+    stays responsive throughout.
+    """
+    started = time.perf_counter()
+    alerts, keys = await asyncio.to_thread(_check_inputs, None)
+    if not keys:
+        result = await asyncio.to_thread(_no_alerts, True)
+    else:
+        prices, upstream_calls = await get_prices_async(keys)
+        result = await asyncio.to_thread(
+            _finish_check, None, alerts, keys, prices, upstream_calls, True
+        )
+    return {
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "result": result,
+    }
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import random
+import signal
+import time
+from typing import Any, Dict, Optional
+
+from ...config import ALERT_POLL_INTERVAL, ALERT_POLL_JITTER
+from .alert_checker import run_alert_check
+from .alert_index import AlertIndex
+from .alert_storage import count_active_alerts, outbox_stats
+from .coin_index import backfill_alert_coin_ids
+from .outbox_sender import run_outbox_sender
+
+logger = logging.getLogger(__name__)
+
+
+class AlertDaemon:
+    """
+    Resident alert checker that evaluates all active alerts on a fixed
+    schedule.
+
+    - Cycles start every `interval` seconds (+/- `jitter`), measured from
+      the start of the previous cycle.
+    - A cycle that overruns its slot is never overlapped: the next cycle
+      starts at the following free slot and the skipped ticks are counted.
+    - stop() (wired to SIGTERM/SIGINT by run_forever) lets the running
+      cycle finish and then exits the loop.
+    - Alerts are matched through a resident AlertIndex, loaded on the first
+      cycle and reconciled with the alerts table at the start of each one.
+    - Triggered alerts are only queued in the outbox; a background sender
+      task delivers them, so a slow SMTP server never delays a cycle.
+    """
+
+    def __init__(
+        self,
+        interval: float = ALERT_POLL_INTERVAL,
+        jitter: float = ALERT_POLL_JITTER,
+    ):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.jitter = max(0.0, min(jitter, interval / 2))
+
+        self._cycle_lock = asyncio.Lock()
+        self._stop_event: Optional[asyncio.Event] = None
+        self.index: Optional[AlertIndex] = None
+
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.skipped_ticks = 0
+        self.last_cycle_seconds: Optional[float] = None
+        self.max_cycle_seconds = 0.0
+        self.total_cycle_seconds = 0.0
+        self.backlog = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_cycle_started_at: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of scheduling metrics, used to size `interval` against the
+        number of active alerts.
+        """
+        avg = self.total_cycle_seconds / self.cycles if self.cycles else None
+        return {
+            "interval": self.interval,
+            "jitter": self.jitter,
+            "cycles": self.cycles,
+            "failed_cycles": self.failed_cycles,
+            "skipped_ticks": self.skipped_ticks,
+            "backlog": self.backlog,
+            "last_cycle_seconds": self.last_cycle_seconds,
+            "avg_cycle_seconds": avg,
+            "max_cycle_seconds": self.max_cycle_seconds,
+            "utilization": (avg / self.interval) if avg is not None else None,
+            "last_cycle_started_at": self.last_cycle_started_at,
+            "running": self._cycle_lock.locked(),
+            "outbox": outbox_stats(),
+        }
+
+    async def run_cycle(self) -> Dict[str, Any]:
+        """
+        Run exactly one check cycle. Concurrent callers queue on a lock, so
+        two cycles never evaluate alerts at the same time.
+        """
+        async with self._cycle_lock:
+            self.last_cycle_started_at = time.time()
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._sync_index)
+                self.backlog = await asyncio.to_thread(count_active_alerts)
+                result = await asyncio.to_thread(run_alert_check, self.index, False)
+            except Exception:
+                self.failed_cycles += 1
+                logger.exception("alert check cycle failed")
+                result = {"status": "error"}
+            finally:
+                elapsed = time.perf_counter() - started
+                self.cycles += 1
+                self.last_cycle_seconds = elapsed
+                self.total_cycle_seconds += elapsed
+                self.max_cycle_seconds = max(self.max_cycle_seconds, elapsed)
+
+            self.last_result = result
+            logger.info(
+                "alert cycle %d: %.3fs, backlog=%d, triggered=%d",
+                self.cycles,
+                elapsed,
+                self.backlog,
+                len(result.get("triggered") or []),
+            )
+            return result
+
+    def _sync_index(self) -> None:
+        # Alerts stored before CoinGecko ids were resolved at insert time, or
+        # while the coin list was unavailable
+        resolved = backfill_alert_coin_ids()
+        if self.index is None:
+            index = AlertIndex(watch=True)
+            index.load()
+            self.index = index
+        elif resolved:
+            # Their price keys changed; sync() only sees added/removed rows
+            self.index.load()
+        else:
+            self.index.sync()
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _next_delay(self, cycle_started: float) -> float:
+        """
+        Seconds to sleep until the next free slot after a cycle that began
+        at `cycle_started` (monotonic clock).
+        """
+        now = time.monotonic()
+        next_start = cycle_started + self.interval
+        if now > next_start:
+            missed = int((now - cycle_started) // self.interval)
+            self.skipped_ticks += missed
+            next_start = cycle_started + (missed + 1) * self.interval
+        delay = next_start - now
+        if self.jitter:
+            delay += random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    async def run(self) -> None:
+        """
+        Poll until stop() is called.
+        """
+        self._stop_event = asyncio.Event()
+        logger.info("alert daemon started (interval=%ss, jitter=%ss)", self.interval, self.jitter)
+        sender = asyncio.create_task(run_outbox_sender(self._stop_event))
+
+        try:
+            while not self._stop_event.is_set():
+                cycle_started = time.monotonic()
+                await self.run_cycle()
+                try:
+                    await asyncio.wait_for(
+                        self._stop_event.wait(),
+                        timeout=self._next_delay(cycle_started),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stop_event.set()
+            await sender
+
+        logger.info("alert daemon stopped after %d cycles", self.cycles)
+
+    async def run_forever(self) -> None:
+        """
+        run() with SIGTERM/SIGINT mapped to a clean stop().
+        """
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows / non-main thread: rely on KeyboardInterrupt
+                pass
+        try:
+            await self.run()
+        finally:
+            if self.index is not None:
+                self.index.close()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError):
+                    pass
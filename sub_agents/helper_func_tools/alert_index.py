@@ -0,0 +1,171 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import alert_storage
+
+# Sort keys are (target, id); these sentinels bracket every id for a target
+_MIN_ID = float("-inf")
+_MAX_ID = float("inf")
+
+
+def price_key(alert: Dict[str, Any]) -> str:
+    """
+    Key an alert is priced under: its resolved CoinGecko id, falling back
+    to the lower-cased token for alerts stored before ids were resolved.
+    """
+    return (alert.get("coin_id") or alert["token"]).lower()
+
+
+class AlertIndex:
+    """
+    In-memory index of active alerts for O(log n) matching per price tick.
+
+    Per price key (see price_key), "above" and "below" alerts are kept as
+    sorted lists of (target, id). For a price p:
+      - "above" alerts with target <= p are the prefix up to bisect_right(p)
+      - "below" alerts with target >= p are the suffix from bisect_left(p)
+
+    With watch=True the index subscribes to alert_storage change events,
+    so alerts added, cancelled or triggered in this process are reflected
+    immediately. sync() picks up changes made by other processes.
+    """
+
+    def __init__(self, watch: bool = True):
+        self._lock = threading.RLock()
+        self._above: Dict[str, List[Tuple[float, int]]] = {}
+        self._below: Dict[str, List[Tuple[float, int]]] = {}
+        self._alerts: Dict[int, Dict[str, Any]] = {}
+        self._max_id = 0
+        self._watching = False
+        if watch:
+            self.watch()
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def __contains__(self, alert_id: int) -> bool:
+        return alert_id in self._alerts
+
+    def watch(self):
+        if not self._watching:
+            alert_storage.add_listener(self._on_change)
+            self._watching = True
+
+    def close(self):
+        if self._watching:
+            alert_storage.remove_listener(self._on_change)
+            self._watching = False
+
+    def _on_change(self, event: str, alert: Dict[str, Any]):
+        if event == "added":
+            self.add(alert)
+        elif event == "removed":
+            self.discard(alert["id"])
+        elif event == "bulk_added":
+            self.sync()
+
+    def _side(self, direction: str) -> Optional[Dict[str, List[Tuple[float, int]]]]:
+        if direction == "above":
+            return self._above
+        if direction == "below":
+            return self._below
+        # Unknown directions can never trigger, so they are not indexed
+        return None
+
+    def add(self, alert: Dict[str, Any]):
+        alert_id = alert["id"]
+        with self._lock:
+            if alert_id in self._alerts:
+                return
+            self._max_id = max(self._max_id, alert_id)
+            side = self._side(alert["direction"])
+            if side is None:
+                return
+            key = price_key(alert)
+            insort(side.setdefault(key, []), (float(alert["target"]), alert_id))
+            self._alerts[alert_id] = alert
+
+    def discard(self, alert_id: int):
+        with self._lock:
+            alert = self._alerts.pop(alert_id, None)
+            if alert is None:
+                return
+            side = self._side(alert["direction"])
+            key = price_key(alert)
+            entries = side[key]
+            entry = (float(alert["target"]), alert_id)
+            i = bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                del entries[i]
+            if not entries:
+                del side[key]
+
+    def load(self):
+        """
+        Rebuild the index from every active alert in the alerts table.
+        """
+        alerts = alert_storage.get_active_alerts()
+        with self._lock:
+            self._above.clear()
+            self._below.clear()
+            self._alerts.clear()
+            self._max_id = 0
+            self.add_many(alerts)
+
+    def add_many(self, alerts: List[Dict[str, Any]]):
+        """
+        Bulk add: append everything, then sort each touched list once
+        (O(n log n)) instead of one insort per alert.
+        """
+        with self._lock:
+            touched = set()
+            for alert in alerts:
+                alert_id = alert["id"]
+                if alert_id in self._alerts:
+                    continue
+                self._max_id = max(self._max_id, alert_id)
+                side = self._side(alert["direction"])
+                if side is None:
+                    continue
+                key = price_key(alert)
+                side.setdefault(key, []).append((float(alert["target"]), alert_id))
+                self._alerts[alert_id] = alert
+                touched.add((alert["direction"], key))
+            for direction, key in touched:
+                self._side(direction)[key].sort()
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Reconcile with the alerts table: add rows newer than the highest id
+        seen so far and drop alerts that are no longer active.
+        """
+        new_alerts = alert_storage.get_active_alerts(min_id=self._max_id)
+        active_ids = set(alert_storage.get_active_alert_ids())
+        with self._lock:
+            self.add_many(new_alerts)
+            stale = [i for i in self._alerts if i not in active_ids]
+            for alert_id in stale:
+                self.discard(alert_id)
+        return {"added": len(new_alerts), "removed": len(stale)}
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return sorted(set(self._above) | set(self._below))
+
+    def match(self, key: str, price: float) -> List[Dict[str, Any]]:
+        """
+        Alerts priced under `key` that `price` triggers.
+        """
+        key = key.lower()
+        with self._lock:
+            ids: List[int] = []
+            above = self._above.get(key)
+            if above:
+                end = bisect_right(above, (price, _MAX_ID))
+                ids.extend(alert_id for _, alert_id in above[:end])
+            below = self._below.get(key)
+            if below:
+                start = bisect_left(below, (price, _MIN_ID))
+                ids.extend(alert_id for _, alert_id in below[start:])
+            return [self._alerts[i] for i in ids]
@@ -1,69 +1,507 @@
+import os
+import random
 import sqlite3
-from typing import List, Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 DB_NAME = "alerts.db"
 
+# In-process change listeners, called as fn(event, alert) with event
+# "added" (full alert dict), "removed" (dict with at least "id") or
+# "bulk_added" ({"count": n}; listeners should re-sync from the table).
+_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
 
-def init_db():
-    conn = sqlite3.connect(DB_NAME)
+
+def add_listener(fn: Callable[[str, Dict[str, Any]], None]):
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+def remove_listener(fn: Callable[[str, Dict[str, Any]], None]):
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+def _notify(event: str, alert: Dict[str, Any]):
+    for fn in list(_listeners):
+        fn(event, alert)
+
+
+# One connection per (thread, process, DB_NAME), reused across calls.
+# sqlite3 connections must not be shared between threads, and a connection
+# inherited through fork() must not be used by the child.
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    key = (os.getpid(), DB_NAME)
+    conn = getattr(_local, "conns", {}).get(key)
+    if conn is not None:
+        return conn
+
+    # isolation_level=None: autocommit; writes go through _transaction()
+    conn = sqlite3.connect(DB_NAME, isolation_level=None, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable across application crashes in WAL mode and avoids
+    # an fsync on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-16000")
+    if not hasattr(_local, "conns"):
+        _local.conns = {}
+    _local.conns[key] = conn
+    return conn
+
+
+def close_connections():
+    """
+    Close this thread's cached connections (tests / shutdown).
+    """
+    for conn in getattr(_local, "conns", {}).values():
+        conn.close()
+    _local.conns = {}
+
+
+@contextmanager
+def _transaction(immediate: bool = False) -> Iterator[sqlite3.Cursor]:
+    """
+    Run a block in one transaction on the pooled connection. immediate=True
+    takes the write lock up front (BEGIN IMMEDIATE).
+    """
+    conn = _connect()
     c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS alerts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            token TEXT NOT NULL,
-            target REAL NOT NULL,
-            direction TEXT NOT NULL,
-            email TEXT NOT NULL,
-            status TEXT NOT NULL DEFAULT 'active'
+    c.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield c
+    except BaseException:
+        c.execute("ROLLBACK")
+        raise
+    c.execute("COMMIT")
+
+
+def _query(sql: str, params: tuple = ()) -> List[tuple]:
+    return _connect().execute(sql, params).fetchall()
+
+
+def init_db():
+    with _transaction() as c:
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                token TEXT NOT NULL,
+                target REAL NOT NULL,
+                direction TEXT NOT NULL,
+                email TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'active'
+            )
+        """)
+        # CoinGecko id resolved once when the alert is stored
+        columns = {r[1] for r in c.execute("PRAGMA table_info(alerts)").fetchall()}
+        if "coin_id" not in columns:
+            c.execute("ALTER TABLE alerts ADD COLUMN coin_id TEXT")
+        # Checks filter active alerts (optionally per token), listings filter
+        # one user's alerts by status
+        c.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status_token ON alerts (status, token)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_alerts_email_status ON alerts (email, status)")
+        # Email outbox: one row per triggered alert (alert_id is UNIQUE, so an
+        # alert can never be queued twice). status: pending -> sending -> sent,
+        # or failed once retries are exhausted / a delivery was interrupted.
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                alert_id INTEGER NOT NULL UNIQUE,
+                email TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                claimed_at REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_status_due ON outbox (status, next_attempt_at)"
         )
-    """)
-    conn.commit()
-    conn.close()
+        # Local copy of CoinGecko /coins/list (see coin_index.py)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS coins (
+                id TEXT PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                name TEXT NOT NULL,
+                market_cap_rank INTEGER
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
 
 
-def add_alert(token: str, target: float, direction: str, email: str):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("""
-        INSERT INTO alerts (token, target, direction, email, status)
-        VALUES (?, ?, ?, ?, 'active')
-    """, (token.upper(), target, direction, email))
-    conn.commit()
-    conn.close()
+def add_alert(
+    token: str,
+    target: float,
+    direction: str,
+    email: str,
+    coin_id: Optional[str] = None,
+) -> int:
+    with _transaction() as c:
+        c.execute("""
+            INSERT INTO alerts (token, target, direction, email, status, coin_id)
+            VALUES (?, ?, ?, ?, 'active', ?)
+        """, (token.upper(), target, direction, email, coin_id))
+        alert_id = c.lastrowid
 
+    _notify("added", {
+        "id": alert_id,
+        "token": token.upper(),
+        "target": target,
+        "direction": direction,
+        "email": email,
+        "coin_id": coin_id,
+    })
+    return alert_id
 
-def get_active_alerts() -> List[Dict[str, Any]]:
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("SELECT id, token, target, direction, email FROM alerts WHERE status='active'")
-    rows = c.fetchall()
-    conn.close()
-
-    return [
-        {
-            "id": r[0],
-            "token": r[1],
-            "target": r[2],
-            "direction": r[3],
-            "email": r[4],
-        } for r in rows
-    ]
-
-
-def cancel_alert(token: str):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE alerts SET status='cancelled' WHERE token=? AND status='active'", (token.upper(),))
-    conn.commit()
-    conn.close()
 
+def bulk_add_alerts(
+    alerts: Iterable[Sequence[Any]],
+    batch_size: int = 10000,
+) -> int:
+    """
+    Insert many (token, target, direction, email[, coin_id]) rows with
+    executemany, one transaction per `batch_size` rows. Returns the number
+    inserted.
+    """
+    inserted = 0
+    batch: List[tuple] = []
 
-def mark_triggered(alert_id: int):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE alerts SET status='triggered' WHERE id=?", (alert_id,))
-    conn.commit()
-    conn.close()
+    def flush():
+        nonlocal inserted
+        with _transaction() as c:
+            c.executemany("""
+                INSERT INTO alerts (token, target, direction, email, status, coin_id)
+                VALUES (?, ?, ?, ?, 'active', ?)
+            """, batch)
+        inserted += len(batch)
+        batch.clear()
+
+    for row in alerts:
+        token, target, direction, email = row[:4]
+        coin_id = row[4] if len(row) > 4 else None
+        batch.append((token.upper(), float(target), direction, email, coin_id))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    if inserted:
+        _notify("bulk_added", {"count": inserted})
+    return inserted
+
+
+_ALERT_COLUMNS = "id, token, target, direction, email, coin_id"
+
+
+def _alert_row(r) -> Dict[str, Any]:
+    return {
+        "id": r[0],
+        "token": r[1],
+        "target": r[2],
+        "direction": r[3],
+        "email": r[4],
+        "coin_id": r[5],
+    }
+
+
+def get_active_alerts(min_id: int = 0) -> List[Dict[str, Any]]:
+    """
+    Active alerts, optionally only those with id > min_id (used for
+    incremental index syncs).
+    """
+    rows = _query(
+        f"SELECT {_ALERT_COLUMNS} FROM alerts WHERE status='active' AND id > ?",
+        (min_id,),
+    )
+    return [_alert_row(r) for r in rows]
+
+
+def get_alerts_for_email(email: str, status: str = "active") -> List[Dict[str, Any]]:
+    rows = _query(
+        f"SELECT {_ALERT_COLUMNS} FROM alerts WHERE email=? AND status=?",
+        (email, status),
+    )
+    return [_alert_row(r) for r in rows]
+
+
+def iter_alerts(
+    status: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream alerts (all, or one status) in id order, `batch_size` rows per
+    query. Keyset pagination keeps memory flat and holds no read
+    transaction open between batches.
+    """
+    last_id = 0
+    while True:
+        if status is None:
+            rows = _query(
+                f"SELECT {_ALERT_COLUMNS}, status FROM alerts "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            )
+        else:
+            rows = _query(
+                f"SELECT {_ALERT_COLUMNS}, status FROM alerts "
+                "WHERE id > ? AND status=? ORDER BY id LIMIT ?",
+                (last_id, status, batch_size),
+            )
+        if not rows:
+            return
+        for r in rows:
+            alert = _alert_row(r)
+            alert["status"] = r[6]
+            yield alert
+        last_id = rows[-1][0]
+
+
+def count_active_alerts() -> int:
+    (count,) = _query("SELECT COUNT(*) FROM alerts WHERE status='active'")[0]
+    return count
+
+
+def set_coin_ids(token_to_id: Dict[str, str]) -> int:
+    """
+    Backfill coin_id on active alerts stored before ids were resolved.
+    """
+    with _transaction() as c:
+        c.executemany(
+            "UPDATE alerts SET coin_id=? WHERE status='active' AND token=? AND coin_id IS NULL",
+            [(coin_id, token.upper()) for token, coin_id in token_to_id.items()],
+        )
+        return c.rowcount
+
+
+def get_unresolved_tokens() -> List[str]:
+    rows = _query(
+        "SELECT DISTINCT token FROM alerts WHERE status='active' AND coin_id IS NULL"
+    )
+    return [r[0] for r in rows]
+
+
+def replace_coins(coins: Iterable[Sequence[Any]], refreshed_at: float):
+    """
+    Swap in a fresh copy of the coin list ((id, symbol, name, rank) rows)
+    and record when it was downloaded, in one transaction.
+    """
+    with _transaction() as c:
+        c.execute("DELETE FROM coins")
+        c.executemany(
+            "INSERT OR REPLACE INTO coins (id, symbol, name, market_cap_rank) VALUES (?, ?, ?, ?)",
+            coins,
+        )
+        c.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('coins_refreshed_at', ?)",
+            (str(refreshed_at),),
+        )
+
+
+def load_coins() -> Tuple[Optional[float], List[tuple]]:
+    """
+    (refreshed_at, coin rows) as stored by replace_coins, or (None, []) if
+    the list was never downloaded.
+    """
+    rows = _query("SELECT value FROM meta WHERE key='coins_refreshed_at'")
+    if not rows:
+        return None, []
+    coins = _query("SELECT id, symbol, name, market_cap_rank FROM coins")
+    return float(rows[0][0]), coins
+
+
+def get_active_alert_ids() -> List[int]:
+    return [r[0] for r in _query("SELECT id FROM alerts WHERE status='active'")]
+
+
+def cancel_alert(token: str) -> List[int]:
+    with _transaction(immediate=True) as c:
+        c.execute("SELECT id FROM alerts WHERE status='active' AND token=?", (token.upper(),))
+        ids = [r[0] for r in c.fetchall()]
+        c.execute("UPDATE alerts SET status='cancelled' WHERE status='active' AND token=?", (token.upper(),))
+
+    for alert_id in ids:
+        _notify("removed", {"id": alert_id})
+    return ids
+
+
+def mark_triggered(alert_id: int) -> bool:
+    """
+    Mark an active alert triggered. Safe under concurrent checkers (threads
+    or processes): only the caller that flips it from 'active' gets True.
+    """
+    with _transaction() as c:
+        c.execute("UPDATE alerts SET status='triggered' WHERE id=? AND status='active'", (alert_id,))
+        won = c.rowcount == 1
+
+    if won:
+        _notify("removed", {"id": alert_id})
+    return won
+
+
+def mark_triggered_many(alert_ids: Iterable[int]) -> int:
+    """
+    Mark many alerts triggered in a single transaction. Returns the number
+    of alerts that were still active.
+    """
+    changed: List[int] = []
+    with _transaction() as c:
+        for alert_id in alert_ids:
+            c.execute("UPDATE alerts SET status='triggered' WHERE id=? AND status='active'", (alert_id,))
+            if c.rowcount == 1:
+                changed.append(alert_id)
+
+    # Alerts another checker already triggered were reported by that call
+    for alert_id in changed:
+        _notify("removed", {"id": alert_id})
+    return len(changed)
+
+
+def trigger_alert(alert_id: int, email: str, subject: str, body: str) -> bool:
+    """
+    Mark an alert triggered and queue its email in one transaction.
+
+    Only an alert that is still active is triggered, so concurrent checkers
+    cannot both queue it. Returns True if this call triggered the alert.
+    """
+    with _transaction() as c:
+        c.execute("UPDATE alerts SET status='triggered' WHERE id=? AND status='active'", (alert_id,))
+        won = c.rowcount == 1
+        if won:
+            c.execute("""
+                INSERT INTO outbox (alert_id, email, subject, body, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (alert_id, email, subject, body, time.time()))
+
+    if won:
+        _notify("removed", {"id": alert_id})
+    return won
+
+
+def _outbox_row(r) -> Dict[str, Any]:
+    return {
+        "id": r[0],
+        "alert_id": r[1],
+        "email": r[2],
+        "subject": r[3],
+        "body": r[4],
+        "attempts": r[5],
+    }
+
+
+def claim_outbox(limit: int = 100, lease_seconds: float = 300) -> List[Dict[str, Any]]:
+    """
+    Claim up to `limit` due outbox rows for delivery (pending -> sending).
+
+    A row still in 'sending' after `lease_seconds` belongs to a sender that
+    died mid-delivery; the email may or may not have gone out, so it is
+    failed rather than re-sent.
+    """
+    now = time.time()
+    # BEGIN IMMEDIATE takes the write lock up front so two senders can't
+    # claim the same rows
+    with _transaction(immediate=True) as c:
+        c.execute("""
+            UPDATE outbox
+            SET status='failed', last_error='delivery interrupted; not retried to avoid a duplicate email'
+            WHERE status='sending' AND claimed_at < ?
+        """, (now - lease_seconds,))
+        c.execute("""
+            SELECT id, alert_id, email, subject, body, attempts FROM outbox
+            WHERE status='pending' AND next_attempt_at <= ?
+            ORDER BY id
+            LIMIT ?
+        """, (now, limit))
+        rows = [_outbox_row(r) for r in c.fetchall()]
+        c.executemany(
+            "UPDATE outbox SET status='sending', claimed_at=? WHERE id=?",
+            [(now, r["id"]) for r in rows],
+        )
+    return rows
+
+
+def renew_outbox_lease(outbox_ids: List[int]):
+    """
+    Restart the lease on rows this sender is still delivering, so a long
+    drain doesn't see them presumed lost mid-send.
+    """
+    now = time.time()
+    with _transaction() as c:
+        c.executemany(
+            "UPDATE outbox SET claimed_at=? WHERE id=? AND status='sending'",
+            [(now, i) for i in outbox_ids],
+        )
+
+
+def mark_outbox_sent(outbox_ids: List[int]):
+    with _transaction() as c:
+        c.executemany(
+            "UPDATE outbox SET status='sent', last_error=NULL WHERE id=?",
+            [(i,) for i in outbox_ids],
+        )
+
+
+def mark_outbox_retry(
+    outbox_ids: List[int],
+    error: str,
+    max_attempts: int = 5,
+    backoff_base: float = 30,
+    backoff_max: float = 3600,
+):
+    """
+    Return failed rows to 'pending' with jittered exponential backoff,
+    or fail them for good after `max_attempts`.
+    """
+    now = time.time()
+    with _transaction(immediate=True) as c:
+        for outbox_id in outbox_ids:
+            c.execute("SELECT attempts FROM outbox WHERE id=?", (outbox_id,))
+            row = c.fetchone()
+            if row is None:
+                continue
+            attempts = row[0] + 1
+            if attempts >= max_attempts:
+                c.execute(
+                    "UPDATE outbox SET status='failed', attempts=?, last_error=? WHERE id=?",
+                    (attempts, error, outbox_id),
+                )
+            else:
+                delay = min(backoff_max, backoff_base * 2 ** (attempts - 1))
+                c.execute(
+                    """
+                    UPDATE outbox SET status='pending', attempts=?, last_error=?, next_attempt_at=?
+                    WHERE id=?
+                    """,
+                    (attempts, error, now + random.uniform(delay / 2, delay), outbox_id),
+                )
+
+
+def outbox_stats() -> Dict[str, Any]:
+    counts = dict(_query("SELECT status, COUNT(*) FROM outbox GROUP BY status"))
+    (oldest,) = _query(
+        "SELECT MIN(created_at) FROM outbox WHERE status IN ('pending', 'sending')"
+    )[0]
+    return {
+        "pending": counts.get("pending", 0),
+        "sending": counts.get("sending", 0),
+        "sent": counts.get("sent", 0),
+        "failed": counts.get("failed", 0),
+        "oldest_undelivered_age": (time.time() - oldest) if oldest is not None else None,
+    }
 
 
 # Auto-init DB on import
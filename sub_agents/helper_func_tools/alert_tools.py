@@ -1,31 +1,20 @@
-import subprocess
 from typing import Optional, Dict, Any
 from google.adk.tools import FunctionTool, ToolContext
 
+from .alert_checker import run_alert_check_async
 
-def run_alert_checker_script(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
-    """
-    Runs the one-shot alert checker script.
+
+async def run_alert_checker_script(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
-    import os
-    script_path = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)),
-        "scripts",
-        "alert_check_script.py"
-    )
-    # Set working directory to project root so imports work
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    result = subprocess.run(
-        ["python3", script_path],
-        capture_output=True,
-        text=True,
-        cwd=project_root
-    )
-    return {
-        "returncode": result.returncode,
-        "stdout": result.stdout,
-        "stderr": result.stderr
+    Runs the one-shot alert checker in-process.
+
+    Returns:
+    {
+      "elapsed_ms": 123.4,
+      "result": {"status": "completed", "triggered": [...], ...}
     }
+    """
+    return await run_alert_check_async()
 
 
 run_alert_checker_tool = FunctionTool(
@@ -0,0 +1,194 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from ...config import COINGECKO_API_URL, COIN_INDEX_RANK_PAGES, COIN_INDEX_TTL
+from . import alert_storage, http_client
+
+# Symbol / name / id -> CoinGecko id, persisted in the `coins` table of the
+# alerts DB and mirrored in memory for O(1) lookups. CoinGecko ids are what
+# /simple/price expects; alerts store upper-cased symbols ("BTC"), which
+# are not ids ("bitcoin").
+
+_lock = threading.Lock()
+_lookup: Dict[str, str] = {}
+_refreshed_at: Optional[float] = None
+_last_attempt_at = 0.0
+# Held for the whole download, so concurrent callers never start a second
+_refresh_lock = threading.Lock()
+# Background refresh of a stale index, if one is running
+_refresher: Optional[threading.Thread] = None
+
+# Minimum seconds between refresh attempts after a failed download
+_RETRY_AFTER = 300
+
+
+def _rank_key(rank: Optional[int]) -> Tuple[int, int]:
+    # Ranked coins first (lower rank wins), unranked last
+    return (0, rank) if rank is not None else (1, 0)
+
+
+def _build_lookup(coins: Iterable[Tuple[str, str, str, Optional[int]]]) -> Dict[str, str]:
+    """
+    Map every id, symbol and name (lower-cased) to the best-ranked coin
+    carrying it, so ambiguous symbols resolve by market-cap rank.
+    """
+    best: Dict[str, Tuple[Tuple[int, int], str]] = {}
+    for coin_id, symbol, name, rank in coins:
+        key_rank = _rank_key(rank)
+        for key in {coin_id.lower(), symbol.lower(), name.lower()}:
+            current = best.get(key)
+            if current is None or key_rank < current[0]:
+                best[key] = (key_rank, coin_id)
+    return {key: coin_id for key, (_, coin_id) in best.items()}
+
+
+def _fetch_coins() -> List[Tuple[str, str, str, Optional[int]]]:
+    coins = http_client.get_json(f"{COINGECKO_API_URL}/coins/list", timeout=30) or []
+
+    # /coins/list has no ranks; the top of /coins/markets supplies them
+    ranks: Dict[str, int] = {}
+    for page in range(1, COIN_INDEX_RANK_PAGES + 1):
+        try:
+            markets = http_client.get_json(
+                f"{COINGECKO_API_URL}/coins/markets",
+                params={
+                    "vs_currency": "usd",
+                    "order": "market_cap_desc",
+                    "per_page": 250,
+                    "page": page,
+                },
+                timeout=30,
+            )
+        except (requests.RequestException, ValueError):
+            # Ranks only break ties between symbols; the other pages still count
+            continue
+        for m in markets or []:
+            if m.get("id") and m.get("market_cap_rank") is not None:
+                ranks[m["id"]] = int(m["market_cap_rank"])
+
+    return [
+        (c["id"], c.get("symbol") or "", c.get("name") or "", ranks.get(c["id"]))
+        for c in coins
+        if c.get("id")
+    ]
+
+
+def refresh_coin_index() -> int:
+    """
+    Download /coins/list (+ market-cap ranks) into SQLite and reload the
+    in-memory lookup. Returns the number of coins stored.
+    """
+    global _lookup, _refreshed_at
+
+    coins = _fetch_coins()
+    now = time.time()
+    alert_storage.replace_coins(coins, now)
+
+    lookup = _build_lookup(coins)
+    with _lock:
+        _lookup, _refreshed_at = lookup, now
+    return len(coins)
+
+
+def _load_from_db():
+    global _lookup, _refreshed_at
+
+    refreshed_at, coins = alert_storage.load_coins()
+    if refreshed_at is None:
+        return
+    lookup = _build_lookup(coins)
+    with _lock:
+        _lookup, _refreshed_at = lookup, refreshed_at
+
+
+def _needs_refresh(now: float) -> bool:
+    stale = _refreshed_at is None or now - _refreshed_at > COIN_INDEX_TTL
+    return stale and now - _last_attempt_at > _RETRY_AFTER
+
+
+def _refresh_if_stale():
+    global _last_attempt_at
+
+    with _refresh_lock:
+        # Another caller may have refreshed while this one waited
+        now = time.time()
+        if not _needs_refresh(now):
+            return
+        _last_attempt_at = now
+        try:
+            refresh_coin_index()
+        except (requests.RequestException, ValueError):
+            # Keep serving the stale index; an empty one just resolves nothing
+            pass
+
+
+def _ensure_fresh():
+    """
+    Make sure there is an index to serve. The first download blocks (there
+    is nothing to resolve against yet); a stale index keeps serving while
+    it is refreshed on a background thread.
+    """
+    global _refresher
+
+    if _refreshed_at is None:
+        with _refresh_lock:
+            if _refreshed_at is None:
+                _load_from_db()
+    if not _needs_refresh(time.time()):
+        return
+    if _refreshed_at is None:
+        _refresh_if_stale()
+        return
+    with _lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(
+                target=_refresh_if_stale, name="coin-index-refresh", daemon=True
+            )
+            _refresher.start()
+
+
+def resolve_coin_id(token: str) -> Optional[str]:
+    """
+    CoinGecko id for a symbol ("BTC"), name ("Bitcoin") or id ("bitcoin"),
+    or None if unknown (or if there is no index yet; see index_available).
+    """
+    if not token:
+        return None
+    _ensure_fresh()
+    return _lookup.get(token.strip().lower())
+
+
+def index_available() -> bool:
+    """
+    Whether there is a coin list to resolve against. False while the first
+    download keeps failing (offline, rate limited): a None from
+    resolve_coin_id then means "not known yet", not "no such coin".
+    """
+    return _refreshed_at is not None
+
+
+def coin_index_info() -> Dict[str, Any]:
+    return {
+        "entries": len(_lookup),
+        "refreshed_at": _refreshed_at,
+        "ttl": COIN_INDEX_TTL,
+    }
+
+
+def backfill_alert_coin_ids() -> int:
+    """
+    Resolve coin_id for active alerts stored without one. Returns the
+    number of alerts updated.
+    """
+    tokens = alert_storage.get_unresolved_tokens()
+    if not tokens:
+        return 0
+    resolved = {}
+    for token in tokens:
+        coin_id = resolve_coin_id(token)
+        if coin_id:
+            resolved[token] = coin_id
+    return alert_storage.set_coin_ids(resolved) if resolved else 0
@@ -1,9 +1,39 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
+import httpx
 import requests
 from google.adk.tools import FunctionTool, ToolContext
 
-from ...config import ETHERSCAN_API_KEY
+from ...config import (
+    BLOCKSTREAM_API_URL,
+    BTC_TXS_PAGE_SIZE,
+    ETHERSCAN_API_KEY,
+    ETHERSCAN_API_URL,
+    ETHERSCAN_BALANCEMULTI_SIZE,
+    SCAN_DEADLINE,
+    SCAN_LEG_WORKERS,
+    SOLANA_RPC_BATCH_SIZE,
+    SOLANA_RPC_URL,
+)
+from . import http_client, tx_store
+from .scan_cache import scan_cache
+from .tx_history import TxHistory
 
 
 
@@ -20,10 +50,264 @@ CHAIN_IDS: Dict[str, int] = {
 }
 
 
-def evm_scan_address(
+# Shared by every scan so concurrent scans don't each spin up threads
+_leg_pool = ThreadPoolExecutor(max_workers=SCAN_LEG_WORKERS, thread_name_prefix="scan-leg")
+
+
+class _Leg(NamedTuple):
+    """
+    One upstream GET of a scan. `parse` post-processes the decoded JSON
+    (and may raise to fail the leg).
+    """
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    parse: Optional[Callable[[Any], Any]] = None
+
+
+def _fetch_leg(leg: _Leg) -> Any:
+    data = http_client.get_json(leg.url, params=leg.params, headers=leg.headers)
+    return leg.parse(data) if leg.parse else data
+
+
+async def _fetch_leg_async(leg: _Leg) -> Any:
+    data = await http_client.aget_json(leg.url, params=leg.params, headers=leg.headers)
+    return leg.parse(data) if leg.parse else data
+
+
+def _collect(
+    outcomes: Dict[str, Optional[Tuple[Optional[BaseException], Any]]],
+    deadline: float,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    # outcomes: leg -> (exception, result), or None if it missed the deadline
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    first_exc: Optional[BaseException] = None
+    for name, outcome in outcomes.items():
+        if outcome is None:
+            errors[name] = f"timed out after {deadline:g}s"
+        elif outcome[0] is not None:
+            errors[name] = str(outcome[0]) or type(outcome[0]).__name__
+            first_exc = first_exc or outcome[0]
+        else:
+            results[name] = outcome[1]
+
+    if not results:
+        raise first_exc or TimeoutError(f"scan timed out after {deadline:g}s")
+    return results, errors
+
+
+def _run_legs(
+    legs: Dict[str, Callable[[], Any]],
+    deadline: float = SCAN_DEADLINE,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run a scan's independent upstream requests concurrently under one
+    overall deadline.
+
+    Returns (results, errors) keyed by leg name; a leg that raised or
+    missed the deadline is only in `errors`. If every leg failed there is
+    nothing to return, so the first leg's exception is raised instead.
+    """
+    futures = {name: _leg_pool.submit(fn) for name, fn in legs.items()}
+    done, _ = wait(futures.values(), timeout=deadline)
+
+    outcomes: Dict[str, Optional[Tuple[Optional[BaseException], Any]]] = {}
+    for name, future in futures.items():
+        if future not in done:
+            future.cancel()
+            outcomes[name] = None
+        elif future.exception() is not None:
+            outcomes[name] = (future.exception(), None)
+        else:
+            outcomes[name] = (None, future.result())
+    return _collect(outcomes, deadline)
+
+
+async def _run_legs_async(
+    legs: Dict[str, Callable[[], Awaitable[Any]]],
+    deadline: float = SCAN_DEADLINE,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    _run_legs on the event loop: legs are coroutines, stragglers are
+    cancelled at the deadline.
+    """
+    tasks = {name: asyncio.ensure_future(fn()) for name, fn in legs.items()}
+    done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    outcomes: Dict[str, Optional[Tuple[Optional[BaseException], Any]]] = {}
+    for name, task in tasks.items():
+        if task not in done:
+            outcomes[name] = None
+        elif task.exception() is not None:
+            outcomes[name] = (task.exception(), None)
+        else:
+            outcomes[name] = (None, task.result())
+    return _collect(outcomes, deadline)
+
+
+def _scan(legs: Dict[str, _Leg]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    return _run_legs({name: functools.partial(_fetch_leg, leg) for name, leg in legs.items()})
+
+
+async def _scan_async(legs: Dict[str, _Leg]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    return await _run_legs_async(
+        {name: functools.partial(_fetch_leg_async, leg) for name, leg in legs.items()}
+    )
+
+
+def _with_errors(snapshot: Dict[str, Any], errors: Dict[str, str]) -> Dict[str, Any]:
+    if errors:
+        snapshot["error"] = "; ".join(f"{leg}: {msg}" for leg, msg in errors.items())
+    return snapshot
+
+
+def _etherscan_result(data: Any) -> Any:
+    data = data or {}
+    result = data.get("result")
+    if data.get("status") == "0" and not isinstance(result, list):
+        # e.g. "Max rate limit reached", "Invalid API Key"
+        raise ValueError(result or data.get("message") or "Etherscan error")
+    return result
+
+
+def evm_chain_tip(chain: str) -> int:
+    """
+    Latest block number of an EVM chain (Etherscan eth_blockNumber proxy).
+    """
+    data = http_client.get_json(
+        ETHERSCAN_API_URL,
+        params={
+            "chainid": CHAIN_IDS.get(chain, 1),
+            "module": "proxy",
+            "action": "eth_blockNumber",
+            "apikey": ETHERSCAN_API_KEY,
+        },
+    ) or {}
+    return int(data["result"], 16)
+
+
+def btc_chain_tip(chain: str = "btc") -> int:
+    return int(http_client.get(f"{BLOCKSTREAM_API_URL}/blocks/tip/height").text)
+
+
+def _evm_check(address: str):
+    if not ETHERSCAN_API_KEY:
+        raise RuntimeError("Missing ETHERSCAN_API_KEY")
+
+    if not address.startswith("0x") or len(address) != 42:
+        raise ValueError("Invalid EVM address; expected 0x + 40 hex chars.")
+
+
+def _evm_legs(
+    address: str,
+    chain: str,
+    limit: int,
+    balance_only: bool = False,
+) -> Tuple[Dict[str, _Leg], Optional[str]]:
+    _evm_check(address)
+
+    chain_id = CHAIN_IDS.get(chain, 1)
+    bal_params = {
+        "chainid": chain_id,
+        "module": "account",
+        "action": "balance",
+        "address": address,
+        "tag": "latest",
+        "apikey": ETHERSCAN_API_KEY,
+    }
+    legs = {"balance": _Leg(ETHERSCAN_API_URL, bal_params, parse=_etherscan_result)}
+    if balance_only:
+        return legs, None
+
+    cursor = tx_store.get_cursor("evm", chain, address.lower())
+    stored, _ = tx_store.tail("evm", chain, address.lower())
+    if stored < limit:
+        # An earlier, shallower scan stored fewer rows than asked for: take
+        # the newest `limit` from the top again (one request), rather than
+        # only what is newer than the cursor, and store that page alone
+        cursor = None
+    tx_params = {
+        "chainid": chain_id,
+        "module": "account",
+        "action": "txlist",
+        "address": address,
+        # Inclusive: the cursor block's txs are re-fetched and de-duplicated
+        "startblock": int(cursor) if cursor else 0,
+        "page": 1,
+        "offset": limit,
+        "sort": "desc",
+        "apikey": ETHERSCAN_API_KEY,
+    }
+    legs["txlist"] = _Leg(ETHERSCAN_API_URL, tx_params, parse=_etherscan_result)
+    return legs, cursor
+
+
+def _evm_snapshot(
+    address: str,
+    chain: str,
+    limit: int,
+    cursor: Optional[str],
+    results: Dict[str, Any],
+    errors: Dict[str, str],
+    balance_only: bool = False,
+) -> Dict[str, Any]:
+    store_address = address.lower()
+    snapshot = {
+        "family": "evm",
+        "chain": chain,
+        "chainId": CHAIN_IDS.get(chain, 1),
+        "address": address,
+        "native_balance": results.get("balance"),
+        "native_unit": "wei",
+    }
+    if balance_only:
+        return _with_errors(snapshot, errors)
+
+    if "txlist" in results:
+        fetched: List[Dict[str, Any]] = []
+        page = (results["txlist"] or [])[:limit]
+        top_block = int(cursor) if cursor else 0
+        for tx in page:
+            ts = int(tx.get("timeStamp", 0)) if tx.get("timeStamp") else None
+            if tx.get("blockNumber"):
+                top_block = max(top_block, int(tx["blockNumber"]))
+
+            fetched.append(
+                {
+                    "hash": tx.get("hash"),
+                    "from": tx.get("from"),
+                    "to": tx.get("to"),
+                    "value": tx.get("value"),
+                    "timestamp": ts,
+                    "status": "failed" if tx.get("isError") == "1" else "success",
+                }
+            )
+        # A full page may not reach back to the cursor block, and a page taken
+        # from the top again (no cursor) need not reach the rows stored
+        # before it; either way what is stored would no longer be contiguous
+        gap = len(page) >= limit if cursor is not None else bool(page)
+        tx_store.sync(
+            "evm", chain, store_address, fetched,
+            cursor=str(top_block) if top_block else None,
+            replace=gap,
+        )
+
+    txs = tx_store.recent_history("evm", chain, store_address, limit)
+    snapshot["tx_count"] = len(txs)
+    snapshot["latest_timestamp"] = txs.latest_timestamp()
+    snapshot["transactions"] = txs.to_dicts()
+    return _with_errors(snapshot, errors)
+
+
+@scan_cache.cached("evm", chain_tip=evm_chain_tip, check=_evm_check)
+async def evm_scan_address_async(
     address: str,
     chain: str = "ethereum",
     limit: int = 20,
+    balance_only: bool = False,
     tool_context: Optional[ToolContext] = None,
 ) -> Dict[str, Any]:
     """
@@ -32,6 +316,8 @@ def evm_scan_address(
     - address: 0x-prefixed address (42 chars)
     - chain: key in CHAIN_IDS; defaults to 'ethereum'
     - limit: max number of recent normal transactions to include
+    - balance_only: fetch the balance alone; the snapshot then has no
+      tx_count / latest_timestamp / transactions fields
 
     Returns a compact snapshot:
     {
@@ -55,84 +341,406 @@ def evm_scan_address(
         ...
       ],
     }
+
+    txlist and balance are fetched concurrently. If one of them fails or
+    misses SCAN_DEADLINE, its fields are empty/None and the snapshot gets
+    an "error" field naming the failed leg.
+
+    Transactions are synced into tx_store: txlist only asks for blocks
+    from the highest one already stored (or for the newest `limit` again
+    while fewer than `limit` rows are stored), and "transactions" is
+    served from the local table.
     """
-    if not ETHERSCAN_API_KEY:
-        raise RuntimeError("Missing ETHERSCAN_API_KEY")
+    # tx_store reads and writes are SQLite calls: keep them off the loop
+    legs, cursor = await asyncio.to_thread(_evm_legs, address, chain, limit, balance_only)
+    results, errors = await _scan_async(legs)
+    return await asyncio.to_thread(
+        _evm_snapshot, address, chain, limit, cursor, results, errors, balance_only
+    )
 
-    if not address.startswith("0x") or len(address) != 42:
-        raise ValueError("Invalid EVM address; expected 0x + 40 hex chars.")
 
-    chain_id = CHAIN_IDS.get(chain, 1)
+@scan_cache.cached("evm", chain_tip=evm_chain_tip, check=_evm_check)
+def evm_scan_address(
+    address: str,
+    chain: str = "ethereum",
+    limit: int = 20,
+    balance_only: bool = False,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict[str, Any]:
+    """
+    Blocking evm_scan_address_async, for sync callers (portfolio, scripts).
+    """
+    legs, cursor = _evm_legs(address, chain, limit, balance_only)
+    results, errors = _scan(legs)
+    return _evm_snapshot(address, chain, limit, cursor, results, errors, balance_only)
 
-    base_url = "https://api.etherscan.io/v2/api"
 
-    tx_params = {
-        "chainid": chain_id,
-        "module": "account",
-        "action": "txlist",
+evm_scan_tool = FunctionTool(
+    func=evm_scan_address_async,
+)
+
+
+def _evm_failed(address: str, chain: str, error: str) -> Dict[str, Any]:
+    return {
+        "family": "evm",
+        "chain": chain,
+        "chainId": CHAIN_IDS.get(chain, 1),
         "address": address,
-        "page": 1,
-        "offset": limit,
-        "sort": "desc",
-        "apikey": ETHERSCAN_API_KEY,
+        "native_balance": None,
+        "native_unit": "wei",
+        "tx_count": 0,
+        "latest_timestamp": None,
+        "transactions": [],
+        "error": error,
+    }
+
+
+def _evm_active(snapshot: Dict[str, Any]) -> bool:
+    return bool(snapshot.get("tx_count")) or snapshot.get("native_balance") not in (None, "0")
+
+
+async def evm_scan_chains_async(
+    address: str,
+    chains: Optional[Iterable[str]] = None,
+    limit: int = 20,
+    deadline: float = SCAN_DEADLINE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Scan one address on several EVM chains (default: all of CHAIN_IDS)
+    concurrently, yielding each chain's snapshot as soon as it is done.
+
+    Every chain goes through the same Etherscan host bucket, so the sweep
+    stays under the shared rate limit. A chain whose scan failed, or that
+    is still running when `deadline` expires, is yielded as an empty
+    snapshot with an "error".
+    """
+    _evm_check(address)
+    tasks = {
+        asyncio.ensure_future(evm_scan_address_async(address, chain=chain, limit=limit)): chain
+        for chain in (chains or CHAIN_IDS)
+    }
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, end - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                exc = task.exception()
+                if exc is not None:
+                    yield _evm_failed(address, tasks[task], str(exc) or type(exc).__name__)
+                else:
+                    yield task.result()
+
+        for task in pending:
+            task.cancel()
+            yield _evm_failed(address, tasks[task], f"timed out after {deadline:g}s")
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def evm_scan_all_chains_async(
+    address: str,
+    limit: int = 20,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict[str, Any]:
+    """
+    Scan an EVM address on every supported chain at once, for when the
+    user does not say which chain they used.
+
+    - address: 0x-prefixed address (42 chars)
+    - limit: max number of recent transactions per chain
+
+    Returns:
+    {
+      "address": "...",
+      "active_chains": ["polygon", ...],
+      "chains": [<evm_scan_address_async snapshot>, ...],
+    }
+    "chains" lists chains with a balance or transactions first. A chain
+    that failed or timed out has an "error" field.
+    """
+    snapshots = [s async for s in evm_scan_chains_async(address, limit=limit)]
+    active = [s for s in snapshots if _evm_active(s)]
+    return {
+        "address": address,
+        "active_chains": [s["chain"] for s in active],
+        "chains": active + [s for s in snapshots if not _evm_active(s)],
+    }
+
+
+evm_multichain_scan_tool = FunctionTool(
+    func=evm_scan_all_chains_async,
+)
+
+
+def evm_get_balances(addresses: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Native balances for many (address, chain) pairs via Etherscan's
+    balancemulti, ETHERSCAN_BALANCEMULTI_SIZE addresses per request.
+
+    Pairs are grouped by chainId (unknown chain names fall back to
+    Ethereum, as in evm_scan_address) and de-duplicated case-insensitively.
+    A failing chunk marks only its own addresses as errors.
+
+    Returns:
+    {
+      "balances": {(address, chain): "<wei>", ...},
+      "errors": {(address, chain): "<message>", ...},
+      "upstream_calls": N,
     }
-    tx_resp = requests.get(base_url, params=tx_params, timeout=12)
-    tx_resp.raise_for_status()
-    tx_data = tx_resp.json() or {}
-    txs_raw: List[Dict[str, Any]] = tx_data.get("result") or []
+    keyed by the (address, chain) pairs exactly as passed in.
+    """
+    if not ETHERSCAN_API_KEY:
+        raise RuntimeError("Missing ETHERSCAN_API_KEY")
+
+    # chainId -> lower-cased address -> the caller's (address, chain) keys
+    by_chain_id: Dict[int, Dict[str, List[Tuple[str, str]]]] = {}
+    for address, chain in addresses:
+        chain_id = CHAIN_IDS.get(chain, 1)
+        by_chain_id.setdefault(chain_id, {}).setdefault(address.lower(), []).append((address, chain))
+
+    balances: Dict[Tuple[str, str], str] = {}
+    errors: Dict[Tuple[str, str], str] = {}
+    calls = 0
+
+    for chain_id, wanted in by_chain_id.items():
+        accounts = sorted(wanted)
+        for i in range(0, len(accounts), ETHERSCAN_BALANCEMULTI_SIZE):
+            chunk = accounts[i:i + ETHERSCAN_BALANCEMULTI_SIZE]
+            calls += 1
+            try:
+                data = http_client.get_json(
+                    ETHERSCAN_API_URL,
+                    params={
+                        "chainid": chain_id,
+                        "module": "account",
+                        "action": "balancemulti",
+                        "address": ",".join(chunk),
+                        "tag": "latest",
+                        "apikey": ETHERSCAN_API_KEY,
+                    },
+                ) or {}
+                result = data.get("result")
+                if not isinstance(result, list):
+                    # status "0": result is an error message string
+                    raise ValueError(result or data.get("message") or "unexpected response")
+            except (requests.RequestException, ValueError) as e:
+                for account in chunk:
+                    for key in wanted[account]:
+                        errors[key] = str(e) or type(e).__name__
+                continue
+
+            returned = {
+                (item.get("account") or "").lower(): item.get("balance")
+                for item in result
+            }
+            for account in chunk:
+                for key in wanted[account]:
+                    if returned.get(account) is not None:
+                        balances[key] = returned[account]
+                    else:
+                        errors[key] = "missing from balancemulti response"
+
+    return {"balances": balances, "errors": errors, "upstream_calls": calls}
 
-    txs: List[Dict[str, Any]] = []
-    latest_ts: Optional[int] = None
 
-    for tx in txs_raw[:limit]:
-        ts = int(tx.get("timeStamp", 0)) if tx.get("timeStamp") else None
-        if ts is not None and (latest_ts is None or ts > latest_ts):
-            latest_ts = ts
+def _btc_txs_url(address: str, after_txid: Optional[str] = None) -> str:
+    url = f"{BLOCKSTREAM_API_URL}/address/{address}/txs"
+    return f"{url}/chain/{after_txid}" if after_txid else url
 
-        txs.append(
+
+def _btc_page(data: Any) -> List[Dict[str, Any]]:
+    # Esplora tx objects -> compact scanner dicts, newest first
+    page: List[Dict[str, Any]] = []
+    for tx in data or []:
+        status = tx.get("status") or {}
+        page.append(
             {
-                "hash": tx.get("hash"),
-                "from": tx.get("from"),
-                "to": tx.get("to"),
-                "value": tx.get("value"),
-                "timestamp": ts,
-                "status": "failed" if tx.get("isError") == "1" else "success",
+                "hash": tx.get("txid"),
+                "timestamp": status.get("block_time"),
+                "status": "confirmed" if status.get("confirmed") else "unconfirmed",
             }
         )
-    bal_params = {
-        "chainid": chain_id,
-        "module": "account",
-        "action": "balance",
-        "address": address,
-        "tag": "latest",
-        "apikey": ETHERSCAN_API_KEY,
-    }
-    bal_resp = requests.get(base_url, params=bal_params, timeout=12)
-    bal_resp.raise_for_status()
-    bal_data = bal_resp.json() or {}
-    native_balance = bal_data.get("result")
+    return page
 
-    return {
-        "family": "evm",
-        "chain": chain,
-        "chainId": chain_id,
+
+def _btc_next_txid(page: List[Dict[str, Any]]) -> Optional[str]:
+    # Where the page after this one starts; None once the history is exhausted
+    confirmed = [tx["hash"] for tx in page if tx["status"] == "confirmed"]
+    if len(confirmed) < BTC_TXS_PAGE_SIZE:
+        return None
+    return confirmed[-1]
+
+
+def btc_tx_pages(address: str, after_txid: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a Bitcoin address's whole history from Esplora, one page of
+    compact txs at a time, newest first.
+
+    Without after_txid the first page also lists the address's mempool
+    txs. To resume, pass the last confirmed hash of the last page seen.
+    Pages are requested lazily, so breaking out of the loop stops the
+    paging and only one page is held at a time.
+    """
+    while True:
+        page = _fetch_leg(_Leg(_btc_txs_url(address, after_txid), parse=_btc_page))
+        yield page
+        after_txid = _btc_next_txid(page)
+        if after_txid is None:
+            return
+
+
+async def btc_tx_pages_async(
+    address: str,
+    after_txid: Optional[str] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    btc_tx_pages on the async client.
+    """
+    while True:
+        page = await _fetch_leg_async(_Leg(_btc_txs_url(address, after_txid), parse=_btc_page))
+        yield page
+        after_txid = _btc_next_txid(page)
+        if after_txid is None:
+            return
+
+
+class _BtcHistory:
+    """
+    The txs one BTC scan pages through: newest first down to the stored
+    cursor, then on past the oldest stored tx while fewer than `limit`
+    rows would be stored, until the history ends or `deadline` seconds
+    have passed since the scan started.
+    """
+
+    def __init__(self, address: str, cursor: Optional[str], limit: int, deadline: float):
+        self.address = address
+        self.cursor = cursor
+        self.limit = limit
+        self.deadline = deadline
+        self.end = time.monotonic() + deadline
+        self.txs = TxHistory()
+        # Newest confirmed txid fetched above the cursor: the next cursor
+        self.newest: Optional[str] = None
+        self.stored = 0
+        # Paging reached the cursor or the end of the history, so the
+        # fetched txs are contiguous with what is stored
+        self.reached = False
+        self.error: Optional[str] = None
+
+    def remaining(self) -> float:
+        return self.end - time.monotonic()
+
+    def out_of_time(self) -> bool:
+        """
+        True (and the history marked failed) once the deadline has passed.
+        """
+        if self.remaining() > 0:
+            return False
+        self.error = f"paging stopped after {self.deadline:g}s"
+        return True
+
+    def add(self, page: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Take the next page; return the txid to page after, or None when done.
+        """
+        next_txid = _btc_next_txid(page)
+        for tx in page:
+            if self.cursor is not None and not self.reached and tx["hash"] == self.cursor:
+                self.reached = True
+                if next_txid is None:
+                    return None
+                self.stored, oldest = tx_store.tail("btc", "btc", self.address)
+                if len(self.txs) + self.stored >= self.limit:
+                    return None
+                return oldest
+            if not self.reached and self.newest is None and tx["status"] == "confirmed":
+                self.newest = tx["hash"]
+            self.txs.append(tx)
+
+        if next_txid is None:
+            self.reached = True
+            return None
+        if len(self.txs) + self.stored >= self.limit:
+            return None
+        return next_txid
+
+
+def _btc_check(address: str):
+    if not address or len(address) < 20:
+        raise ValueError("Invalid BTC address.")
+
+
+def _btc_legs(address: str, balance_only: bool = False) -> Tuple[Dict[str, _Leg], Optional[str]]:
+    _btc_check(address)
+
+    legs = {"address": _Leg(f"{BLOCKSTREAM_API_URL}/address/{address}")}
+    if balance_only:
+        return legs, None
+    legs["txs"] = _Leg(_btc_txs_url(address), parse=_btc_page)
+    return legs, tx_store.get_cursor("btc", "btc", address)
+
+
+def _btc_snapshot(
+    address: str,
+    limit: int,
+    history: _BtcHistory,
+    results: Dict[str, Any],
+    errors: Dict[str, str],
+    balance_only: bool = False,
+) -> Dict[str, Any]:
+    native_balance: Optional[str] = None
+    if "address" in results:
+        chain_stats = (results["address"] or {}).get("chain_stats") or {}
+        funded = chain_stats.get("funded_txo_sum") or 0
+        spent = chain_stats.get("spent_txo_sum") or 0
+        native_balance = str(int(funded) - int(spent))
+    snapshot = {
+        "family": "btc",
+        "chain": "btc",
         "address": address,
         "native_balance": native_balance,
-        "native_unit": "wei",
-        "tx_count": len(txs),
-        "latest_timestamp": latest_ts,
-        "transactions": txs,
+        "native_unit": "sats",
     }
+    if balance_only:
+        return _with_errors(snapshot, errors)
 
+    if "txs" in results:
+        if history.error is not None:
+            # Keep what was fetched but leave the cursor, so the next scan
+            # pages down to it again
+            errors["txs"] = history.error
+            tx_store.sync("btc", "btc", address, history.txs, cursor=None, drop_pending=True)
+        else:
+            # The first page always lists the whole mempool, so stored
+            # pending txs it no longer lists were dropped or replaced
+            tx_store.sync(
+                "btc", "btc", address, history.txs,
+                cursor=history.newest,
+                drop_pending=True,
+                replace=not history.reached,
+            )
 
-evm_scan_tool = FunctionTool(
-    func=evm_scan_address,
-)
+    txs = tx_store.recent_history("btc", "btc", address, limit)
+    snapshot["tx_count"] = len(txs)
+    snapshot["latest_timestamp"] = txs.latest_timestamp()
+    snapshot["transactions"] = txs.to_dicts()
+    return _with_errors(snapshot, errors)
 
 
-def btc_scan_address(
+@scan_cache.cached("btc", chain_tip=btc_chain_tip, default_chain="btc", check=_btc_check)
+async def btc_scan_address_async(
     address: str,
     limit: int = 20,
+    balance_only: bool = False,
     tool_context: Optional[ToolContext] = None,
 ) -> Dict[str, Any]:
     """
@@ -160,70 +768,230 @@ def btc_scan_address(
         ...
       ],
     }
+
+    Both endpoints are fetched concurrently; a failed leg leaves its
+    fields empty/None and adds an "error" field.
+
+    Only txs newer than the newest confirmed txid already in tx_store are
+    written; "transactions" is served from the local table. Pages past the
+    first are followed (see btc_tx_pages) until `limit` txs are covered or
+    SCAN_DEADLINE runs out; a scan cut short reports it in "error" and
+    keeps the cursor, so the next scan pages down again.
+
+    balance_only=True fetches /address/{address} alone and leaves out the
+    tx_count / latest_timestamp / transactions fields.
     """
-    if not address or len(address) < 20:
-        raise ValueError("Invalid BTC address.")
+    # tx_store reads and writes are SQLite calls: keep them off the loop
+    legs, cursor = await asyncio.to_thread(_btc_legs, address, balance_only)
+    history = _BtcHistory(address, cursor, limit, SCAN_DEADLINE)
+    results, errors = await _scan_async(legs)
+    if "txs" in results:
+        after = await asyncio.to_thread(history.add, results["txs"])
+        try:
+            while after and not history.out_of_time():
+                page = await asyncio.wait_for(
+                    _fetch_leg_async(_Leg(_btc_txs_url(address, after), parse=_btc_page)),
+                    history.remaining(),
+                )
+                after = await asyncio.to_thread(history.add, page)
+        except asyncio.TimeoutError:
+            history.out_of_time()
+        except (httpx.HTTPError, ValueError) as exc:
+            history.error = str(exc) or type(exc).__name__
+    return await asyncio.to_thread(
+        _btc_snapshot, address, limit, history, results, errors, balance_only
+    )
 
-    addr_url = f"https://blockstream.info/api/address/{address}"
-    addr_resp = requests.get(addr_url, timeout=12)
-    addr_resp.raise_for_status()
-    addr_data = addr_resp.json() or {}
 
-    chain_stats = addr_data.get("chain_stats") or {}
-    funded = chain_stats.get("funded_txo_sum") or 0
-    spent = chain_stats.get("spent_txo_sum") or 0
-    native_balance = str(int(funded) - int(spent))
+@scan_cache.cached("btc", chain_tip=btc_chain_tip, default_chain="btc", check=_btc_check)
+def btc_scan_address(
+    address: str,
+    limit: int = 20,
+    balance_only: bool = False,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict[str, Any]:
+    """
+    Blocking btc_scan_address_async, for sync callers (portfolio, scripts).
+    """
+    legs, cursor = _btc_legs(address, balance_only)
+    history = _BtcHistory(address, cursor, limit, SCAN_DEADLINE)
+    results, errors = _scan(legs)
+    if "txs" in results:
+        after = history.add(results["txs"])
+        try:
+            while after and not history.out_of_time():
+                after = history.add(_fetch_leg(_Leg(_btc_txs_url(address, after), parse=_btc_page)))
+        except (requests.RequestException, ValueError) as exc:
+            history.error = str(exc) or type(exc).__name__
+    return _btc_snapshot(address, limit, history, results, errors, balance_only)
 
-    tx_url = f"https://blockstream.info/api/address/{address}/txs"
-    tx_resp = requests.get(tx_url, timeout=12)
-    tx_resp.raise_for_status()
-    txs_raw: List[Dict[str, Any]] = tx_resp.json() or []
 
-    txs: List[Dict[str, Any]] = []
-    latest_ts: Optional[int] = None
+btc_scan_tool = FunctionTool(
+    func=btc_scan_address_async,
+)
 
-    for tx in txs_raw[:limit]:
-        status = tx.get("status") or {}
-        ts = status.get("block_time")
-        if ts is not None and (latest_ts is None or ts > latest_ts):
-            latest_ts = ts
 
-        txs.append(
-            {
-                "hash": tx.get("txid"),
-                "timestamp": ts,
-                "status": "confirmed" if status.get("confirmed") else "unconfirmed",
-            }
-        )
+def _sol_rpc_results(
+    calls: List[Tuple[str, List[Any]]],
+    replies: Any,
+) -> List[Tuple[Optional[str], Any]]:
+    # One (error, result) per call. Batch replies may come back in any
+    # order, so they are matched to calls by id.
+    if not isinstance(replies, list):
+        # A single error object, e.g. the node refuses batches
+        error = (replies or {}).get("error") or {}
+        raise ValueError(error.get("message") or "unexpected RPC response")
+
+    by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+    out: List[Tuple[Optional[str], Any]] = []
+    for i in range(len(calls)):
+        reply = by_id.get(i)
+        if reply is None:
+            out.append(("missing from RPC batch response", None))
+        elif reply.get("error"):
+            out.append((reply["error"].get("message") or "RPC error", None))
+        else:
+            out.append((None, reply.get("result")))
+    return out
+
+
+def _sol_rpc_payload(calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+
+def _sol_rpc(calls: List[Tuple[str, List[Any]]]) -> List[Tuple[Optional[str], Any]]:
+    """
+    Send calls to SOLANA_RPC_URL as one JSON-RPC batch request.
+    """
+    return _sol_rpc_results(calls, http_client.post_json(SOLANA_RPC_URL, _sol_rpc_payload(calls)))
+
+
+async def _sol_rpc_async(calls: List[Tuple[str, List[Any]]]) -> List[Tuple[Optional[str], Any]]:
+    return _sol_rpc_results(
+        calls, await http_client.apost_json(SOLANA_RPC_URL, _sol_rpc_payload(calls))
+    )
+
 
+def _sol_signatures_call(
+    address: str,
+    limit: int,
+    until: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    options: Dict[str, Any] = {"limit": limit, "commitment": "confirmed"}
+    if until:
+        options["until"] = until
+    if before:
+        options["before"] = before
+    return "getSignaturesForAddress", [address, options]
+
+
+def _sol_tx(sig: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "family": "btc",
-        "chain": "btc",
+        "hash": sig.get("signature"),
+        "timestamp": sig.get("blockTime"),
+        "status": "failed" if sig.get("err") else sig.get("confirmationStatus"),
+    }
+
+
+def _sol_calls(
+    address: str,
+    limit: int,
+    balance_only: bool = False,
+) -> Tuple[List[Tuple[str, List[Any]]], Optional[str]]:
+    if not address or len(address) < 30:
+        raise ValueError("Invalid Solana address.")
+
+    calls = [("getBalance", [address, {"commitment": "confirmed"}])]
+    if balance_only:
+        return calls, None
+    cursor = tx_store.get_cursor("solana", "solana", address)
+    # `until` stops at the newest signature already stored
+    calls.append(_sol_signatures_call(address, limit, until=cursor))
+    stored, oldest = tx_store.tail("solana", "solana", address)
+    if cursor is not None and oldest is not None and stored < limit:
+        # An earlier, shallower scan stored fewer rows than asked for: page
+        # on past the oldest stored signature in the same batch
+        calls.append(_sol_signatures_call(address, limit - stored, before=oldest))
+    return calls, cursor
+
+
+def _sol_results(
+    outcomes: List[Tuple[Optional[str], Any]],
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    # Same contract as _run_legs: per-call errors, raise if nothing succeeded
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name, (error, result) in zip(("balance", "transactions", "backfill"), outcomes):
+        if error is None:
+            results[name] = result
+        else:
+            errors[name] = error
+    if not results:
+        raise ValueError(next(iter(errors.values())))
+    return results, errors
+
+
+def _sol_snapshot(
+    address: str,
+    limit: int,
+    cursor: Optional[str],
+    results: Dict[str, Any],
+    errors: Dict[str, str],
+    balance_only: bool = False,
+) -> Dict[str, Any]:
+    native_balance: Optional[str] = None
+    if "balance" in results:
+        native_balance = str((results["balance"] or {}).get("value") or 0)
+    snapshot = {
+        "family": "solana",
+        "chain": "solana",
         "address": address,
         "native_balance": native_balance,
-        "native_unit": "sats",
-        "tx_count": len(txs),
-        "latest_timestamp": latest_ts,
-        "transactions": txs,
+        "native_unit": "lamports",
     }
+    if balance_only:
+        return _with_errors(snapshot, errors)
 
+    if "transactions" in results:
+        fetched = [_sol_tx(sig) for sig in results["transactions"] or []]
+        newest = fetched[0]["hash"] if fetched else None
+        # A full page may not reach back to the old cursor; what is stored
+        # would then no longer be contiguous with it
+        gap = cursor is not None and len(fetched) >= limit
+        if not gap and "backfill" in results:
+            fetched += [_sol_tx(sig) for sig in results["backfill"] or []]
+        tx_store.sync("solana", "solana", address, fetched, cursor=newest, replace=gap)
+    elif "backfill" in results:
+        # Older than everything stored, so still contiguous with it
+        backfill = [_sol_tx(sig) for sig in results["backfill"] or []]
+        tx_store.sync("solana", "solana", address, backfill, cursor=None)
 
-btc_scan_tool = FunctionTool(
-    func=btc_scan_address,
-)
+    txs = tx_store.recent_history("solana", "solana", address, limit)
+    snapshot["tx_count"] = len(txs)
+    snapshot["latest_timestamp"] = txs.latest_timestamp()
+    snapshot["transactions"] = txs.to_dicts()
+    return _with_errors(snapshot, errors)
 
 
-def sol_scan_address(
+# Slots advance every ~400ms, so a tip would invalidate entries on every
+# poll: Solana entries rely on the TTL alone
+@scan_cache.cached("solana", default_chain="solana")
+async def sol_scan_address_async(
     address: str,
     limit: int = 20,
+    balance_only: bool = False,
     tool_context: Optional[ToolContext] = None,
 ) -> Dict[str, Any]:
     """
-    Scan a Solana address using Solscan.
+    Scan a Solana address over JSON-RPC (config.SOLANA_RPC_URL).
 
-    Uses:
-      - /account/{address}             -> lamport balance
-      - /account/transactions?address= -> recent txs
+    Uses one batched request:
+      - getBalance              -> lamport balance
+      - getSignaturesForAddress -> recent txs
 
     Returns:
     {
@@ -238,65 +1006,127 @@ def sol_scan_address(
         {
           "hash": "...",
           "timestamp": 1234567890,
-          "status": "...",
+          "status": "confirmed" | "finalized" | "failed",
         },
         ...
       ],
     }
+
+    A failed call leaves its fields empty/None and adds an "error" field.
+
+    Only signatures newer than the newest one already in tx_store are
+    requested, plus (while fewer than `limit` are stored) those older than
+    the oldest stored one; "transactions" is served from the local table.
+
+    balance_only=True sends getBalance alone and leaves out the tx_count /
+    latest_timestamp / transactions fields.
     """
-    if not address or len(address) < 30:
-        raise ValueError("Invalid Solana address.")
+    # tx_store reads and writes are SQLite calls: keep them off the loop
+    calls, cursor = await asyncio.to_thread(_sol_calls, address, limit, balance_only)
+    results, errors = _sol_results(await _sol_rpc_async(calls))
+    return await asyncio.to_thread(
+        _sol_snapshot, address, limit, cursor, results, errors, balance_only
+    )
+
+
+@scan_cache.cached("solana", default_chain="solana")
+def sol_scan_address(
+    address: str,
+    limit: int = 20,
+    balance_only: bool = False,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict[str, Any]:
+    """
+    Blocking sol_scan_address_async, for sync callers (scripts).
+    """
+    calls, cursor = _sol_calls(address, limit, balance_only)
+    results, errors = _sol_results(_sol_rpc(calls))
+    return _sol_snapshot(address, limit, cursor, results, errors, balance_only)
+
 
-    headers = {
-        "accept": "application/json",
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
+def sol_get_balances(addresses: Iterable[str]) -> Dict[str, Any]:
+    """
+    Lamport balances for many Solana addresses via getMultipleAccounts,
+    SOLANA_RPC_BATCH_SIZE addresses per request. An address with no
+    account on chain has a balance of "0". A failing chunk marks only its
+    own addresses as errors.
+
+    Returns:
+    {
+      "balances": {address: "<lamports>", ...},
+      "errors": {address: "<message>", ...},
+      "upstream_calls": N,
+    }
+    """
+    accounts = sorted(set(addresses))
+    balances: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+    calls = 0
+    # Lamports only: skip the account data
+    options = {
+        "commitment": "confirmed",
+        "encoding": "base64",
+        "dataSlice": {"offset": 0, "length": 0},
     }
 
-    acc_url = f"https://public-api.solscan.io/account/{address}"
-    acc_resp = requests.get(acc_url, headers=headers, timeout=12)
-    acc_resp.raise_for_status()
-    acc_data = acc_resp.json() or {}
-    native_balance = str(acc_data.get("lamports") or 0)
+    for i in range(0, len(accounts), SOLANA_RPC_BATCH_SIZE):
+        chunk = accounts[i:i + SOLANA_RPC_BATCH_SIZE]
+        calls += 1
+        try:
+            [(error, result)] = _sol_rpc([("getMultipleAccounts", [chunk, options])])
+            if error is not None:
+                raise ValueError(error)
+            values = (result or {}).get("value")
+            if not isinstance(values, list) or len(values) != len(chunk):
+                raise ValueError("unexpected getMultipleAccounts response")
+        except (requests.RequestException, ValueError) as e:
+            for account in chunk:
+                errors[account] = str(e) or type(e).__name__
+            continue
 
-    tx_url = "https://public-api.solscan.io/account/transactions"
-    tx_params = {"address": address, "limit": limit}
-    tx_resp = requests.get(tx_url, headers=headers, params=tx_params, timeout=12)
-    tx_resp.raise_for_status()
-    txs_raw: List[Dict[str, Any]] = tx_resp.json() or []
+        for account, value in zip(chunk, values):
+            balances[account] = str((value or {}).get("lamports") or 0)
 
-    txs: List[Dict[str, Any]] = []
-    latest_ts: Optional[int] = None
+    return {"balances": balances, "errors": errors, "upstream_calls": calls}
 
-    for tx in txs_raw[:limit]:
-        sig = tx.get("tx_hash") or tx.get("signature")
-        ts = tx.get("block_time")
-        if ts is not None and (latest_ts is None or ts > latest_ts):
-            latest_ts = ts
 
-        txs.append(
-            {
-                "hash": sig,
-                "timestamp": ts,
-                "status": tx.get("status"),
-            }
-        )
+def sol_get_signatures(addresses: Iterable[str], limit: int = 20) -> Dict[str, Any]:
+    """
+    The newest `limit` signatures of many Solana addresses, batching
+    SOLANA_RPC_BATCH_SIZE getSignaturesForAddress calls per request.
+    Nothing is read from or written to tx_store.
 
-    return {
-        "family": "solana",
-        "chain": "solana",
-        "address": address,
-        "native_balance": native_balance,
-        "native_unit": "lamports",
-        "tx_count": len(txs),
-        "latest_timestamp": latest_ts,
-        "transactions": txs,
+    Returns:
+    {
+      "signatures": {address: [{"hash", "timestamp", "status"}, ...], ...},
+      "errors": {address: "<message>", ...},
+      "upstream_calls": N,
     }
+    """
+    accounts = sorted(set(addresses))
+    signatures: Dict[str, List[Dict[str, Any]]] = {}
+    errors: Dict[str, str] = {}
+    calls = 0
+
+    for i in range(0, len(accounts), SOLANA_RPC_BATCH_SIZE):
+        chunk = accounts[i:i + SOLANA_RPC_BATCH_SIZE]
+        calls += 1
+        try:
+            outcomes = _sol_rpc([_sol_signatures_call(account, limit) for account in chunk])
+        except (requests.RequestException, ValueError) as e:
+            for account in chunk:
+                errors[account] = str(e) or type(e).__name__
+            continue
+
+        for account, (error, result) in zip(chunk, outcomes):
+            if error is not None:
+                errors[account] = error
+            else:
+                signatures[account] = [_sol_tx(sig) for sig in result or []]
+
+    return {"signatures": signatures, "errors": errors, "upstream_calls": calls}
 
 
 sol_scan_tool = FunctionTool(
-    func=sol_scan_address,
+    func=sol_scan_address_async,
 )
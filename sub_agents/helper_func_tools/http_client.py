@@ -0,0 +1,254 @@
+import asyncio
+import json
+import os
+import threading
+import weakref
+from typing import Any, Dict, Hashable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ...config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_HOSTS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_TIMEOUT,
+    HTTP_USER_AGENT,
+)
+from .rate_limit import bucket_for, retry_delay
+from .single_flight import flights
+
+# One process-wide requests.Session shared by every scanner and fetcher.
+# Its adapters keep a keep-alive connection pool per host (urllib3 pools
+# are thread-safe), so repeated calls to Etherscan, Blockstream, Solana RPC,
+# CoinGecko, ... skip the TCP+TLS handshake. Every request also passes
+# through the host's token bucket (rate_limit) so parallel callers stay
+# under the provider's rate limit.
+
+# The *_json helpers are coalesced (single_flight): identical requests
+# already in flight share one upstream call and its decoded JSON.
+
+# Async tools use one httpx.AsyncClient per event loop (an AsyncClient's
+# connections belong to the loop that opened them), with the same
+# timeouts, User-Agent and per-host token buckets.
+
+# Throttling responses worth waiting out and retrying
+RETRY_STATUSES = frozenset({429, 503})
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = HTTP_USER_AGENT
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    The shared session. A forked child (e.g. a sharded alert check
+    worker) gets its own, since pooled sockets can't cross processes.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session, _session_pid = _new_session(), pid
+    return _session
+
+
+def close_session():
+    """
+    Drop every pooled connection; the next request opens a fresh pool.
+    """
+    global _session
+
+    with _lock:
+        session, _session = _session, None
+    if session is not None and _session_pid == os.getpid():
+        session.close()
+
+
+def request(
+    method: str,
+    url: str,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    Send a request through the shared pool with the package-wide
+    timeouts, rate limited per host. kwargs go to Session.request.
+
+    A 429/503 is retried up to HTTP_MAX_RETRIES times after the server's
+    Retry-After (or a jittered backoff); the wait pauses the whole host's
+    bucket, so concurrent callers back off too. Raises requests.HTTPError
+    on a 4xx/5xx response that is not retried.
+    """
+    bucket = bucket_for(urlsplit(url).hostname)
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        bucket.acquire()
+        resp = get_session().request(
+            method,
+            url,
+            timeout=(HTTP_CONNECT_TIMEOUT, timeout or HTTP_TIMEOUT),
+            **kwargs,
+        )
+        if resp.status_code not in RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+            break
+        bucket.pause(retry_delay(resp.headers.get("Retry-After"), attempt))
+        resp.close()
+    resp.raise_for_status()
+    return resp
+
+
+def _flight_key(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    payload: Any = None,
+) -> Hashable:
+    return (
+        method,
+        url,
+        tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+        tuple(sorted((headers or {}).items())),
+        json.dumps(payload, sort_keys=True) if payload is not None else None,
+    )
+
+
+def get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> requests.Response:
+    return request("GET", url, timeout=timeout, params=params, headers=headers)
+
+
+def get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    return flights.do(
+        _flight_key("GET", url, params, headers),
+        lambda: get(url, params=params, headers=headers, timeout=timeout).json(),
+    )
+
+
+def post_json(
+    url: str,
+    payload: Any,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    POST `payload` as JSON (e.g. a JSON-RPC call) and decode the reply.
+    Only use it for idempotent calls: throttled requests are retried.
+    """
+    return flights.do(
+        _flight_key("POST", url, None, headers, payload),
+        lambda: request("POST", url, timeout=timeout, json=payload, headers=headers).json(),
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    The running loop's shared AsyncClient. Must be called from a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            headers={"User-Agent": HTTP_USER_AGENT},
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_HOSTS * HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_HOSTS * HTTP_POOL_MAXSIZE,
+            ),
+            # requests follows redirects by default; keep the async path alike
+            follow_redirects=True,
+        )
+    return client
+
+
+async def close_async_client():
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def arequest(
+    method: str,
+    url: str,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Async request(): same rate limiting and 429/503 retries, waiting with
+    asyncio.sleep. Raises httpx.HTTPStatusError on a 4xx/5xx response
+    that is not retried.
+    """
+    bucket = bucket_for(urlsplit(url).hostname)
+    client = get_async_client()
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        await bucket.acquire_async()
+        resp = await client.request(
+            method,
+            url,
+            timeout=httpx.Timeout(timeout or HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            **kwargs,
+        )
+        if resp.status_code not in RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+            break
+        bucket.pause(retry_delay(resp.headers.get("Retry-After"), attempt))
+    resp.raise_for_status()
+    return resp
+
+
+async def aget(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> httpx.Response:
+    return await arequest("GET", url, timeout=timeout, params=params, headers=headers)
+
+
+async def aget_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    async def fetch():
+        return (await aget(url, params=params, headers=headers, timeout=timeout)).json()
+
+    return await flights.do_async(_flight_key("GET", url, params, headers), fetch)
+
+
+async def apost_json(
+    url: str,
+    payload: Any,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    async def fetch():
+        return (await arequest("POST", url, timeout=timeout, json=payload, headers=headers)).json()
+
+    return await flights.do_async(_flight_key("POST", url, None, headers, payload), fetch)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from ...config import (
+    ALERT_EMAIL_DIGEST,
+    OUTBOX_BACKOFF_BASE,
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_CONCURRENCY,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_POLL_INTERVAL,
+)
+from .alert_storage import (
+    claim_outbox,
+    mark_outbox_retry,
+    mark_outbox_sent,
+    renew_outbox_lease,
+)
+from .smtp_tools import SMTPSession
+
+logger = logging.getLogger(__name__)
+
+
+def _mark_sent(outbox_ids: List[int]):
+    try:
+        mark_outbox_sent(outbox_ids)
+    except Exception:
+        # The server already accepted the email, so the rows must not go
+        # back for a retry; they stay 'sending' until the lease lapses and
+        # claim_outbox fails them without re-sending
+        logger.exception("outbox rows %s were sent but could not be marked sent", outbox_ids)
+
+
+def drain_outbox(
+    max_workers: int = OUTBOX_CONCURRENCY,
+    batch_size: int = 100,
+    digest: bool = ALERT_EMAIL_DIGEST,
+    session_factory: Callable[[], SMTPSession] = SMTPSession,
+) -> Dict[str, Any]:
+    """
+    Deliver every due outbox row, then return.
+
+    Claimed rows are grouped per recipient; each group is one digest email
+    (or one email per row with digest=False). Groups are sent by up to
+    `max_workers` threads, each holding its own SMTP session for the whole
+    drain. A failed group goes back to 'pending' with backoff; without
+    digests, rows sent before the failure stay sent. The rows' lease is
+    renewed before each send, so a slow drain never outlives it.
+    """
+    local = threading.local()
+    sessions: List[SMTPSession] = []
+    sessions_lock = threading.Lock()
+
+    def session() -> SMTPSession:
+        smtp = getattr(local, "smtp", None)
+        if smtp is None:
+            smtp = local.smtp = session_factory()
+            with sessions_lock:
+                sessions.append(smtp)
+        return smtp
+
+    def deliver(email: str, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Send one recipient's rows; return (rows sent, emails sent).
+        """
+        sent = 0
+        try:
+            smtp = session()
+            if digest:
+                renew_outbox_lease([r["id"] for r in rows])
+                smtp.send_digest(email, [(r["subject"], r["body"]) for r in rows])
+                sent = len(rows)
+            else:
+                for r in rows:
+                    renew_outbox_lease([x["id"] for x in rows[sent:]])
+                    smtp.send(email, r["subject"], r["body"])
+                    sent += 1
+                    # Recorded one by one: a later failure must not re-queue
+                    # an email the server already accepted
+                    _mark_sent([r["id"]])
+        except Exception as e:
+            logger.warning("outbox delivery to %s failed: %s", email, e)
+            mark_outbox_retry(
+                [r["id"] for r in rows[sent:]],
+                error=str(e) or type(e).__name__,
+                max_attempts=OUTBOX_MAX_ATTEMPTS,
+                backoff_base=OUTBOX_BACKOFF_BASE,
+                backoff_max=OUTBOX_BACKOFF_MAX,
+            )
+            return sent, sent
+        if digest:
+            _mark_sent([r["id"] for r in rows])
+            return sent, 1
+        return sent, sent
+
+    sent = failed = emails = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            while True:
+                rows = claim_outbox(limit=batch_size, lease_seconds=OUTBOX_LEASE_SECONDS)
+                if not rows:
+                    break
+
+                by_email: Dict[str, List[Dict[str, Any]]] = {}
+                for r in rows:
+                    by_email.setdefault(r["email"], []).append(r)
+
+                futures = {
+                    pool.submit(deliver, email, group): group
+                    for email, group in by_email.items()
+                }
+                for future, group in futures.items():
+                    rows_sent, emails_sent = future.result()
+                    sent += rows_sent
+                    failed += len(group) - rows_sent
+                    emails += emails_sent
+    finally:
+        for smtp in sessions:
+            smtp.close()
+
+    return {"sent": sent, "failed": failed, "emails": emails}
+
+
+async def run_outbox_sender(
+    stop_event: asyncio.Event,
+    poll_interval: float = OUTBOX_POLL_INTERVAL,
+    max_workers: int = OUTBOX_CONCURRENCY,
+) -> None:
+    """
+    Background loop that drains the outbox every `poll_interval` seconds
+    until `stop_event` is set, so mail delivery never blocks price checks.
+    """
+    while not stop_event.is_set():
+        try:
+            result = await asyncio.to_thread(drain_outbox, max_workers)
+            if result["sent"] or result["failed"]:
+                logger.info("outbox: sent=%d failed=%d", result["sent"], result["failed"])
+        except Exception:
+            logger.exception("outbox drain failed")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,133 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from ...config import HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_RATE_LIMITS
+
+# Process-wide token buckets, one per upstream host, consulted by
+# http_client before every request. Hosts without a configured rate are
+# not throttled, but still back off together after a 429/503.
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second with bursts of up to `burst`.
+    rate <= 0 means unlimited (the bucket then only enforces pauses).
+
+    acquire() reserves a token and sleeps until it is due, so concurrent
+    callers are spaced out instead of racing for the same token.
+    acquire_async() does the same without blocking the event loop; both
+    draw on the same tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take a token; return how many seconds the caller must wait first.
+        """
+        with self._lock:
+            now = self._clock()
+            wait = 0.0
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = -self._tokens / self.rate
+            wait = max(wait, self._paused_until - now)
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """
+        Hold every caller for this host back for `seconds` (e.g. after a
+        429 with Retry-After).
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "waited_s": round(self.waited, 3),
+            }
+
+
+_lock = threading.Lock()
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def bucket_for(host: str) -> TokenBucket:
+    host = (host or "").lower()
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _lock:
+            bucket = _buckets.get(host)
+            if bucket is None:
+                bucket = _buckets[host] = TokenBucket(HTTP_RATE_LIMITS.get(host, 0))
+    return bucket
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        buckets = dict(_buckets)
+    return {host: bucket.stats() for host, bucket in buckets.items()}
+
+
+def retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based): the server's
+    Retry-After (delta-seconds or HTTP date) if given, else jittered
+    exponential backoff. Capped at HTTP_BACKOFF_MAX either way.
+    """
+    if retry_after:
+        try:
+            return min(HTTP_BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(retry_after).timestamp()
+            return min(HTTP_BACKOFF_MAX, max(0.0, when - time.time()))
+        except (TypeError, ValueError):
+            pass
+    delay = min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
@@ -0,0 +1,213 @@
+import asyncio
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ...config import (
+    CHAIN_BLOCK_TIMES,
+    SCAN_CACHE_SIZE,
+    SCAN_CACHE_TTL,
+    SCAN_TIP_POLL_INTERVAL,
+)
+
+# Memoizes chain scans keyed by (family, chain, address, limit,
+# balance_only). An entry is served until the chain tip moves past the
+# height it was scanned at, or SCAN_CACHE_TTL expires, whichever comes
+# first. Tips are polled at most once per SCAN_TIP_POLL_INTERVAL per
+# chain, not per address, and only for chains whose blocks are slower
+# than the TTL (CHAIN_BLOCK_TIMES); faster chains use the TTL alone.
+
+
+class ScanCache:
+    def __init__(
+        self,
+        maxsize: int = SCAN_CACHE_SIZE,
+        ttl: float = SCAN_CACHE_TTL,
+        tip_interval: float = SCAN_TIP_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        block_times: Optional[Dict[str, float]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tip_interval = tip_interval
+        self.block_times = CHAIN_BLOCK_TIMES if block_times is None else block_times
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (snapshot, stored_at, tip)
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], float, Any]]" = OrderedDict()
+        # (family, chain) -> (tip, polled_at)
+        self._tips: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def tip(self, family: str, chain: str, fetch: Callable[[str], Any]) -> Any:
+        """
+        Latest block height for a chain, re-polled at most every
+        tip_interval seconds. None if the chain has no tip source or the
+        poll failed; entries are then governed by the TTL alone.
+        """
+        fresh, tip = self._fresh_tip(family, chain)
+        if fresh:
+            return tip
+        now = self._clock()
+        try:
+            tip = fetch(chain)
+        except Exception:
+            tip = None
+        with self._lock:
+            self._tips[(family, chain)] = (tip, now)
+        return tip
+
+    def tracks_tip(self, chain: str) -> bool:
+        """
+        Whether the chain's tip is worth polling: False when a new block
+        is due before the TTL would expire an entry anyway.
+        """
+        block_time = self.block_times.get(chain)
+        return block_time is None or block_time >= self.ttl
+
+    def _fresh_tip(self, family: str, chain: str) -> Tuple[bool, Any]:
+        with self._lock:
+            cached = self._tips.get((family, chain))
+        if cached is not None and self._clock() - cached[1] < self.tip_interval:
+            return True, cached[0]
+        return False, None
+
+    async def tip_async(self, family: str, chain: str, fetch: Callable[[str], Any]) -> Any:
+        fresh, tip = self._fresh_tip(family, chain)
+        if fresh:
+            return tip
+        # Tip fetchers are sync; only the occasional re-poll needs a thread
+        return await asyncio.to_thread(self.tip, family, chain, fetch)
+
+    def get(self, key: Hashable, tip: Any = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            snapshot, stored_at, stored_tip = entry
+            expired = self._clock() - stored_at > self.ttl
+            advanced = tip is not None and stored_tip is not None and tip != stored_tip
+            if expired or advanced:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(snapshot)
+
+    def put(self, key: Hashable, snapshot: Dict[str, Any], tip: Any = None):
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(snapshot), self._clock(), tip)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tips.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def cached(
+        self,
+        family: str,
+        chain_tip: Optional[Callable[[str], Any]] = None,
+        default_chain: Optional[str] = None,
+        check: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Decorator for a scanner taking (address, [chain,] limit, ...),
+        sync or async; both flavours of a scanner share entries.
+        Snapshots carrying an "error" (partial scans) are never cached.
+
+        `check(address)` validates the address (raising on a bad one)
+        before any tip is fetched.
+        """
+        def decorator(scan):
+            signature = inspect.signature(scan)
+
+            def chain_and_key(args, kwargs) -> Tuple[str, Hashable]:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                params = bound.arguments
+                if check is not None:
+                    check(params["address"])
+                chain = params.get("chain") or default_chain or family
+                # A balance-only snapshot must never answer a full scan
+                balance_only = bool(params.get("balance_only"))
+                limit = None if balance_only else params["limit"]
+                address = params["address"]
+                if family == "evm":
+                    # Checksum casing names the same account (tx_store
+                    # lower-cases it too); BTC/Solana addresses are case-sensitive
+                    address = address.lower()
+                return chain, (family, chain, address, limit, balance_only)
+
+            if inspect.iscoroutinefunction(scan):
+                @functools.wraps(scan)
+                async def async_wrapper(*args, **kwargs):
+                    chain, key = chain_and_key(args, kwargs)
+                    tip = None
+                    if chain_tip and self.tracks_tip(chain):
+                        tip = await self.tip_async(family, chain, chain_tip)
+                    snapshot = self.get(key, tip)
+                    if snapshot is not None:
+                        return snapshot
+
+                    snapshot = await scan(*args, **kwargs)
+                    if not snapshot.get("error"):
+                        self.put(key, snapshot, tip)
+                    return snapshot
+
+                return async_wrapper
+
+            @functools.wraps(scan)
+            def wrapper(*args, **kwargs):
+                chain, key = chain_and_key(args, kwargs)
+                tip = None
+                if chain_tip and self.tracks_tip(chain):
+                    tip = self.tip(family, chain, chain_tip)
+                snapshot = self.get(key, tip)
+                if snapshot is not None:
+                    return snapshot
+
+                snapshot = scan(*args, **kwargs)
+                if not snapshot.get("error"):
+                    self.put(key, snapshot, tip)
+                return snapshot
+
+            return wrapper
+
+        return decorator
+
+
+scan_cache = ScanCache()
+
+
+def scan_cache_stats() -> Dict[str, Any]:
+    return scan_cache.stats()
@@ -0,0 +1,91 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Coalesces identical in-flight upstream calls: while one caller is
+# fetching a key, every other caller asking for the same key waits for
+# that result instead of sending its own request. Nothing is kept once
+# the call finishes (caching is scan_cache's job).
+
+
+class SingleFlight:
+    """
+    Works for threads (do) and coroutines (do_async). Thread and loop
+    flights are kept apart even for the same key: the sync and async
+    transports raise different exception types (requests vs httpx), and
+    each caller only handles its own. A thread waiting on a coroutine
+    could also block that coroutine's own loop.
+
+    Followers get a deep copy of the leader's result, so nobody can
+    mutate a value another caller is holding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._threads: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            future = self._threads.get(key)
+            leader = future is None
+            if leader:
+                future = self._threads[key] = Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._threads[key]
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.calls += 1
+            shared = self._tasks.get((loop, key))
+            leader = shared is None
+            if leader:
+                # A task, so a cancelled leader doesn't cancel its followers
+                shared = self._tasks[(loop, key)] = loop.create_task(fn())
+                shared.add_done_callback(lambda _: self._forget(loop, key))
+            else:
+                self.shared += 1
+
+        result = await asyncio.shield(shared)
+        return result if leader else copy.deepcopy(result)
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: Hashable):
+        with self._lock:
+            self._tasks.pop((loop, key), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "dedup_ratio": round(self.shared / self.calls, 3) if self.calls else 0.0,
+                "in_flight": len(self._threads) + len(self._tasks),
+            }
+
+
+flights = SingleFlight()
+
+
+def single_flight_stats() -> Dict[str, Any]:
+    return flights.stats()
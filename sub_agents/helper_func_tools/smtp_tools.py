@@ -1,17 +1,111 @@
 import smtplib
 from email.mime.text import MIMEText
+from typing import Iterable, List, Optional, Tuple
 
-from ...config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS
+from ...config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, SMTP_TIMEOUT
+
+
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused for many messages.
+
+    The connection is opened lazily on the first send and kept open until
+    close() (or the end of a `with` block). If the server has dropped the
+    connection, the send is retried once on a fresh connection.
+
+    Usage:
+        with SMTPSession() as smtp:
+            for to, subject, body in messages:
+                smtp.send(to, subject, body)
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        user: Optional[str] = SMTP_USER,
+        password: Optional[str] = SMTP_PASS,
+        starttls: bool = True,
+        timeout: float = SMTP_TIMEOUT,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+        self.connects = 0
+        self.sent = 0
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def connect(self):
+        self.close()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connects += 1
+
+    def close(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _sendmail(self, to_email: str, msg: MIMEText):
+        if self._server is None:
+            self.connect()
+        self._server.sendmail(msg["From"], to_email, msg.as_string())
+
+    def send(self, to_email: str, subject: str, body: str):
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = self.user or ""
+        msg["To"] = to_email
+
+        try:
+            self._sendmail(to_email, msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # Stale keep-alive connection: reconnect once and retry
+            self._server = None
+            self.connect()
+            self._sendmail(to_email, msg)
+        self.sent += 1
+
+    def send_digest(self, to_email: str, items: Iterable[Tuple[str, str]], subject: Optional[str] = None):
+        """
+        Combine several (subject, body) notifications for one recipient
+        into a single message.
+        """
+        items = list(items)
+        if not items:
+            return
+        if len(items) == 1:
+            self.send(to_email, items[0][0], items[0][1])
+            return
+        self.send(to_email, subject or f"{len(items)} crypto alerts triggered", build_digest(items))
+
+
+def build_digest(items: List[Tuple[str, str]]) -> str:
+    sections = [f"{subject}\n{'-' * len(subject)}\n{body.rstrip()}" for subject, body in items]
+    return "\n\n".join(sections) + "\n"
 
 
 def send_email(to_email: str, subject: str, body: str):
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = SMTP_USER
-    msg["To"] = to_email
-
-    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-    server.starttls()
-    server.login(SMTP_USER, SMTP_PASS)
-    server.sendmail(SMTP_USER, to_email, msg.as_string())
-    server.quit()
+    with SMTPSession() as smtp:
+        smtp.send(to_email, subject, body)
@@ -0,0 +1,116 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Columnar container for long transaction histories. A list of scanner
+# dicts costs a dict plus its key/value objects per tx; here each field
+# is one column: timestamps and status codes live in typed arrays,
+# sender/receiver addresses are interned (an address's own history
+# repeats it in nearly every row) and wei values are kept as ints.
+# Callers convert to the scanner dict shape only at the tool boundary
+# (to_dicts).
+
+# Stored in the timestamp column for pending txs (timestamp None)
+_PENDING = -1
+
+
+class TxHistory:
+    """
+    Transactions in newest-first order, one column per field.
+
+    transfers=True keeps EVM-style "from", "to" and "value" columns too;
+    BTC/Solana histories only have "hash", "timestamp" and "status".
+    """
+
+    __slots__ = (
+        "transfers",
+        "hashes",
+        "senders",
+        "receivers",
+        "values",
+        "timestamps",
+        "statuses",
+        "_status_names",
+        "_status_codes",
+    )
+
+    def __init__(self, transfers: bool = False):
+        self.transfers = transfers
+        self.hashes: List[Optional[str]] = []
+        self.senders: List[Optional[str]] = []
+        self.receivers: List[Optional[str]] = []
+        self.values: List[Optional[int]] = []
+        self.timestamps = array("q")
+        self.statuses = array("B")
+        # Status strings are a handful of distinct values per history
+        self._status_names: List[Optional[str]] = []
+        self._status_codes: Dict[Optional[str], int] = {}
+
+    @classmethod
+    def from_dicts(cls, txs: Iterable[Dict[str, Any]], transfers: Optional[bool] = None) -> "TxHistory":
+        """
+        Build from scanner dicts; `transfers` defaults to whether the first
+        tx has a "from" field.
+        """
+        txs = iter(txs)
+        first = next(txs, None)
+        history = cls(transfers if transfers is not None else bool(first and "from" in first))
+        if first is not None:
+            history.append(first)
+            history.extend(txs)
+        return history
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def _status_code(self, status: Optional[str]) -> int:
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._status_names)
+            self._status_names.append(status)
+        return code
+
+    def append(self, tx: Dict[str, Any]):
+        self.hashes.append(tx.get("hash"))
+        timestamp = tx.get("timestamp")
+        self.timestamps.append(_PENDING if timestamp is None else int(timestamp))
+        self.statuses.append(self._status_code(tx.get("status")))
+        if self.transfers:
+            sender, receiver, value = tx.get("from"), tx.get("to"), tx.get("value")
+            self.senders.append(sys.intern(sender) if sender else sender)
+            self.receivers.append(sys.intern(receiver) if receiver else receiver)
+            self.values.append(None if value is None else int(value))
+
+    def extend(self, txs: Iterable[Dict[str, Any]]):
+        for tx in txs:
+            self.append(tx)
+
+    def tx(self, i: int) -> Dict[str, Any]:
+        """
+        Row `i` in the scanner dict shape.
+        """
+        timestamp = self.timestamps[i]
+        row: Dict[str, Any] = {"hash": self.hashes[i]}
+        if self.transfers:
+            value = self.values[i]
+            row["from"] = self.senders[i]
+            row["to"] = self.receivers[i]
+            row["value"] = None if value is None else str(value)
+        row["timestamp"] = None if timestamp == _PENDING else timestamp
+        row["status"] = self._status_names[self.statuses[i]]
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # One dict at a time, e.g. for tx_store.sync
+        for i in range(len(self)):
+            yield self.tx(i)
+
+    def to_dicts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        The newest `limit` rows (all by default) as scanner dicts.
+        """
+        n = len(self) if limit is None else min(limit, len(self))
+        return [self.tx(i) for i in range(n)]
+
+    def latest_timestamp(self) -> Optional[int]:
+        return max((t for t in self.timestamps if t != _PENDING), default=None)
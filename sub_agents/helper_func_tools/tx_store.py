@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...config import TX_DB_PATH
+from .tx_history import TxHistory
+
+DB_NAME = TX_DB_PATH
+
+# Local copy of every scanned address's recent transactions, plus a
+# per-address sync cursor so the next scan only fetches what is newer:
+#   evm     -> highest block seen (Etherscan startblock)
+#   btc     -> newest confirmed txid seen
+#   solana  -> newest signature seen
+
+# Same pooling rules as alert_storage: one connection per
+# (thread, process, DB_NAME).
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    key = (os.getpid(), DB_NAME)
+    conn = getattr(_local, "conns", {}).get(key)
+    if conn is not None:
+        return conn
+
+    conn = sqlite3.connect(DB_NAME, isolation_level=None, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    _init_schema(conn)
+    if not hasattr(_local, "conns"):
+        _local.conns = {}
+    _local.conns[key] = conn
+    return conn
+
+
+def close_connections():
+    for conn in getattr(_local, "conns", {}).values():
+        conn.close()
+    _local.conns = {}
+
+
+def _init_schema(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transactions (
+            family TEXT NOT NULL,
+            chain TEXT NOT NULL,
+            address TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            timestamp INTEGER,
+            pending INTEGER NOT NULL DEFAULT 0,
+            data TEXT NOT NULL,
+            PRIMARY KEY (family, chain, address, hash)
+        )
+    """)
+    # Snapshots read one address's newest rows
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_recent
+        ON transactions (family, chain, address, timestamp)
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tx_cursors (
+            family TEXT NOT NULL,
+            chain TEXT NOT NULL,
+            address TEXT NOT NULL,
+            cursor TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (family, chain, address)
+        )
+    """)
+
+
+def get_cursor(family: str, chain: str, address: str) -> Optional[str]:
+    row = _connect().execute(
+        "SELECT cursor FROM tx_cursors WHERE family=? AND chain=? AND address=?",
+        (family, chain, address),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def sync(
+    family: str,
+    chain: str,
+    address: str,
+    txs: Iterable[Dict[str, Any]],
+    cursor: Optional[str],
+    drop_pending: bool = False,
+    replace: bool = False,
+) -> int:
+    """
+    Upsert newly fetched transactions (compact scanner dicts; a None
+    timestamp means pending) and advance the cursor, in one transaction.
+
+    drop_pending=True first deletes the address's stored pending rows, for
+    sources that always return the full mempool (a pending tx that is no
+    longer listed was dropped or replaced).
+
+    replace=True first deletes every stored row for the address, for a
+    fetch that stopped short of the old cursor: what is stored is no
+    longer contiguous with it.
+
+    Returns the number of rows written.
+    """
+    rows = [
+        (family, chain, address, tx["hash"], tx.get("timestamp"),
+         int(tx.get("timestamp") is None), json.dumps(tx))
+        for tx in txs
+        if tx.get("hash")
+    ]
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if replace:
+            conn.execute(
+                "DELETE FROM transactions WHERE family=? AND chain=? AND address=?",
+                (family, chain, address),
+            )
+        elif drop_pending:
+            conn.execute(
+                "DELETE FROM transactions WHERE family=? AND chain=? AND address=? AND pending=1",
+                (family, chain, address),
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO transactions "
+            "(family, chain, address, hash, timestamp, pending, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        if cursor is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO tx_cursors (family, chain, address, cursor, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (family, chain, address, str(cursor), time.time()),
+            )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return len(rows)
+
+
+def recent(family: str, chain: str, address: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    The address's newest `limit` stored transactions, pending first.
+    """
+    return recent_history(family, chain, address, limit).to_dicts()
+
+
+def recent_history(family: str, chain: str, address: str, limit: int) -> TxHistory:
+    """
+    recent() as a columnar TxHistory, filled row by row from the cursor
+    so a long history never exists as a list of dicts.
+    """
+    history = TxHistory(transfers=family == "evm")
+    rows = _connect().execute(
+        "SELECT data FROM transactions WHERE family=? AND chain=? AND address=? "
+        "ORDER BY pending DESC, timestamp DESC, rowid DESC LIMIT ?",
+        (family, chain, address, limit),
+    )
+    for (data,) in rows:
+        history.append(json.loads(data))
+    return history
+
+
+def tail(family: str, chain: str, address: str) -> Tuple[int, Optional[str]]:
+    """
+    (stored row count, hash of the oldest stored confirmed tx), so a scan
+    can tell whether it has to page further back.
+    """
+    conn = _connect()
+    count = conn.execute(
+        "SELECT COUNT(*) FROM transactions WHERE family=? AND chain=? AND address=?",
+        (family, chain, address),
+    ).fetchone()[0]
+    row = conn.execute(
+        "SELECT hash FROM transactions WHERE family=? AND chain=? AND address=? AND pending=0 "
+        "ORDER BY timestamp ASC, rowid ASC LIMIT 1",
+        (family, chain, address),
+    ).fetchone()
+    return count, row[0] if row else None
@@ -1,6 +1,6 @@
+import asyncio
 import html
 import re
-import requests
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional
 
@@ -9,53 +9,23 @@ from google.adk.tools import FunctionTool, ToolContext
 from google.adk.tools import google_search
 
 from ..config import DEFAULT_MODEL
+from .helper_func_tools import http_client
 
-def _fetch_rss(
-    url: str,
+RSS_HEADERS = {
+    "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
+}
+
+COINDESK_RSS_URL = "https://www.coindesk.com/arc/outboundfeeds/rss/"
+DECRYPT_RSS_URL = "https://decrypt.co/feed"
+COINTELEGRAPH_RSS_URL = "https://cointelegraph.com/rss"
+
+
+def _parse_rss(
+    content: str,
     source_name: str,
     category: str,
     limit: int = 5,
 ) -> Dict[str, Any]:
-    """
-    Generic RSS fetcher for crypto news sources.
-
-    Fetches and parses RSS XML feeds, extracting article metadata including
-    title, link, and publication date. Returns a structured dictionary with
-    source information and article items.
-
-    Args:
-        url: RSS feed URL to fetch
-        source_name: Name identifier for the news source (e.g., "coindesk", "decrypt")
-        category: News category classification (e.g., "headlines", "altcoins", "topic")
-        limit: Maximum number of articles to return (default: 5)
-
-    Returns:
-        Dict containing:
-            - source: Source name identifier
-            - category: News category
-            - items: List of article dictionaries with keys:
-                * title: Article title (HTML unescaped)
-                * link: Article URL
-                * published: Publication date string
-
-    Raises:
-        requests.HTTPError: If the RSS feed request fails
-        xml.etree.ElementTree.ParseError: If RSS XML parsing fails
-
-    """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
-    }
-
-    resp = requests.get(url, headers=headers, timeout=10)
-    resp.raise_for_status()
-    content = resp.text
-
     root = ET.fromstring(content)
     items: List[Dict[str, Any]] = []
 
@@ -90,7 +60,59 @@ def _fetch_rss(
         "items": items,
     }
 
-def fetch_coindesk_decrypt_headlines(
+
+def _fetch_rss(
+    url: str,
+    source_name: str,
+    category: str,
+    limit: int = 5,
+) -> Dict[str, Any]:
+    """
+    Generic RSS fetcher for crypto news sources.
+
+    Fetches and parses RSS XML feeds, extracting article metadata including
+    title, link, and publication date. Returns a structured dictionary with
+    source information and article items.
+
+    Args:
+        url: RSS feed URL to fetch
+        source_name: Name identifier for the news source (e.g., "coindesk", "decrypt")
+        category: News category classification (e.g., "headlines", "altcoins", "topic")
+        limit: Maximum number of articles to return (default: 5)
+
+    Returns:
+        Dict containing:
+            - source: Source name identifier
+            - category: News category
+            - items: List of article dictionaries with keys:
+                * title: Article title (HTML unescaped)
+                * link: Article URL
+                * published: Publication date string
+
+    Raises:
+        requests.HTTPError: If the RSS feed request fails
+        xml.etree.ElementTree.ParseError: If RSS XML parsing fails
+
+    """
+    content = http_client.get(url, headers=RSS_HEADERS, timeout=10).text
+    return _parse_rss(content, source_name, category, limit)
+
+
+async def _fetch_rss_async(
+    url: str,
+    source_name: str,
+    category: str,
+    limit: int = 5,
+) -> Dict[str, Any]:
+    """
+    _fetch_rss on the shared async client (raises httpx.HTTPStatusError
+    instead of requests.HTTPError).
+    """
+    resp = await http_client.aget(url, headers=RSS_HEADERS, timeout=10)
+    return _parse_rss(resp.text, source_name, category, limit)
+
+
+async def fetch_coindesk_decrypt_headlines_async(
       limit_per_source: int = 5,
       tool_context: Optional[ToolContext] = None,
   ) -> Dict[str, Any]:
@@ -99,6 +121,7 @@ def fetch_coindesk_decrypt_headlines(
 
     Aggregates news from two major crypto news sources, returning a structured
     bundle of recent headlines suitable for market overview and general crypto updates.
+    Both feeds are fetched concurrently.
 
     Args:
         limit_per_source: Maximum number of articles to fetch from each source (default: 5)
@@ -112,34 +135,37 @@ def fetch_coindesk_decrypt_headlines(
                 * items: List of article dictionaries with title, link, published
 
     Raises:
-        requests.HTTPError: If RSS feed requests fail
+        httpx.HTTPStatusError: If RSS feed requests fail
         xml.etree.ElementTree.ParseError: If RSS XML parsing fails
     """
-
-    coindesk_url = "https://www.coindesk.com/arc/outboundfeeds/rss/"
-    coindesk = _fetch_rss(
-        url=coindesk_url,
-        source_name="coindesk",
-        category="headlines",
-        limit=limit_per_source,
+    coindesk, decrypt = await asyncio.gather(
+        _fetch_rss_async(COINDESK_RSS_URL, "coindesk", "headlines", limit_per_source),
+        _fetch_rss_async(DECRYPT_RSS_URL, "decrypt", "headlines", limit_per_source),
     )
+    return {
+        "category": "headlines",
+        "sources": [coindesk, decrypt],
+    }
 
 
-    decrypt_url = "https://decrypt.co/feed"
-    decrypt = _fetch_rss(
-        url=decrypt_url,
-        source_name="decrypt",
-        category="headlines",
-        limit=limit_per_source,
-    )
-
+def fetch_coindesk_decrypt_headlines(
+      limit_per_source: int = 5,
+      tool_context: Optional[ToolContext] = None,
+  ) -> Dict[str, Any]:
+    """
+    Blocking fetch_coindesk_decrypt_headlines_async (feeds fetched one
+    after the other).
+    """
     return {
         "category": "headlines",
-        "sources": [coindesk, decrypt],
+        "sources": [
+            _fetch_rss(COINDESK_RSS_URL, "coindesk", "headlines", limit_per_source),
+            _fetch_rss(DECRYPT_RSS_URL, "decrypt", "headlines", limit_per_source),
+        ],
     }
 
 
-def fetch_cointelegraph_altcoin_headlines(
+async def fetch_cointelegraph_altcoin_headlines_async(
       limit: int = 5,
       tool_context: Optional[ToolContext] = None,
   ) -> Dict[str, Any]:
@@ -162,29 +188,35 @@ def fetch_cointelegraph_altcoin_headlines(
                 * items: List of article dictionaries with title, link, published
 
     Raises:
-        requests.HTTPError: If RSS feed request fails
+        httpx.HTTPStatusError: If RSS feed request fails
         xml.etree.ElementTree.ParseError: If RSS XML parsing fails
     """
-    cointelegraph_url = "https://cointelegraph.com/rss"
-    ct = _fetch_rss(
-        url=cointelegraph_url,
-        source_name="cointelegraph",
-        category="altcoins",
-        limit=limit,
-    )
-
+    ct = await _fetch_rss_async(COINTELEGRAPH_RSS_URL, "cointelegraph", "altcoins", limit)
     return {
         "category": "altcoins",
         "sources": [ct],
     }
 
-# Wrap tools
+
+def fetch_cointelegraph_altcoin_headlines(
+      limit: int = 5,
+      tool_context: Optional[ToolContext] = None,
+  ) -> Dict[str, Any]:
+    """
+    Blocking fetch_cointelegraph_altcoin_headlines_async.
+    """
+    return {
+        "category": "altcoins",
+        "sources": [_fetch_rss(COINTELEGRAPH_RSS_URL, "cointelegraph", "altcoins", limit)],
+    }
+
+# Wrap tools (async: ParallelAgent branches overlap their feed downloads)
 coindesk_decrypt_tool = FunctionTool(
-    func=fetch_coindesk_decrypt_headlines,
+    func=fetch_coindesk_decrypt_headlines_async,
 )
 
 cointelegraph_tool = FunctionTool(
-    func=fetch_cointelegraph_altcoin_headlines,
+    func=fetch_cointelegraph_altcoin_headlines_async,
 )
 
 
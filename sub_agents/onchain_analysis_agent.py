@@ -1,46 +1,23 @@
-import requests
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.adk.agents import LlmAgent, SequentialAgent
 from google.adk.tools import FunctionTool, ToolContext
 from google.adk.tools import google_search
 
 from ..config import DEFAULT_MODEL
+from .helper_func_tools import http_client
 
 
-# helper function to fetch dexscreener pairs
-def fetch_dexscreener_pairs(
-        query: str,
-        limit: int = 1,
-        tool_context: Optional[ToolContext] = None,
-    ) -> Dict[str, Any]:
+DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
 
-    """
-    Calls Dexscreener api endpoint with a query.
-    Example queries:
-      - token name (e.g. "SACHI")
-      - token address / mint
-      - pair URL or pair address
-
-    Returns a compact JSON with at most `limit` pairs and only useful fields.
-    """
 
+def _dexscreener_request(query: str) -> Tuple[str, Dict[str, str], Dict[str, str]]:
     if not query:
         raise ValueError("query is required for Dexscreener search.")
+    return DEXSCREENER_SEARCH_URL, {"q": query}, {"Accept": "application/json"}
 
-    url = f"https://api.dexscreener.com/latest/dex/search?q={query}"
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "application/json",
-    }
 
-    resp = requests.get(url, headers=headers, timeout=15)
-    resp.raise_for_status()
-    data = resp.json()
+def _compact_pairs(query: str, data: Dict[str, Any], limit: int) -> Dict[str, Any]:
     pairs: List[Dict[str, Any]] = data.get("pairs") or []
     pairs = pairs[:limit] if limit > 0 else pairs
     compact_pairs: List[Dict[str, Any]] = []
@@ -89,8 +66,42 @@ def fetch_dexscreener_pairs(
     }
 
 
+# helper function to fetch dexscreener pairs
+async def fetch_dexscreener_pairs_async(
+        query: str,
+        limit: int = 1,
+        tool_context: Optional[ToolContext] = None,
+    ) -> Dict[str, Any]:
+
+    """
+    Calls Dexscreener api endpoint with a query.
+    Example queries:
+      - token name (e.g. "SACHI")
+      - token address / mint
+      - pair URL or pair address
+
+    Returns a compact JSON with at most `limit` pairs and only useful fields.
+    """
+    url, params, headers = _dexscreener_request(query)
+    data = await http_client.aget_json(url, params=params, headers=headers, timeout=15)
+    return _compact_pairs(query, data, limit)
+
+
+def fetch_dexscreener_pairs(
+        query: str,
+        limit: int = 1,
+        tool_context: Optional[ToolContext] = None,
+    ) -> Dict[str, Any]:
+    """
+    Blocking fetch_dexscreener_pairs_async.
+    """
+    url, params, headers = _dexscreener_request(query)
+    data = http_client.get_json(url, params=params, headers=headers, timeout=15)
+    return _compact_pairs(query, data, limit)
+
+
 dexscreener_tool = FunctionTool(
-    func=fetch_dexscreener_pairs,
+    func=fetch_dexscreener_pairs_async,
 )
 
 
@@ -105,7 +116,7 @@ Your job:
        * contract/mint address
        * Dexscreener URL
 2) Build a good search string for Dexscreener and call:
-       fetch_dexscreener_pairs(query=<string>, limit=1)
+       fetch_dexscreener_pairs_async(query=<string>, limit=1)
        use tool_context to pass in the query
        the query is the token which the user wants to analyze 
        (its the token name so pass the token name from the user message)
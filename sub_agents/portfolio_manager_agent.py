@@ -1,15 +1,28 @@
+import functools
 import time
 import sqlite3
-from typing import Any, Dict, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
 
 from google.adk.agents import LlmAgent
 from google.adk.tools import FunctionTool, ToolContext
 
-from ..config import PORTFOLIO_DB_PATH, DEFAULT_MODEL
+from ..config import (
+    DEFAULT_MODEL,
+    PORTFOLIO_DB_PATH,
+    PORTFOLIO_FAMILY_CONCURRENCY,
+    PORTFOLIO_REFRESH_DEADLINE,
+    PORTFOLIO_REFRESH_WORKERS,
+    SOLANA_RPC_BATCH_SIZE,
+)
+from .helper_func_tools.address_classifier import classify_address
 from .helper_func_tools.general_helper_tools import (
     evm_scan_address,
+    evm_get_balances,
     btc_scan_address,
     sol_scan_address,
+    sol_get_balances,
 )
 
 DB_PATH = PORTFOLIO_DB_PATH
@@ -70,12 +83,11 @@ def add_address_to_portfolio(
         else:
             family, chain = "evm", chain_hint.lower()
     else:
-        if address.startswith("0x") and len(address) == 42:
-            family, chain = "evm", "ethereum"
-        elif address.startswith(("bc1", "1", "3")):
-            family, chain = "btc", "btc"
-        else:
-            family, chain = "solana", "solana"
+        detected = classify_address(address)
+        if detected is None:
+            raise ValueError(f"Unrecognized address: {address}")
+        family = detected
+        chain = {"evm": "ethereum", "btc": "btc", "solana": "solana"}[detected]
 
     # helper function to scan blockchain
     if family == "evm":
@@ -120,6 +132,117 @@ add_to_portfolio_tool = FunctionTool(
 )
 
 
+NATIVE_UNITS = {"evm": "wei", "btc": "sats", "solana": "lamports"}
+
+# Refresh jobs run here, not on the scanners' leg pool they use themselves
+_refresh_pool = ThreadPoolExecutor(
+    max_workers=PORTFOLIO_REFRESH_WORKERS, thread_name_prefix="portfolio-refresh"
+)
+
+# (address, chain) -> snapshot with at least native_balance/native_unit
+Snapshots = Dict[Tuple[str, str], Dict[str, Any]]
+
+
+class _Job(NamedTuple):
+    family: str
+    keys: List[Tuple[str, str]]
+    fn: Callable[[], Snapshots]
+
+
+def _evm_job(keys: List[Tuple[str, str]]) -> Snapshots:
+    evm = evm_get_balances(keys)
+    out: Snapshots = {}
+    for key in keys:
+        out[key] = {"native_balance": evm["balances"].get(key), "native_unit": "wei"}
+        if key in evm["errors"]:
+            out[key]["error"] = evm["errors"][key]
+    return out
+
+
+def _sol_job(keys: List[Tuple[str, str]]) -> Snapshots:
+    sol = sol_get_balances([address for address, _ in keys])
+    out: Snapshots = {}
+    for key in keys:
+        address = key[0]
+        out[key] = {"native_balance": sol["balances"].get(address), "native_unit": "lamports"}
+        if address in sol["errors"]:
+            out[key]["error"] = sol["errors"][address]
+    return out
+
+
+def _btc_job(key: Tuple[str, str]) -> Snapshots:
+    return {key: btc_scan_address(address=key[0], balance_only=True)}
+
+
+def _refresh_jobs(rows: List[Tuple[str, str, str]]) -> List[_Job]:
+    """
+    One job per EVM chain (balancemulti batches inside), per Solana batch
+    and per BTC address.
+    """
+    evm_by_chain: Dict[str, List[Tuple[str, str]]] = {}
+    sol: List[Tuple[str, str]] = []
+    jobs: List[_Job] = []
+    for address, chain, family in rows:
+        if family == "evm":
+            evm_by_chain.setdefault(chain, []).append((address, chain))
+        elif family == "btc":
+            jobs.append(_Job("btc", [(address, chain)], functools.partial(_btc_job, (address, chain))))
+        else:
+            sol.append((address, chain))
+
+    for keys in evm_by_chain.values():
+        jobs.append(_Job("evm", keys, functools.partial(_evm_job, keys)))
+    for i in range(0, len(sol), SOLANA_RPC_BATCH_SIZE):
+        keys = sol[i:i + SOLANA_RPC_BATCH_SIZE]
+        jobs.append(_Job("solana", keys, functools.partial(_sol_job, keys)))
+    return jobs
+
+
+def _run_refresh_jobs(jobs: List[_Job], deadline: float) -> Tuple[Snapshots, Dict[Tuple[str, str], str]]:
+    """
+    Run jobs on the refresh pool, at most PORTFOLIO_FAMILY_CONCURRENCY
+    per family at a time, until they are all done or `deadline` passes.
+
+    Returns (snapshots, failures); keys of jobs that raised are in
+    failures, keys of jobs still queued or running at the deadline are in
+    neither.
+    """
+    queues: Dict[str, Deque[_Job]] = {}
+    for job in jobs:
+        queues.setdefault(job.family, deque()).append(job)
+    running: Dict[Future, _Job] = {}
+    snapshots: Snapshots = {}
+    failures: Dict[Tuple[str, str], str] = {}
+    end = time.monotonic() + deadline
+
+    def submit_ready():
+        for family, queue in queues.items():
+            active = sum(1 for job in running.values() if job.family == family)
+            while queue and active < PORTFOLIO_FAMILY_CONCURRENCY.get(family, 1):
+                job = queue.popleft()
+                running[_refresh_pool.submit(job.fn)] = job
+                active += 1
+
+    submit_ready()
+    while running:
+        done, _ = wait(running, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            job = running.pop(future)
+            exc = future.exception()
+            if exc is not None:
+                for key in job.keys:
+                    failures[key] = str(exc) or type(exc).__name__
+            else:
+                snapshots.update(future.result())
+        submit_ready()
+
+    for future in running:
+        future.cancel()
+    return snapshots, failures
+
+
 def refresh_and_aggregate_portfolio(
     tool_context: Optional[ToolContext] = None,
 ) -> Dict[str, Any]:
@@ -127,6 +250,15 @@ def refresh_and_aggregate_portfolio(
     Refresh all portfolio entries by re-scanning blockchains
     and compute totals per chain using ONLY Python.
 
+    EVM balances come from batched balancemulti requests (one call per
+    20 addresses per chain) and Solana balances from getMultipleAccounts
+    (one call per 100 addresses) instead of a full scan per address.
+
+    The fetches run concurrently (PORTFOLIO_FAMILY_CONCURRENCY jobs per
+    family) under PORTFOLIO_REFRESH_DEADLINE. An address that is not
+    refreshed in time, or whose fetch failed, keeps its last stored
+    balance and is marked "stale". Fresh balances are written back.
+
     Returns:
     {
       "total_addresses": N,
@@ -139,6 +271,9 @@ def refresh_and_aggregate_portfolio(
               "address": "...",
               "native_balance": "<string>",
               "native_unit": "wei" | "sats" | "lamports",
+              "error": "...",  # only if part of the scan failed
+              "stale": True,  # only if this is the last stored balance
+              "last_updated": 1234567890,  # with "stale"
             }, ...
           ],
           "total_native": "<string>",
@@ -151,24 +286,39 @@ def refresh_and_aggregate_portfolio(
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
     cur.execute(
-        "SELECT address, chain, family FROM portfolio"
+        "SELECT address, chain, family, native_balance, native_unit, last_updated FROM portfolio"
     )
     rows = cur.fetchall()
     conn.close()
 
+    deadline = PORTFOLIO_REFRESH_DEADLINE
+    snapshots, failures = _run_refresh_jobs(
+        _refresh_jobs([(address, chain, family) for address, chain, family, *_ in rows]),
+        deadline,
+    )
+
     by_chain: Dict[str, Dict[str, Any]] = {}
     total_addresses = 0
+    refreshed: List[Tuple[str, str, int, str, str]] = []
+    ts = int(time.time())
 
-    for address, chain, family in rows:
+    for address, chain, family, stored_balance, stored_unit, last_updated in rows:
         total_addresses += 1
 
-        # Re-scan using helper functions (fresh data)
-        if family == "evm":
-            snap = evm_scan_address(address=address, chain=chain, limit=10)
-        elif family == "btc":
-            snap = btc_scan_address(address=address, limit=10)
-        else:
-            snap = sol_scan_address(address=address, limit=10)
+        snap = snapshots.get((address, chain))
+        # A failed balance chunk still yields a snapshot, just without a balance
+        stale = snap is None or (bool(snap.get("error")) and snap.get("native_balance") is None)
+        if stale:
+            error = snap["error"] if snap is not None else failures.get(
+                (address, chain), f"not refreshed within {deadline:g}s"
+            )
+            snap = {
+                "native_balance": stored_balance,
+                "native_unit": stored_unit or NATIVE_UNITS.get(family),
+                "error": error,
+            }
+        elif not snap.get("error") and snap.get("native_balance") is not None:
+            refreshed.append((snap["native_balance"], snap.get("native_unit"), ts, address, chain))
 
         bal_str = snap.get("native_balance") or "0"
         unit = snap.get("native_unit") or "unknown"
@@ -189,15 +339,30 @@ def refresh_and_aggregate_portfolio(
                 "native_unit": unit,
             }
 
-        by_chain[key]["addresses"].append(
-            {
-                "address": address,
-                "native_balance": bal_str,
-                "native_unit": unit,
-            }
-        )
+        entry = {
+            "address": address,
+            "native_balance": bal_str,
+            "native_unit": unit,
+        }
+        if snap.get("error"):
+            # Partial scan: surface it rather than silently counting 0
+            entry["error"] = snap["error"]
+        if stale:
+            entry["stale"] = True
+            entry["last_updated"] = last_updated
+        by_chain[key]["addresses"].append(entry)
         by_chain[key]["total_native_int"] += bal_int
 
+    if refreshed:
+        conn = sqlite3.connect(DB_PATH)
+        conn.executemany(
+            "UPDATE portfolio SET native_balance=?, native_unit=?, last_updated=? "
+            "WHERE address=? AND chain=?",
+            refreshed,
+        )
+        conn.commit()
+        conn.close()
+
     # Convert totals back to string
     result_by_chain = []
     for key, entry in by_chain.items():
@@ -249,6 +414,8 @@ You ONLY handle portfolio-related tasks, NOT raw transaction checks.
        * group by chain/family,
        * per-chain total native balance,
        * list addresses with their balances.
+       * for addresses marked "stale", say the balance is the last one
+         stored (at "last_updated") and could not be refreshed just now.
    - Keep it readable, not raw JSON.
 
 Rules:
@@ -0,0 +1,124 @@
+# alert_bulk_script.py
+#
+# Bulk import / export of price alerts as CSV.
+#
+#   python alert_bulk_script.py import cohort.csv
+#   python alert_bulk_script.py export --status active > alerts.csv
+#
+# Import expects a header row with: token,target,direction,email
+
+import sys
+import os
+import argparse
+import csv
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add project root to path to allow imports when run directly
+script_dir = os.path.dirname(os.path.abspath(__file__))
+# Go up: scripts -> sub_agents -> Seam_CryptoPurr -> Agent dev
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+try:
+    # Try relative imports first (when used as module)
+    from ..helper_func_tools.alert_storage import bulk_add_alerts, iter_alerts
+    from ..helper_func_tools.coin_index import index_available, resolve_coin_id
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_storage import bulk_add_alerts, iter_alerts
+    from Seam_CryptoPurr.sub_agents.helper_func_tools.coin_index import (
+        index_available,
+        resolve_coin_id,
+    )
+
+
+IMPORT_FIELDS = ("token", "target", "direction", "email")
+EXPORT_FIELDS = ("id", "token", "coin_id", "target", "direction", "email", "status")
+
+
+def _read_rows(
+    path: str, errors: List[str]
+) -> Iterator[Tuple[str, float, str, str, Optional[str]]]:
+    # Cohorts reuse a few tokens; resolve each distinct one once
+    coin_ids: Dict[str, Optional[str]] = {}
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [name for name in IMPORT_FIELDS if name not in (reader.fieldnames or [])]
+        if missing:
+            raise SystemExit(f"missing CSV columns: {', '.join(missing)}")
+
+        for line_no, row in enumerate(reader, start=2):
+            token = (row["token"] or "").strip()
+            direction = (row["direction"] or "").strip().lower()
+            email = (row["email"] or "").strip()
+            try:
+                target = float(row["target"])
+            except (TypeError, ValueError):
+                errors.append(f"line {line_no}: invalid target {row['target']!r}")
+                continue
+            if not token or not email or direction not in ("above", "below"):
+                errors.append(f"line {line_no}: invalid row {row!r}")
+                continue
+            if token.lower() not in coin_ids:
+                coin_ids[token.lower()] = resolve_coin_id(token)
+            coin_id = coin_ids[token.lower()]
+            if not coin_id and index_available():
+                errors.append(f"line {line_no}: unknown token {token!r}")
+                continue
+            # Without a coin list yet, the row is kept with coin_id NULL and
+            # resolved by the next alert check
+            yield token, target, direction, email, coin_id
+
+
+def cmd_import(args) -> None:
+    errors: List[str] = []
+    started = time.perf_counter()
+    inserted = bulk_add_alerts(_read_rows(args.csv_path, errors), batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+
+    for err in errors[:20]:
+        print(err, file=sys.stderr)
+    if len(errors) > 20:
+        print(f"... and {len(errors) - 20} more invalid rows", file=sys.stderr)
+    if not index_available():
+        print("CoinGecko coin list unavailable; tokens are resolved on the next alert check",
+              file=sys.stderr)
+    print({"inserted": inserted, "rejected": len(errors), "elapsed_s": round(elapsed, 3)})
+
+
+def cmd_export(args) -> None:
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for alert in iter_alerts(status=args.status):
+            writer.writerow(alert)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export price alerts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="import alerts from a CSV file")
+    p_import.add_argument("csv_path")
+    p_import.add_argument("--batch-size", type=int, default=10000,
+                          help="rows per transaction (default: %(default)s)")
+    p_import.set_defaults(func=cmd_import)
+
+    p_export = sub.add_parser("export", help="stream alerts as CSV")
+    p_export.add_argument("--status", choices=["active", "triggered", "cancelled"],
+                          help="only export alerts with this status")
+    p_export.add_argument("-o", "--output", help="write to a file instead of stdout")
+    p_export.set_defaults(func=cmd_export)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
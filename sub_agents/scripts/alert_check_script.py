@@ -1,8 +1,12 @@
 # alert_check_script.py
+#
+# Thin CLI wrapper around helper_func_tools.alert_checker. The agent tools
+# call the checker in-process; this script is for cron / manual runs.
 
 import sys
 import os
-import requests
+import argparse
+import time
 
 # Add project root to path to allow imports when run directly
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,58 +17,36 @@ if project_root not in sys.path:
 
 try:
     # Try relative imports first (when used as module)
-    from ..helper_func_tools.alert_storage import get_active_alerts, mark_triggered
-    from ..helper_func_tools.smtp_tools import send_email
+    from ..helper_func_tools.alert_checker import (
+        run_alert_check_sharded,
+        run_alert_check_timed,
+    )
 except ImportError:
     # Fall back to absolute imports (when run directly)
-    from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_storage import get_active_alerts, mark_triggered
-    from Seam_CryptoPurr.sub_agents.helper_func_tools.smtp_tools import send_email
-
-
-def get_price(token: str) -> float:
-    url = f"https://api.coingecko.com/api/v3/simple/price?ids={token.lower()}&vs_currencies=usd"
-    res = requests.get(url, timeout=10).json()
-    return float(list(res.values())[0]["usd"])
-
-
-def run_alert_check():
-    alerts = get_active_alerts()
-    if not alerts:
-        return {"status": "no-alerts"}
-
-    triggered = []
-
-    for a in alerts:
-        token = a["token"]
-        target = a["target"]
-        direction = a["direction"]
-        email = a["email"]
-
-        try:
-            price = get_price(token)
-        except:
-            continue
-
-        hit = (
-            price >= target if direction == "above"
-            else price <= target if direction == "below"
-            else False
-        )
-
-        if hit:
-            subject = f"ALERT: {token} price hit target!"
-            body = (
-                f"Your alert for {token} ({direction} {target}) has been triggered.\n"
-                f"Current price: ${price}\n"
-            )
-            send_email(email, subject, body)
-            triggered.append(a["id"])
-
-    for alert_id in triggered:
-        mark_triggered(alert_id)
-
-    return {"status": "completed", "triggered": triggered}
+    from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_checker import (
+        run_alert_check_sharded,
+        run_alert_check_timed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run one price alert check.")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="evaluate alerts across N worker processes (default: in-process)")
+    parser.add_argument("--by", choices=["token", "id"], default="token",
+                        help="sharding key (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.shards > 0:
+        started = time.perf_counter()
+        result = run_alert_check_sharded(shards=args.shards, by=args.by)
+        print({
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            "result": result,
+        })
+    else:
+        print(run_alert_check_timed())
 
 
 if __name__ == "__main__":
-    print(run_alert_check())
+    main()
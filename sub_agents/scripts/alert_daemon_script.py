@@ -0,0 +1,45 @@
+# alert_daemon_script.py
+#
+# Resident alert checker: polls prices on a fixed interval and evaluates
+# every active alert each cycle. Stop with SIGTERM or Ctrl+C.
+
+import sys
+import os
+import argparse
+import asyncio
+import logging
+
+# Add project root to path to allow imports when run directly
+script_dir = os.path.dirname(os.path.abspath(__file__))
+# Go up: scripts -> sub_agents -> Seam_CryptoPurr -> Agent dev
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+try:
+    # Try relative imports first (when used as module)
+    from ..helper_func_tools.alert_daemon import AlertDaemon
+    from ...config import ALERT_POLL_INTERVAL, ALERT_POLL_JITTER
+except ImportError:
+    # Fall back to absolute imports (when run directly)
+    from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_daemon import AlertDaemon
+    from Seam_CryptoPurr.config import ALERT_POLL_INTERVAL, ALERT_POLL_JITTER
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the resident price alert checker.")
+    parser.add_argument("--interval", type=float, default=ALERT_POLL_INTERVAL,
+                        help="seconds between cycle starts (default: %(default)s)")
+    parser.add_argument("--jitter", type=float, default=ALERT_POLL_JITTER,
+                        help="random +/- seconds added to each wait (default: %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    daemon = AlertDaemon(interval=args.interval, jitter=args.jitter)
+    asyncio.run(daemon.run_forever())
+    print(daemon.stats())
+
+
+if __name__ == "__main__":
+    main()
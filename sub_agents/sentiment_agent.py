@@ -1,13 +1,29 @@
-import requests
 from typing import Any, Dict, Optional
 
 from google.adk.tools import FunctionTool, ToolContext
 from google.adk.agents import LlmAgent
 
 from ..config import DEFAULT_MODEL
+from .helper_func_tools import http_client
 
 
-def fetch_fear_greed_index(
+FEAR_GREED_URL = "https://api.alternative.me/fng/?limit=1&format=json"
+
+
+def _parse_fear_greed(data: Dict[str, Any]) -> Dict[str, Any]:
+    if not data.get("data") or len(data["data"]) == 0:
+        raise ValueError("No sentiment index data received.")
+
+    entry = data["data"][0]
+
+    return {
+        "value": entry.get("value", ""),
+        "classification": entry.get("value_classification", ""),
+        "timestamp": entry.get("timestamp", ""),
+    }
+
+
+async def fetch_fear_greed_index_async(
     tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
@@ -19,42 +35,27 @@ def fetch_fear_greed_index(
         "timestamp": "1712345678"
     }
     """
-    url = "https://api.alternative.me/fng/?limit=1&format=json"
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-    }
+    return _parse_fear_greed(await http_client.aget_json(FEAR_GREED_URL, timeout=10))
 
-    resp = requests.get(url, headers=headers, timeout=10)
-    resp.raise_for_status()
 
-    data = resp.json()
-
-    if not data.get("data") or len(data["data"]) == 0:
-        raise ValueError("No sentiment index data received.")
-
-    entry = data["data"][0]
-
-    return {
-        "value": entry.get("value", ""),
-        "classification": entry.get("value_classification", ""),
-        "timestamp": entry.get("timestamp", ""),
-    }
+def fetch_fear_greed_index(
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Blocking fetch_fear_greed_index_async.
+    """
+    return _parse_fear_greed(http_client.get_json(FEAR_GREED_URL, timeout=10))
 
 
 fear_greed_tool = FunctionTool(
-    func=fetch_fear_greed_index,
+    func=fetch_fear_greed_index_async,
 )
 
 SENTIMENT_INSTRUCTION = """
 You are the CRYPTO SENTIMENT AGENT.
 
 Your job:
-1) ALWAYS call the Python tool 'fetch_fear_greed_index' to retrieve the
+1) ALWAYS call the Python tool 'fetch_fear_greed_index_async' to retrieve the
    latest sentiment index (Fear & Greed Index).
 2) Take the returned JSON and create a clean human-readable summary.
 
@@ -0,0 +1,86 @@
+"""
+Benchmark: linear alert evaluation vs. the sorted AlertIndex.
+
+Builds N synthetic alerts over a handful of tokens and measures how long
+one price tick takes to evaluate with the current linear loop
+(alert_checker.evaluate_alerts) and with AlertIndex.match.
+
+Run:
+    python -m Seam_CryptoPurr.tests.bench_alert_index [N]
+"""
+
+import random
+import sys
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_checker import evaluate_alerts
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_index import AlertIndex
+
+
+TOKENS = ["BTC", "ETH", "SOL", "DOGE", "ADA", "XRP", "DOT", "AVAX"]
+REF_PRICE = 100.0
+
+
+def make_alerts(n: int):
+    # Users set "above" targets over the current price and "below" targets
+    # under it, so a typical tick only triggers the alerts near the price
+    rng = random.Random(42)
+    alerts = []
+    for i in range(1, n + 1):
+        direction = rng.choice(["above", "below"])
+        offset = rng.uniform(0.01, 0.5)
+        target = REF_PRICE * (1 + offset if direction == "above" else 1 - offset)
+        alerts.append({
+            "id": i,
+            "token": rng.choice(TOKENS),
+            "target": target,
+            "direction": direction,
+            "email": f"user{i % 1000}@example.com",
+        })
+    return alerts
+
+
+def bench(n: int, ticks: int = 20):
+    alerts = make_alerts(n)
+
+    started = time.perf_counter()
+    index = AlertIndex(watch=False)
+    index.add_many(alerts)
+    build_s = time.perf_counter() - started
+
+    rng = random.Random(7)
+    # +/- 2% moves around the reference price
+    price_ticks = [
+        {t.lower(): REF_PRICE * rng.uniform(0.98, 1.02) for t in TOKENS}
+        for _ in range(ticks)
+    ]
+
+    started = time.perf_counter()
+    for prices in price_ticks:
+        linear_hits = evaluate_alerts(alerts, prices)
+    linear_s = (time.perf_counter() - started) / ticks
+
+    started = time.perf_counter()
+    for prices in price_ticks:
+        indexed_hits = [a for t in TOKENS for a in index.match(t, prices[t.lower()])]
+    indexed_s = (time.perf_counter() - started) / ticks
+
+    assert {a["id"] for a in linear_hits} == {a["id"] for a in indexed_hits}
+
+    print(
+        f"alerts={n:>8}  build={build_s * 1000:8.1f}ms  "
+        f"linear={linear_s * 1000:8.3f}ms/tick  "
+        f"indexed={indexed_s * 1000:8.3f}ms/tick  "
+        f"speedup={linear_s / indexed_s:6.1f}x  "
+        f"hits={len(indexed_hits)}"
+    )
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000, 300_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: sharded alert checking across 1..N worker processes.
+
+A local CoinGecko stand-in serves /simple/price with a fixed per-request
+latency, so the run measures how upstream waits overlap as shards are
+added. Alerts live in a temporary database and prices come from the stand-in;
+nothing touches the real API.
+
+Run:
+    python -m Seam_CryptoPurr.tests.bench_alert_shards [ALERTS] [COINS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker, alert_storage
+from Seam_CryptoPurr.tests.coingecko_standin import CoinGeckoStandIn
+
+LATENCY = 0.05
+
+
+def main():
+    n_alerts = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_coins = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    standin = CoinGeckoStandIn(latency=LATENCY, default_price=100.0).start()
+    # Handed to every shard worker by run_alert_check_sharded
+    alert_checker.COINGECKO_API_URL = standin.url
+
+    tmp = tempfile.mkdtemp()
+    print(f"alerts={n_alerts} coins={n_coins} stand-in latency={LATENCY * 1000:.0f}ms/request")
+    for shards in (1, 2, 4, 8):
+        alert_storage.DB_NAME = os.path.join(tmp, f"alerts_{shards}.db")
+        alert_storage.init_db()
+        # Targets above the stand-in price: nothing triggers, so every run
+        # evaluates the full table
+        alert_storage.bulk_add_alerts(
+            (f"coin{i % n_coins}", 1000.0, "above", f"u{i}@example.com", f"coin{i % n_coins}")
+            for i in range(n_alerts)
+        )
+
+        started = time.perf_counter()
+        result = alert_checker.run_alert_check_sharded(shards=shards, deliver=False)
+        elapsed = time.perf_counter() - started
+        print(
+            f"  shards={shards}  {elapsed:6.2f}s  "
+            f"{result['checked'] / elapsed:10.0f} alerts/s  "
+            f"upstream_calls={result['upstream_calls']}"
+        )
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
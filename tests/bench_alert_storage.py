@@ -0,0 +1,163 @@
+"""
+Micro-benchmark: alert_storage before vs. after the pooled WAL connection
+layer and the (status, token) / (email, status) indexes.
+
+"before" replays the original access pattern: a fresh sqlite3 connection
+per call, rollback journal, no secondary indexes. "after" calls the
+alert_storage module itself.
+
+Run:
+    python -m Seam_CryptoPurr.tests.bench_alert_storage [ROWS]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_storage
+
+
+TOKENS = [f"TOK{i}" for i in range(2000)]
+
+
+def populate(path: str, rows: int, indexed: bool):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            token TEXT NOT NULL,
+            target REAL NOT NULL,
+            direction TEXT NOT NULL,
+            email TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active'
+        )
+    """)
+    rng = random.Random(0)
+    conn.executemany(
+        "INSERT INTO alerts (token, target, direction, email, status) VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                rng.choice(TOKENS),
+                rng.uniform(1, 100),
+                rng.choice(["above", "below"]),
+                f"user{rng.randrange(rows // 10 or 1)}@example.com",
+                # Most historical alerts are no longer active
+                "active" if rng.random() < 0.05 else "triggered",
+            )
+            for _ in range(rows)
+        ),
+    )
+    if indexed:
+        conn.execute("CREATE INDEX idx_alerts_status_token ON alerts (status, token)")
+        conn.execute("CREATE INDEX idx_alerts_email_status ON alerts (email, status)")
+    conn.commit()
+    conn.close()
+
+
+# --- "before": the original connect-per-call functions -----------------
+
+def old_add_alert(path, token, target, direction, email):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO alerts (token, target, direction, email, status) VALUES (?, ?, ?, ?, 'active')",
+        (token, target, direction, email),
+    )
+    conn.commit()
+    conn.close()
+
+
+def old_list_for_email(path, email):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT id, token, target, direction, email FROM alerts WHERE email=? AND status='active'",
+        (email,),
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def old_active_for_token(path, token):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT id FROM alerts WHERE status='active' AND token=?", (token,)
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def old_mark_triggered(path, alert_id):
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE alerts SET status='triggered' WHERE id=?", (alert_id,))
+    conn.commit()
+    conn.close()
+
+
+def ops_per_sec(fn, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return n / (time.perf_counter() - started)
+
+
+def run(rows: int):
+    tmp = tempfile.mkdtemp()
+    before_db = os.path.join(tmp, "before.db")
+    after_db = os.path.join(tmp, "after.db")
+    populate(before_db, rows, indexed=False)
+    populate(after_db, rows, indexed=True)
+
+    alert_storage.DB_NAME = after_db
+    alert_storage.init_db()
+
+    rng = random.Random(1)
+    emails = [f"user{rng.randrange(rows // 10 or 1)}@example.com" for _ in range(1000)]
+    tokens = [rng.choice(TOKENS) for _ in range(1000)]
+    ids = [rng.randrange(1, rows) for _ in range(1000)]
+
+    cases = [
+        (
+            "add_alert",
+            lambda i: old_add_alert(before_db, "BTC", 1.0, "above", "x@example.com"),
+            lambda i: alert_storage.add_alert("BTC", 1.0, "above", "x@example.com"),
+            200,
+        ),
+        (
+            "list alerts for email",
+            lambda i: old_list_for_email(before_db, emails[i % 1000]),
+            lambda i: alert_storage.get_alerts_for_email(emails[i % 1000]),
+            50,
+        ),
+        (
+            "active alerts for token",
+            lambda i: old_active_for_token(before_db, tokens[i % 1000]),
+            lambda i: alert_storage._query(
+                "SELECT id FROM alerts WHERE status='active' AND token=?", (tokens[i % 1000],)
+            ),
+            50,
+        ),
+        (
+            "mark_triggered",
+            lambda i: old_mark_triggered(before_db, ids[i % 1000]),
+            lambda i: alert_storage.mark_triggered(ids[i % 1000]),
+            200,
+        ),
+    ]
+
+    print(f"rows={rows}")
+    for name, before, after, n in cases:
+        b = ops_per_sec(before, n)
+        a = ops_per_sec(after, n * 10)
+        print(f"  {name:<26} before={b:10.0f} ops/s  after={a:10.0f} ops/s  ({a / b:6.1f}x)")
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100_000, 1_000_000]
+    for rows in sizes:
+        run(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: Solana portfolio balances, per-address scans vs batched RPC.
+
+A local JSON-RPC stand-in adds a fixed latency to every HTTP request.
+"per-address" scans each wallet (one getBalance + getSignaturesForAddress
+batch per address; the old Solscan path took two requests per address);
+"batched" is sol_get_balances, one getMultipleAccounts per 100 wallets.
+
+Run:
+    python -m Seam_CryptoPurr.tests.bench_solana_rpc [WALLETS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools, tx_store
+from Seam_CryptoPurr.tests.solana_rpc_standin import SolanaRpcStandIn
+
+LATENCY = 0.02
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    standin = SolanaRpcStandIn(latency=LATENCY).start()
+    general_helper_tools.SOLANA_RPC_URL = standin.url
+    addresses = [f"So1{i:041d}" for i in range(n)]
+    standin.accounts = {a: i for i, a in enumerate(addresses)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tx_store.DB_NAME = os.path.join(tmp, "transactions.db")
+
+        # __wrapped__ skips the scan result cache: every scan goes upstream
+        scan = general_helper_tools.sol_scan_address.__wrapped__
+        started = time.perf_counter()
+        for address in addresses:
+            scan(address, limit=10)
+        per_address = time.perf_counter() - started
+        per_address_requests, standin.requests = standin.requests, 0
+
+        started = time.perf_counter()
+        result = general_helper_tools.sol_get_balances(addresses)
+        batched = time.perf_counter() - started
+        assert len(result["balances"]) == n
+
+        tx_store.close_connections()
+
+    print(f"wallets={n} stand-in latency={LATENCY * 1000:.0f}ms")
+    print(f"  per-address  {per_address * 1000:8.1f} ms  {per_address_requests:4d} requests")
+    print(f"  batched      {batched * 1000:8.1f} ms  {standin.requests:4d} requests")
+
+    standin.stop()
+
+
+if __name__ == "__main__":
+    main()
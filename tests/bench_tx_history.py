@@ -0,0 +1,78 @@
+"""
+Benchmark: memory held by a 100k-transaction history, list of dicts vs
+the columnar TxHistory.
+
+Rows are EVM-shaped (hash, from, to, value, timestamp, status) with the
+scanned address on one side of every tx, as in a real address history.
+Built the way tx_store fills them: one decoded row at a time.
+
+Run:
+    python -m Seam_CryptoPurr.tests.bench_tx_history [ROWS]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.tx_history import TxHistory
+
+ADDRESS = "0x" + "ab" * 20
+
+
+def _rows(n: int):
+    rng = random.Random(0)
+    counterparties = ["0x" + f"{rng.getrandbits(160):040x}" for _ in range(500)]
+    for i in range(n):
+        other = rng.choice(counterparties)
+        sender, receiver = (ADDRESS, other) if i % 2 else (other, ADDRESS)
+        yield json.dumps({
+            "hash": f"0x{rng.getrandbits(256):064x}",
+            "from": sender,
+            "to": receiver,
+            "value": str(rng.randrange(10 ** 21)),
+            "timestamp": 1_600_000_000 + n - i,
+            "status": "failed" if i % 50 == 0 else "success",
+        })
+
+
+def _measure(build, rows):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build(rows)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, size, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = list(_rows(n))
+
+    def as_dicts(rows):
+        return [json.loads(row) for row in rows]
+
+    def as_history(rows):
+        history = TxHistory(transfers=True)
+        for row in rows:
+            history.append(json.loads(row))
+        return history
+
+    dicts, dict_bytes, dict_s = _measure(as_dicts, rows)
+    del dicts
+    history, hist_bytes, hist_s = _measure(as_history, rows)
+
+    print(f"rows={n}")
+    print(f"  list of dicts  {dict_bytes / 2**20:7.1f} MiB  {dict_bytes / n:6.0f} B/row  build {dict_s:.2f}s")
+    print(f"  TxHistory      {hist_bytes / 2**20:7.1f} MiB  {hist_bytes / n:6.0f} B/row  build {hist_s:.2f}s")
+    started = time.perf_counter()
+    history.to_dicts(limit=100)
+    print(f"  to_dicts(limit=100) {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Local CoinGecko stand-in for tests and benchmarks.
+
+Serves /simple/price over HTTP/1.1 keep-alive. `prices` maps coin id ->
+USD price (ids absent from it are left out of the response, as CoinGecko
+does for unknown ids); a request naming any id in `fail_ids` gets a 500.
+`latency` is added to every request.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+
+class CoinGeckoStandIn:
+    def __init__(self, latency: float = 0.0, default_price: Optional[float] = None):
+        self.latency = latency
+        self.prices: Dict[str, float] = {}
+        # Price for ids not in `prices`; None leaves them unpriced
+        self.default_price = default_price
+        self.fail_ids: Set[str] = set()
+        # The ids of every request, in arrival order
+        self.id_lists: List[List[str]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def requests(self) -> int:
+        return len(self.id_lists)
+
+    def start(self) -> "CoinGeckoStandIn":
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _quote(self, ids: List[str]) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for coin_id in ids:
+            price = self.prices.get(coin_id, self.default_price)
+            if price is not None:
+                out[coin_id] = {"usd": price}
+        return out
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                ids = [i for i in query.get("ids", [""])[0].split(",") if i]
+                with standin._lock:
+                    standin.id_lists.append(ids)
+                if standin.latency:
+                    time.sleep(standin.latency)
+
+                if standin.fail_ids.intersection(ids):
+                    status, body = 500, b'{"error": "internal error"}'
+                else:
+                    status, body = 200, json.dumps(standin._quote(ids)).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,84 @@
+import socket
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_storage, tx_store
+from Seam_CryptoPurr.sub_agents.helper_func_tools.scan_cache import scan_cache
+
+
+@pytest.fixture(autouse=True)
+def _empty_scan_cache():
+    scan_cache.clear()
+    yield
+    scan_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def tx_db(tmp_path, monkeypatch):
+    """Scanners sync into a per-test transaction store."""
+    monkeypatch.setattr(tx_store, "DB_NAME", str(tmp_path / "transactions.db"))
+    return tx_store
+
+
+@pytest.fixture
+def solana_rpc(monkeypatch):
+    """Local Solana JSON-RPC stand-in the Solana scanners point at."""
+    from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools
+    from Seam_CryptoPurr.tests.solana_rpc_standin import SolanaRpcStandIn
+
+    standin = SolanaRpcStandIn().start()
+    monkeypatch.setattr(general_helper_tools, "SOLANA_RPC_URL", standin.url)
+    try:
+        yield standin
+    finally:
+        standin.stop()
+
+
+@pytest.fixture
+def coingecko(monkeypatch):
+    """Local CoinGecko stand-in the alert checker prices against."""
+    from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker
+    from Seam_CryptoPurr.tests.coingecko_standin import CoinGeckoStandIn
+
+    standin = CoinGeckoStandIn().start()
+    monkeypatch.setattr(alert_checker, "COINGECKO_API_URL", standin.url)
+    try:
+        yield standin
+    finally:
+        standin.stop()
+
+
+@pytest.fixture
+def alerts_db(tmp_path, monkeypatch):
+    """alert_storage pointed at a fresh, empty database."""
+    monkeypatch.setattr(alert_storage, "DB_NAME", str(tmp_path / "alerts.db"))
+    alert_storage.init_db()
+    return alert_storage
+
+
+class SMTPInbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """Local aiosmtpd stand-in; yields (controller, inbox)."""
+    controller_mod = pytest.importorskip("aiosmtpd.controller")
+    inbox = SMTPInbox()
+    controller = controller_mod.Controller(inbox, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        yield controller, inbox
+    finally:
+        controller.stop()
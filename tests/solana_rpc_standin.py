@@ -0,0 +1,114 @@
+"""
+Local Solana JSON-RPC stand-in for tests and benchmarks.
+
+Serves getBalance, getMultipleAccounts and getSignaturesForAddress (with
+limit/until/before), single or batched, over HTTP/1.1 keep-alive. `latency` is
+added to every HTTP request, standing in for the round trip to a real node.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+class SolanaRpcStandIn:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        # address -> lamports; addresses absent here have no account
+        self.accounts: Dict[str, int] = {}
+        # address -> signatures, newest first
+        self.signatures: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests = 0
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "SolanaRpcStandIn":
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_signatures(self, address: str, count: int, start: int = 1):
+        """Prepend `count` confirmed signatures (slots start..start+count-1)."""
+        new = [
+            {
+                "signature": f"{address[:4]}-{slot}",
+                "slot": slot,
+                "blockTime": 1_700_000_000 + slot,
+                "err": None,
+                "confirmationStatus": "finalized",
+            }
+            for slot in range(start + count - 1, start - 1, -1)
+        ]
+        self.signatures[address] = new + self.signatures.get(address, [])
+
+    def _call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(call)
+        method, params = call.get("method"), call.get("params") or []
+        context = {"slot": 1}
+        if method == "getBalance":
+            result: Any = {"context": context, "value": self.accounts.get(params[0], 0)}
+        elif method == "getMultipleAccounts":
+            result = {
+                "context": context,
+                "value": [
+                    {"lamports": self.accounts[a], "owner": "11111111111111111111111111111111",
+                     "data": ["", "base64"], "executable": False, "rentEpoch": 0}
+                    if a in self.accounts else None
+                    for a in params[0]
+                ],
+            }
+        elif method == "getSignaturesForAddress":
+            options = params[1] if len(params) > 1 else {}
+            sigs = self.signatures.get(params[0], [])
+            if options.get("before"):
+                hashes = [sig["signature"] for sig in sigs]
+                sigs = sigs[hashes.index(options["before"]) + 1:]
+            result = []
+            for sig in sigs:
+                if sig["signature"] == options.get("until"):
+                    break
+                result.append(sig)
+            result = result[:options.get("limit", 1000)]
+        else:
+            return {"jsonrpc": "2.0", "id": call.get("id"),
+                    "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with standin._lock:
+                    standin.requests += 1
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if isinstance(payload, list):
+                    reply: Any = [standin._call(call) for call in payload]
+                else:
+                    reply = standin._call(payload)
+                body = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
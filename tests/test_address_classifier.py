@@ -0,0 +1,94 @@
+"""
+Tests for deterministic address classification and the non-LLM scan step.
+"""
+
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.address_classifier import (
+    classify_address,
+    evm_checksum_address,
+    extract_addresses,
+    keccak256,
+)
+
+checker = importlib.import_module("Seam_CryptoPurr.sub_agents.blockchain_checker_agent")
+
+
+def test_keccak256_vectors():
+    assert keccak256(b"").hex() == "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+    # Spans two 136-byte blocks
+    assert keccak256(b"a" * 200).hex() == "96ea54061def936c4be90b518992fdc6f12f535068a256229aca54267b4d084d"
+
+
+@pytest.mark.parametrize("address", [
+    "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+    "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+    "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+])
+def test_eip55(address):
+    assert evm_checksum_address(address.lower()) == address
+    assert classify_address(address) == "evm"
+    assert classify_address(address.lower()) == "evm"  # unchecksummed
+    i = next(i for i, ch in enumerate(address) if i > 1 and ch.isalpha())
+    assert classify_address(address[:i] + address[i].swapcase() + address[i + 1:]) is None
+
+
+@pytest.mark.parametrize("address, family", [
+    ("bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq", "btc"),
+    ("bc1p5d7rjq7g6rdk2yhzks9smlaqtedr4dekq08ge8ztwac72sfr9rusxg3297", "btc"),
+    ("1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2", "btc"),
+    ("3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy", "btc"),
+    ("9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM", "solana"),
+    ("So11111111111111111111111111111111111111112", "solana"),
+    # Broken checksums / wrong lengths
+    ("bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdr", None),
+    ("1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN3", None),
+    ("0x" + "ab" * 19, None),
+    ("hello", None),
+])
+def test_classify(address, family):
+    assert classify_address(address) == family
+
+
+def test_extract_addresses_in_order():
+    text = (
+        "Compare 3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy with "
+        "0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe (and 3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy again)."
+    )
+    assert extract_addresses(text) == [
+        ("3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy", "btc"),
+        ("0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe", "evm"),
+    ]
+
+
+def test_scan_step_dispatches_without_a_model(monkeypatch):
+    calls = []
+
+    async def fake_scan(address, chain=None):
+        calls.append((address, chain))
+        return {"address": address, "chain": chain}
+
+    monkeypatch.setattr(checker, "evm_scan_address_async", fake_scan)
+    monkeypatch.setattr(checker, "evm_scan_all_chains_async", lambda a: fake_scan(a, "all"))
+
+    evm = "0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe"
+    ctx = SimpleNamespace(
+        user_content=types.Content(role="user", parts=[types.Part(text=f"check {evm} on Polygon")]),
+        invocation_id="inv",
+        branch=None,
+    )
+
+    async def run():
+        return [e async for e in checker.blockchain_scan_agent._run_async_impl(ctx)]
+
+    [event] = asyncio.run(run())
+    assert event.actions.state_delta["blockchain_scan_snapshot"] == {"address": evm, "chain": "polygon"}
+
+    asyncio.run(checker.scan_request(f"what is {evm.lower()} doing"))
+    assert calls[-1] == (evm.lower(), "all")
+    assert "error" in asyncio.run(checker.scan_request("no address here"))
@@ -0,0 +1,76 @@
+"""
+Tests for batched price lookups and the alert check built on them.
+"""
+
+import asyncio
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker, coin_index
+
+
+def test_prices_are_deduped_and_chunked(monkeypatch, coingecko):
+    monkeypatch.setattr(alert_checker, "COINGECKO_PRICE_BATCH_SIZE", 3)
+    coingecko.default_price = 2.0
+
+    prices, calls = alert_checker.get_prices(
+        ["bitcoin", "BITCOIN", "Ethereum", "solana", "dogecoin", "pepe", "tron", "ethereum", ""]
+    )
+
+    assert calls == coingecko.requests == 2
+    assert sorted(i for ids in coingecko.id_lists for i in ids) == sorted(prices)
+    assert sorted(prices) == ["bitcoin", "dogecoin", "ethereum", "pepe", "solana", "tron"]
+    assert all(len(ids) <= 3 for ids in coingecko.id_lists)
+
+
+def test_failing_chunk_does_not_sink_the_others(monkeypatch, coingecko):
+    monkeypatch.setattr(alert_checker, "COINGECKO_PRICE_BATCH_SIZE", 2)
+    coingecko.default_price = 5.0
+    coingecko.fail_ids = {"c"}
+
+    prices, calls = alert_checker.get_prices(["a", "b", "c", "d", "e"])
+
+    assert calls == 3
+    assert prices == {"a": 5.0, "b": 5.0, "e": 5.0}
+
+
+def test_check_reports_calls_and_unpriced_tokens(monkeypatch, alerts_db, coingecko):
+    monkeypatch.setattr(alert_checker, "COINGECKO_PRICE_BATCH_SIZE", 2)
+    coingecko.prices = {"bitcoin": 100.0, "ethereum": 10.0}
+    hit = alerts_db.add_alert("btc", 50.0, "above", "a@example.com", "bitcoin")
+    alerts_db.add_alert("btc", 500.0, "above", "b@example.com", "bitcoin")
+    alerts_db.add_alert("eth", 5.0, "below", "a@example.com", "ethereum")
+    alerts_db.add_alert("zzz", 1.0, "above", "a@example.com", "no-such-coin")
+
+    result = alert_checker.run_alert_check(deliver=False)
+
+    assert result["triggered"] == [hit]
+    assert result["checked"] == 4 and result["tokens"] == 3
+    # bitcoin, ethereum, no-such-coin: two chunks, one request each
+    assert result["upstream_calls"] == coingecko.requests == 2
+    assert result["unpriced_tokens"] == ["no-such-coin"]
+
+
+@pytest.fixture
+def coins(monkeypatch):
+    monkeypatch.setattr(coin_index, "_fetch_coins", lambda: [("bitcoin", "btc", "Bitcoin", 1)])
+    monkeypatch.setattr(coin_index, "_lookup", {})
+    monkeypatch.setattr(coin_index, "_refreshed_at", None)
+    monkeypatch.setattr(coin_index, "_last_attempt_at", 0.0)
+    monkeypatch.setattr(coin_index, "_refresher", None)
+
+
+@pytest.mark.parametrize("entry", ["sync", "async"])
+def test_legacy_rows_are_priced_by_coin_id(monkeypatch, alerts_db, coingecko, coins, entry):
+    monkeypatch.setattr(alert_checker, "drain_outbox", lambda: {})
+    coingecko.prices = {"bitcoin": 100.0}
+    # Stored before ids were resolved at insert time
+    legacy = alerts_db.add_alert("btc", 50.0, "above", "a@example.com")
+
+    if entry == "sync":
+        result = alert_checker.run_alert_check(deliver=False)
+    else:
+        result = asyncio.run(alert_checker.run_alert_check_async())["result"]
+
+    assert result["triggered"] == [legacy]
+    assert coingecko.id_lists == [["bitcoin"]]
@@ -0,0 +1,119 @@
+"""
+Tests for the resident alert daemon: no overlapping cycles, a clean stop
+on SIGTERM, and the scheduling stats it reports.
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_daemon
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_daemon import AlertDaemon
+
+
+@pytest.fixture
+def slow_check(monkeypatch):
+    """run_alert_check stand-in taking 50ms; records peak concurrency."""
+    state = {"active": 0, "peak": 0, "calls": 0}
+    lock = threading.Lock()
+
+    def check(index, deliver):
+        with lock:
+            state["active"] += 1
+            state["calls"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return {"status": "completed", "triggered": []}
+
+    monkeypatch.setattr(alert_daemon, "run_alert_check", check)
+    return state
+
+
+def test_concurrent_cycles_never_overlap(alerts_db, slow_check):
+    daemon = AlertDaemon(interval=1, jitter=0)
+
+    async def main():
+        await asyncio.gather(*(daemon.run_cycle() for _ in range(4)))
+
+    asyncio.run(main())
+    assert slow_check["calls"] == 4 and slow_check["peak"] == 1
+    assert daemon.cycles == 4
+    daemon.index.close()
+
+
+def test_overrun_skips_ticks_instead_of_overlapping(alerts_db, slow_check):
+    # Cycles take 50ms against a 20ms interval
+    daemon = AlertDaemon(interval=0.02, jitter=0)
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.3, daemon.stop)
+        await daemon.run()
+
+    asyncio.run(main())
+    assert slow_check["peak"] == 1
+    assert daemon.cycles >= 2
+    assert daemon.skipped_ticks >= daemon.cycles - 1
+    daemon.index.close()
+
+
+def test_next_delay_waits_for_following_free_slot(monkeypatch):
+    daemon = AlertDaemon(interval=10, jitter=0)
+    monkeypatch.setattr(alert_daemon.time, "monotonic", lambda: 125.0)
+
+    # The cycle started at 100 and overran two slots (110, 120)
+    assert daemon._next_delay(100.0) == 5.0
+    assert daemon.skipped_ticks == 2
+
+
+def test_sigterm_stops_cleanly(alerts_db, slow_check):
+    daemon = AlertDaemon(interval=0.05, jitter=0)
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.2, os.kill, os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(daemon.run_forever(), timeout=5)
+
+    asyncio.run(main())
+    assert daemon.cycles >= 1
+    assert not daemon.stats()["running"]
+    # The handler is removed again once the daemon exits
+    assert signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None)
+
+
+def test_stats_report_backlog(alerts_db, slow_check):
+    for i in range(3):
+        alerts_db.add_alert("btc", 1e9, "above", f"u{i}@example.com", "bitcoin")
+    daemon = AlertDaemon(interval=2, jitter=0)
+
+    asyncio.run(daemon.run_cycle())
+    stats = daemon.stats()
+
+    assert stats["backlog"] == 3
+    assert stats["cycles"] == 1 and stats["failed_cycles"] == 0
+    assert stats["last_cycle_seconds"] >= 0.05
+    assert 0 < stats["utilization"] < 1
+    assert stats["outbox"]["pending"] == 0
+    daemon.index.close()
+
+
+def test_alerts_resolved_later_are_rekeyed_in_the_index(alerts_db, monkeypatch):
+    from Seam_CryptoPurr.sub_agents.helper_func_tools import coin_index
+
+    monkeypatch.setattr(coin_index, "_lookup", {})
+    monkeypatch.setattr(coin_index, "_refreshed_at", None)
+    monkeypatch.setattr(coin_index, "_last_attempt_at", 0.0)
+    daemon = AlertDaemon(interval=1, jitter=0)
+    daemon._sync_index()
+    # Added while the coin list was unavailable
+    alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    assert daemon.index.keys() == ["btc"]
+
+    monkeypatch.setattr(coin_index, "_fetch_coins", lambda: [("bitcoin", "btc", "Bitcoin", 1)])
+    daemon._sync_index()
+    assert daemon.index.keys() == ["bitcoin"]
+    daemon.index.close()
@@ -0,0 +1,60 @@
+"""
+Unit tests for the sorted alert threshold index.
+"""
+
+import random
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_checker import evaluate_alerts
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_index import AlertIndex
+
+
+def test_match_agrees_with_linear_scan():
+    rng = random.Random(1)
+    alerts = [
+        {
+            "id": i,
+            "token": rng.choice(["BTC", "ETH"]),
+            "target": float(rng.randint(1, 100)),
+            "direction": rng.choice(["above", "below", "sideways"]),
+            "email": "a@example.com",
+        }
+        for i in range(1, 500)
+    ]
+    index = AlertIndex(watch=False)
+    index.add_many(alerts)
+
+    for price in (0.5, 1.0, 37.0, 50.5, 100.0, 101.0):
+        prices = {"btc": price, "eth": price}
+        expected = {a["id"] for a in evaluate_alerts(alerts, prices)}
+        got = {a["id"] for t in ("BTC", "ETH") for a in index.match(t, price)}
+        assert got == expected
+
+
+def test_index_follows_storage_changes(alerts_db):
+    first = alerts_db.add_alert("btc", 100.0, "above", "a@example.com")
+    index = AlertIndex(watch=True)
+    index.load()
+    try:
+        second = alerts_db.add_alert("btc", 90.0, "below", "b@example.com")
+        assert {a["id"] for a in index.match("BTC", 100.0)} == {first}
+        assert {a["id"] for a in index.match("BTC", 80.0)} == {second}
+
+        alerts_db.mark_triggered(first)
+        assert index.match("BTC", 100.0) == []
+
+        alerts_db.cancel_alert("btc")
+        assert len(index) == 0
+    finally:
+        index.close()
+
+
+def test_sync_picks_up_external_changes(alerts_db):
+    index = AlertIndex(watch=False)
+    index.load()
+    kept = alerts_db.add_alert("eth", 10.0, "above", "a@example.com")
+    dropped = alerts_db.add_alert("eth", 20.0, "above", "a@example.com")
+    assert index.sync() == {"added": 2, "removed": 0}
+
+    alerts_db.mark_triggered(dropped)
+    assert index.sync() == {"added": 0, "removed": 1}
+    assert [a["id"] for a in index.match("ETH", 25.0)] == [kept]
@@ -0,0 +1,77 @@
+"""
+Tests for alert shard partitioning and the sharded check.
+"""
+
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_checker import shard_of
+
+
+def _alerts(n):
+    return [
+        {"id": i, "token": f"T{i % 7}", "coin_id": f"coin-{i % 7}"}
+        for i in range(n)
+    ]
+
+
+def test_shard_by_token_keeps_coin_together():
+    shards = {}
+    for a in _alerts(200):
+        shards.setdefault(a["coin_id"], set()).add(shard_of(a, 4))
+    assert all(len(s) == 1 for s in shards.values())
+
+
+def test_shard_by_id_is_stable_and_in_range():
+    alerts = _alerts(200)
+    first = [shard_of(a, 3, by="id") for a in alerts]
+    assert first == [shard_of(a, 3, by="id") for a in alerts]
+    assert set(first) <= {0, 1, 2}
+
+
+def _seed(alerts_db, n=40):
+    # Odd alerts sit below the stand-in price and trigger
+    hits = set()
+    for i in range(n):
+        target = 50.0 if i % 2 else 500.0
+        alert_id = alerts_db.add_alert(f"T{i % 5}", target, "above", f"u{i}@example.com", f"coin-{i % 5}")
+        if i % 2:
+            hits.add(alert_id)
+    return hits
+
+
+def test_sharded_check_triggers_each_hit_once(alerts_db, coingecko):
+    coingecko.default_price = 100.0
+    hits = _seed(alerts_db)
+
+    result = alert_checker.run_alert_check_sharded(shards=2, by="token", deliver=False)
+
+    assert result["shards"] == 2 and result["checked"] == 40
+    assert sorted(result["triggered"]) == sorted(hits)
+    # by="token": every coin is priced by exactly one shard
+    assert result["upstream_calls"] == coingecko.requests == 2
+    assert sorted(i for ids in coingecko.id_lists for i in ids) == [f"coin-{i}" for i in range(5)]
+    assert alerts_db.outbox_stats()["pending"] == len(hits)
+    # Nothing left to trigger on a second pass
+    assert alert_checker.run_alert_check_sharded(shards=2, deliver=False)["triggered"] == []
+
+
+def test_sharded_check_under_spawn(monkeypatch, alerts_db, coingecko):
+    # spawn workers inherit nothing, so the database and price endpoint
+    # must reach them as arguments
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(
+        alert_checker, "ProcessPoolExecutor", functools.partial(ProcessPoolExecutor, mp_context=spawn)
+    )
+    coingecko.default_price = 100.0
+    hits = _seed(alerts_db)
+
+    # by="id": shards share coins but never alerts
+    result = alert_checker.run_alert_check_sharded(shards=2, by="id", deliver=False)
+
+    assert result["checked"] == 40
+    assert sorted(result["triggered"]) == sorted(hits)
+    assert coingecko.requests == result["upstream_calls"] == 2
+    assert alerts_db.outbox_stats()["pending"] == len(hits)
@@ -0,0 +1,101 @@
+"""
+Tests for alert_storage: pooled connections, indexed lookups, bulk APIs.
+"""
+
+import os
+import threading
+
+
+def test_bulk_add_and_stream(alerts_db):
+    rows = [("btc", i, "above", f"u{i}@example.com") for i in range(25)]
+    assert alerts_db.bulk_add_alerts(rows, batch_size=10) == 25
+
+    streamed = list(alerts_db.iter_alerts(status="active", batch_size=7))
+    assert [a["target"] for a in streamed] == [float(i) for i in range(25)]
+    assert {a["token"] for a in streamed} == {"BTC"}
+
+
+def test_mark_triggered_many(alerts_db):
+    alerts_db.bulk_add_alerts([("eth", 1, "below", "a@example.com")] * 5)
+    ids = alerts_db.get_active_alert_ids()
+
+    assert alerts_db.mark_triggered_many(ids[:3]) == 3
+    events = []
+
+    def listener(event, alert):
+        events.append(alert["id"])
+
+    alerts_db.add_listener(listener)
+    try:
+        # Already-triggered alerts are not counted (or reported) again
+        assert alerts_db.mark_triggered_many(ids[:4]) == 1
+    finally:
+        alerts_db.remove_listener(listener)
+    assert events == [ids[3]]
+    assert alerts_db.count_active_alerts() == 1
+    assert len(list(alerts_db.iter_alerts(status="triggered"))) == 4
+
+
+def test_mark_triggered_only_once(alerts_db):
+    alert_id = alerts_db.add_alert("sol", 10, "above", "a@example.com")
+
+    events = []
+
+    def listener(event, alert):
+        events.append((event, alert["id"]))
+
+    alerts_db.add_listener(listener)
+    try:
+        assert alerts_db.mark_triggered(alert_id) is True
+        assert alerts_db.mark_triggered(alert_id) is False
+    finally:
+        alerts_db.remove_listener(listener)
+    # The losing call has nothing to report
+    assert events == [("removed", alert_id)]
+
+
+def test_connection_reused_per_thread(alerts_db):
+    conn = alerts_db._connect()
+    assert alerts_db._connect() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(alerts_db._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_fresh_connection_after_fork_or_db_change(alerts_db, monkeypatch, tmp_path):
+    conn = alerts_db._connect()
+
+    # A forked child sees a different pid and must not reuse the parent's
+    pid = os.getpid()
+    monkeypatch.setattr(alerts_db.os, "getpid", lambda: pid + 1)
+    assert alerts_db._connect() is not conn
+    monkeypatch.undo()
+
+    monkeypatch.setattr(alerts_db, "DB_NAME", str(tmp_path / "other.db"))
+    alerts_db.init_db()
+    moved = alerts_db._connect()
+    assert moved is not conn
+    alerts_db.add_alert("btc", 1, "above", "a@example.com")
+    assert conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0] == 0
+
+
+def test_alerts_for_email_uses_index(alerts_db):
+    alerts_db.bulk_add_alerts(
+        [("btc", i, "above", f"u{i % 10}@example.com") for i in range(100)]
+    )
+    ids = [a["id"] for a in alerts_db.get_alerts_for_email("u3@example.com")]
+    alerts_db.mark_triggered(ids[0])
+
+    active = alerts_db.get_alerts_for_email("u3@example.com")
+    assert [a["target"] for a in active] == [float(i) for i in range(13, 100, 10)]
+    assert len(alerts_db.get_alerts_for_email("u3@example.com", status="triggered")) == 1
+
+    plan = alerts_db._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM alerts WHERE email=? AND status=?",
+        ("u3@example.com", "active"),
+    ).fetchall()
+    assert "idx_alerts_email_status" in " ".join(str(row[-1]) for row in plan)
@@ -0,0 +1,64 @@
+"""
+Tests for the in-process alert check entry points.
+"""
+
+import asyncio
+import subprocess
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker
+from Seam_CryptoPurr.sub_agents.helper_func_tools.alert_tools import run_alert_checker_script
+
+
+@pytest.fixture
+def no_delivery(monkeypatch):
+    drained = []
+    monkeypatch.setattr(
+        alert_checker, "drain_outbox",
+        lambda: drained.append(1) or {"sent": 0, "failed": 0, "emails": 0},
+    )
+    return drained
+
+
+@pytest.fixture
+def no_subprocess(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("alert check spawned a subprocess")
+
+    for name in ("Popen", "run", "call", "check_output"):
+        monkeypatch.setattr(subprocess, name, refuse)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", refuse)
+    monkeypatch.setattr(asyncio, "create_subprocess_shell", refuse)
+
+
+def test_timed_check_shape(alerts_db, coingecko, no_delivery, no_subprocess):
+    coingecko.prices = {"bitcoin": 100.0}
+    alert_id = alerts_db.add_alert("btc", 50.0, "above", "a@example.com", "bitcoin")
+
+    out = alert_checker.run_alert_check_timed()
+
+    assert set(out) == {"elapsed_ms", "result"}
+    assert isinstance(out["elapsed_ms"], float) and out["elapsed_ms"] >= 0
+    assert out["result"]["status"] == "completed"
+    assert out["result"]["triggered"] == [alert_id]
+    assert out["result"]["delivery"] == {"sent": 0, "failed": 0, "emails": 0}
+    assert no_delivery == [1]
+
+
+def test_tool_runs_in_process(alerts_db, coingecko, no_delivery, no_subprocess):
+    coingecko.prices = {"ethereum": 10.0}
+    alert_id = alerts_db.add_alert("eth", 20.0, "below", "a@example.com", "ethereum")
+
+    out = asyncio.run(run_alert_checker_script())
+
+    assert set(out) == {"elapsed_ms", "result"}
+    assert out["result"]["triggered"] == [alert_id]
+    assert out["result"]["upstream_calls"] == coingecko.requests == 1
+    assert alerts_db.get_active_alerts() == []
+
+
+def test_tool_with_no_alerts(alerts_db, no_delivery, no_subprocess):
+    out = asyncio.run(run_alert_checker_script())
+    assert out["result"]["status"] == "no-alerts"
+    assert out["result"]["upstream_calls"] == 0
@@ -0,0 +1,130 @@
+"""
+Tests for the async-native scanners and price fetch.
+"""
+
+import asyncio
+import threading
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import alert_checker
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+
+BTC_ADDRESS = "bc1q" + "x" * 38
+
+ADDRESS_DATA = {"chain_stats": {"funded_txo_sum": 10, "spent_txo_sum": 4}}
+TXS_DATA = [
+    {"txid": "b", "status": {"confirmed": False}},
+    {"txid": "a", "status": {"confirmed": True, "block_time": 100}},
+]
+
+
+def _btc_response(url):
+    return TXS_DATA if url.endswith("/txs") else ADDRESS_DATA
+
+
+def test_async_and_sync_scans_agree(monkeypatch, tx_db):
+    async def fake_aget_json(url, **kwargs):
+        return _btc_response(url)
+
+    monkeypatch.setattr(ght.http_client, "aget_json", fake_aget_json)
+    monkeypatch.setattr(ght.http_client, "get_json", lambda url, **kwargs: _btc_response(url))
+
+    snap_async = asyncio.run(ght.btc_scan_address_async.__wrapped__(BTC_ADDRESS))
+    snap_sync = ght.btc_scan_address.__wrapped__(BTC_ADDRESS)
+
+    assert snap_async == snap_sync
+    assert snap_async["native_balance"] == "6"
+    assert [tx["hash"] for tx in snap_async["transactions"]] == ["b", "a"]
+
+
+def test_concurrent_async_scans_overlap(monkeypatch):
+    async def slow_aget_json(url, **kwargs):
+        await asyncio.sleep(0.2)
+        return _btc_response(url)
+
+    monkeypatch.setattr(ght.http_client, "aget_json", slow_aget_json)
+
+    async def main():
+        return await asyncio.gather(*(
+            ght.btc_scan_address_async.__wrapped__(f"{BTC_ADDRESS[:-1]}{i}")
+            for i in range(5)
+        ))
+
+    started = time.perf_counter()
+    snaps = asyncio.run(main())
+    # 5 scans x 2 legs of 0.2s each: serial would take 2s
+    assert time.perf_counter() - started < 1.0
+    assert all(s["native_balance"] == "6" and "error" not in s for s in snaps)
+
+
+def test_async_scan_is_cached(monkeypatch):
+    calls = []
+
+    async def fake_aget_json(url, **kwargs):
+        calls.append(url)
+        return _btc_response(url)
+
+    monkeypatch.setattr(ght.http_client, "aget_json", fake_aget_json)
+    monkeypatch.setattr(ght.http_client, "get", _no_tip)
+
+    first = asyncio.run(ght.btc_scan_address_async(BTC_ADDRESS))
+    # The sync scanner shares the cache entry
+    assert ght.btc_scan_address(BTC_ADDRESS) == first
+    assert len(calls) == 2
+
+
+def _no_tip(url, **kwargs):
+    raise ConnectionError("no tip")
+
+
+def test_async_scans_keep_tx_store_off_the_loop(monkeypatch, tx_db):
+    loop_threads = []
+    for name in ("get_cursor", "tail", "sync", "recent_history"):
+        def on_loop_check(*args, _real=getattr(ght.tx_store, name), **kwargs):
+            loop_threads.append(threading.current_thread() is threading.main_thread())
+            return _real(*args, **kwargs)
+
+        monkeypatch.setattr(ght.tx_store, name, on_loop_check)
+
+    async def fake_aget_json(url, params=None, **kwargs):
+        if params:
+            return {"status": "1", "result": [] if params["action"] == "txlist" else "5"}
+        return _btc_response(url)
+
+    async def fake_sol_rpc_async(calls):
+        return [(None, {"value": 5}), (None, [])]
+
+    monkeypatch.setattr(ght, "ETHERSCAN_API_KEY", "test")
+    monkeypatch.setattr(ght.http_client, "aget_json", fake_aget_json)
+    monkeypatch.setattr(ght, "_sol_rpc_async", fake_sol_rpc_async)
+
+    async def main():
+        await ght.evm_scan_address_async.__wrapped__("0x" + "ab" * 20)
+        await ght.btc_scan_address_async.__wrapped__(BTC_ADDRESS)
+        await ght.sol_scan_address_async.__wrapped__("So1" + "x" * 40)
+
+    asyncio.run(main())
+    assert loop_threads and not any(loop_threads)
+
+
+def test_get_prices_async_fetches_chunks_concurrently(monkeypatch):
+    monkeypatch.setattr(alert_checker, "COINGECKO_PRICE_BATCH_SIZE", 2)
+
+    async def fake_aget_json(url, params=None, **kwargs):
+        await asyncio.sleep(0.2)
+        ids = params["ids"].split(",")
+        if "bad" in ids:
+            raise ValueError("bad chunk")
+        return {coin: {"usd": 1.5} for coin in ids}
+
+    monkeypatch.setattr(alert_checker.http_client, "aget_json", fake_aget_json)
+
+    started = time.perf_counter()
+    prices, calls = asyncio.run(
+        alert_checker.get_prices_async(["a", "B", "bad", "c", "d", "e"])
+    )
+    assert time.perf_counter() - started < 0.5
+    assert calls == 3
+    # "bad" shares its chunk with "c"; the other chunks still resolve
+    assert prices == {"a": 1.5, "b": 1.5, "d": 1.5, "e": 1.5}
@@ -0,0 +1,140 @@
+"""
+Tests for paging through deep Bitcoin address histories.
+"""
+
+import asyncio
+import time
+
+from Seam_CryptoPurr.config import BTC_TXS_PAGE_SIZE
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+
+BTC_ADDRESS = "bc1q" + "x" * 38
+
+
+class FakeEsplora:
+    """/address/:addr/txs[/chain/:last_seen_txid] over a synthetic history."""
+
+    def __init__(self, confirmed: int, mempool: int = 0):
+        self.mempool = [{"txid": f"p{i}", "status": {"confirmed": False}} for i in range(mempool)]
+        self.chain = [
+            {"txid": f"c{h}", "status": {"confirmed": True, "block_time": h}}
+            for h in range(confirmed, 0, -1)
+        ]
+        self.urls = []
+
+    def get_json(self, url, **kwargs):
+        self.urls.append(url)
+        if "/chain/" in url:
+            after = url.rsplit("/", 1)[1]
+            start = next(i for i, tx in enumerate(self.chain) if tx["txid"] == after) + 1
+            return self.chain[start:start + BTC_TXS_PAGE_SIZE]
+        if url.endswith("/txs"):
+            return self.mempool + self.chain[:BTC_TXS_PAGE_SIZE]
+        return {"chain_stats": {}}
+
+    async def aget_json(self, url, **kwargs):
+        return self.get_json(url, **kwargs)
+
+
+def test_pager_is_lazy_and_resumable(monkeypatch):
+    esplora = FakeEsplora(confirmed=100, mempool=2)
+    monkeypatch.setattr(ght.http_client, "get_json", esplora.get_json)
+
+    pages = ght.btc_tx_pages(BTC_ADDRESS)
+    first = next(pages)
+    second = next(pages)
+    pages.close()
+    assert len(esplora.urls) == 2
+    assert [tx["hash"] for tx in first[:3]] == ["p0", "p1", "c100"]
+    assert second[0]["hash"] == "c75"
+
+    resumed = list(ght.btc_tx_pages(BTC_ADDRESS, after_txid=second[-1]["hash"]))
+    assert [tx["hash"] for page in resumed for tx in page] == [f"c{h}" for h in range(50, 0, -1)]
+
+
+def test_async_pager_walks_whole_history(monkeypatch):
+    esplora = FakeEsplora(confirmed=60)
+    monkeypatch.setattr(ght.http_client, "aget_json", esplora.aget_json)
+
+    async def collect():
+        return [tx["hash"] async for page in ght.btc_tx_pages_async(BTC_ADDRESS) for tx in page]
+
+    assert asyncio.run(collect()) == [f"c{h}" for h in range(60, 0, -1)]
+
+
+def test_scan_limit_beyond_first_page(monkeypatch, tx_db):
+    esplora = FakeEsplora(confirmed=100)
+    monkeypatch.setattr(ght.http_client, "get_json", esplora.get_json)
+    scan = ght.btc_scan_address.__wrapped__
+
+    snap = scan(BTC_ADDRESS, limit=60)
+    assert snap["tx_count"] == 60
+    assert snap["transactions"][-1]["hash"] == "c41"
+
+    # A deeper scan later backfills past the oldest stored tx instead of
+    # refetching what is already stored
+    esplora.urls.clear()
+    snap = scan(BTC_ADDRESS, limit=80)
+    assert snap["tx_count"] == 80
+    assert [u.rsplit("/", 1)[1] for u in esplora.urls if "/chain/" in u] == ["c26"]
+
+
+def test_scan_catches_up_across_pages_to_cursor(monkeypatch, tx_db):
+    esplora = FakeEsplora(confirmed=10)
+    monkeypatch.setattr(ght.http_client, "get_json", esplora.get_json)
+    scan = ght.btc_scan_address.__wrapped__
+    scan(BTC_ADDRESS, limit=20)
+
+    # 40 new blocks since: the old cursor c10 is on the second page
+    esplora.chain = FakeEsplora(confirmed=50).chain
+    snap = scan(BTC_ADDRESS, limit=50)
+
+    assert snap["tx_count"] == 50
+    assert [tx["hash"] for tx in snap["transactions"]] == [f"c{h}" for h in range(50, 0, -1)]
+
+
+def test_balance_only_scan_skips_txs(monkeypatch, tx_db):
+    esplora = FakeEsplora(confirmed=100)
+    monkeypatch.setattr(ght.http_client, "get_json", esplora.get_json)
+
+    snap = ght.btc_scan_address.__wrapped__(BTC_ADDRESS, balance_only=True)
+
+    assert esplora.urls == [f"{ght.BLOCKSTREAM_API_URL}/address/{BTC_ADDRESS}"]
+    assert snap["native_balance"] == "0" and "transactions" not in snap
+    assert tx_db.get_cursor("btc", "btc", BTC_ADDRESS) is None
+
+
+def test_paging_stops_at_scan_deadline(monkeypatch, tx_db):
+    esplora = FakeEsplora(confirmed=500)
+
+    def slow_get_json(url, **kwargs):
+        time.sleep(0.05)
+        return esplora.get_json(url, **kwargs)
+
+    monkeypatch.setattr(ght.http_client, "get_json", slow_get_json)
+    monkeypatch.setattr(ght, "SCAN_DEADLINE", 0.3)
+
+    snap = ght.btc_scan_address.__wrapped__(BTC_ADDRESS, limit=500)
+
+    assert "paging stopped" in snap["error"]
+    assert len(esplora.urls) < 10
+    # Partial history is kept, but the cursor is not advanced past it
+    assert 0 < snap["tx_count"] < 500
+    assert tx_db.get_cursor("btc", "btc", BTC_ADDRESS) is None
+
+
+def test_async_paging_stops_at_scan_deadline(monkeypatch, tx_db):
+    esplora = FakeEsplora(confirmed=500)
+
+    async def slow_aget_json(url, **kwargs):
+        await asyncio.sleep(0.05)
+        return esplora.get_json(url, **kwargs)
+
+    monkeypatch.setattr(ght.http_client, "aget_json", slow_aget_json)
+    monkeypatch.setattr(ght, "SCAN_DEADLINE", 0.3)
+
+    snap = asyncio.run(ght.btc_scan_address_async.__wrapped__(BTC_ADDRESS, limit=500))
+
+    assert "paging stopped" in snap["error"]
+    assert 0 < snap["tx_count"] < 500
@@ -0,0 +1,160 @@
+"""
+Tests for the CoinGecko symbol/name -> id index.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import coin_index
+
+
+COINS = [
+    ("bitcoin", "btc", "Bitcoin", 1),
+    ("batcat", "btc", "BatCat", None),
+    ("bitcoin-token", "bitcoin", "Bitcoin Token", 900),
+    ("ethereum", "eth", "Ethereum", 2),
+]
+
+
+class Downloads(list):
+    """One entry per /coins/list download; clear `gate` to hold them."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+
+
+@pytest.fixture
+def index(alerts_db, monkeypatch):
+    calls = Downloads()
+
+    def fake_fetch():
+        calls.append(1)
+        calls.gate.wait(2)
+        return COINS
+
+    monkeypatch.setattr(coin_index, "_fetch_coins", fake_fetch)
+    monkeypatch.setattr(coin_index, "_lookup", {})
+    monkeypatch.setattr(coin_index, "_refreshed_at", None)
+    monkeypatch.setattr(coin_index, "_last_attempt_at", 0.0)
+    monkeypatch.setattr(coin_index, "_refresher", None)
+    return calls
+
+
+def test_symbols_resolve_by_market_cap_rank(index):
+    assert coin_index.resolve_coin_id("BTC") == "bitcoin"
+    assert coin_index.resolve_coin_id("bitcoin") == "bitcoin"
+    assert coin_index.resolve_coin_id("Ethereum") == "ethereum"
+    assert coin_index.resolve_coin_id("nope") is None
+    # One download serves every lookup until the TTL expires
+    assert len(index) == 1
+
+
+def test_index_is_reloaded_from_sqlite(index, monkeypatch):
+    coin_index.refresh_coin_index()
+    monkeypatch.setattr(coin_index, "_lookup", {})
+    monkeypatch.setattr(coin_index, "_refreshed_at", None)
+
+    assert coin_index.resolve_coin_id("eth") == "ethereum"
+    assert len(index) == 1
+
+
+def test_backfill_sets_coin_id_on_old_alerts(index, alerts_db):
+    alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    assert coin_index.backfill_alert_coin_ids() == 1
+    assert alerts_db.get_active_alerts()[0]["coin_id"] == "bitcoin"
+
+
+def test_concurrent_first_lookups_download_once(index):
+    index.gate.clear()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(coin_index.resolve_coin_id("eth")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    index.gate.set()
+    for t in threads:
+        t.join()
+
+    assert results == ["ethereum"] * 8
+    assert len(index) == 1
+
+
+def test_stale_index_is_served_while_refreshing(index, monkeypatch):
+    coin_index.refresh_coin_index()
+    monkeypatch.setattr(coin_index, "_refreshed_at", time.time() - coin_index.COIN_INDEX_TTL - 1)
+    index.gate.clear()
+
+    # Answered from the stale index without waiting on the download
+    started = time.perf_counter()
+    assert coin_index.resolve_coin_id("btc") == "bitcoin"
+    assert coin_index.resolve_coin_id("eth") == "ethereum"
+    assert time.perf_counter() - started < 0.5
+
+    index.gate.set()
+    coin_index._refresher.join(2)
+    assert len(index) == 2
+    assert time.time() - coin_index._refreshed_at < 5
+
+
+def test_failed_markets_page_keeps_the_others(monkeypatch):
+    monkeypatch.setattr(coin_index, "COIN_INDEX_RANK_PAGES", 3)
+    pages = {1: [{"id": "bitcoin", "market_cap_rank": 1}], 3: [{"id": "batcat", "market_cap_rank": 600}]}
+
+    def fake_get_json(url, params=None, **kwargs):
+        if url.endswith("/coins/list"):
+            return [{"id": c[0], "symbol": c[1], "name": c[2]} for c in COINS]
+        if params["page"] == 2:
+            raise requests.ConnectionError("page 2 down")
+        return pages[params["page"]]
+
+    monkeypatch.setattr(coin_index.http_client, "get_json", fake_get_json)
+    ranks = {coin_id: rank for coin_id, _, _, rank in coin_index._fetch_coins()}
+    assert ranks == {"bitcoin": 1, "batcat": 600, "bitcoin-token": None, "ethereum": None}
+
+
+def test_failed_download_keeps_the_old_table(index, monkeypatch):
+    coin_index.refresh_coin_index()
+
+    def down():
+        raise requests.ConnectionError("coins/list down")
+
+    monkeypatch.setattr(coin_index, "_fetch_coins", down)
+    monkeypatch.setattr(coin_index, "_lookup", {})
+    monkeypatch.setattr(coin_index, "_refreshed_at", None)
+    # Reloaded from SQLite; nothing is stale, so nothing is downloaded
+    assert coin_index.resolve_coin_id("btc") == "bitcoin"
+    with pytest.raises(requests.ConnectionError):
+        coin_index.refresh_coin_index()
+    assert coin_index.resolve_coin_id("eth") == "ethereum"
+
+
+def test_unreachable_coingecko_saves_alerts_unresolved(index, alerts_db, monkeypatch, tmp_path):
+    from Seam_CryptoPurr.sub_agents.alerts_agent import tool_add_alert
+    from Seam_CryptoPurr.sub_agents.scripts import alert_bulk_script
+
+    def down():
+        raise requests.HTTPError("429 Too Many Requests")
+
+    monkeypatch.setattr(coin_index, "_fetch_coins", down)
+    assert tool_add_alert("BTC", 70000, "above", "a@example.com")["status"] == "saved"
+    cohort = tmp_path / "cohort.csv"
+    cohort.write_text("token,target,direction,email\nETH,3000,below,b@example.com\n")
+    errors = []
+    assert alert_bulk_script.bulk_add_alerts(alert_bulk_script._read_rows(str(cohort), errors)) == 1
+    assert errors == []
+    assert [a["coin_id"] for a in alerts_db.get_active_alerts()] == [None, None]
+
+    # CoinGecko is back: the rows are resolved, and unknown tokens rejected again
+    monkeypatch.setattr(coin_index, "_fetch_coins", lambda: COINS)
+    monkeypatch.setattr(coin_index, "_last_attempt_at", 0.0)
+    assert coin_index.backfill_alert_coin_ids() == 2
+    assert sorted(a["coin_id"] for a in alerts_db.get_active_alerts()) == ["bitcoin", "ethereum"]
+    assert tool_add_alert("NOPE", 1, "above", "a@example.com")["status"] == "error"
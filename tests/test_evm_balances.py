@@ -0,0 +1,82 @@
+"""
+Tests for batched Etherscan balancemulti lookups.
+"""
+
+import importlib
+import sqlite3
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+
+# sub_agents/__init__ re-exports the agent under the module's name
+portfolio = importlib.import_module("Seam_CryptoPurr.sub_agents.portfolio_manager_agent")
+
+
+def _address(i: int) -> str:
+    return "0x" + f"{i:040x}"
+
+
+@pytest.fixture
+def etherscan(monkeypatch):
+    calls = []
+
+    def fake_get_json(url, params=None, **kwargs):
+        calls.append(params)
+        accounts = params["address"].split(",")
+        assert params["action"] == "balancemulti" and len(accounts) <= 20
+        return {
+            "status": "1",
+            "result": [{"account": a, "balance": str(int(a, 16))} for a in accounts],
+        }
+
+    monkeypatch.setattr(ght, "ETHERSCAN_API_KEY", "test")
+    monkeypatch.setattr(ght.http_client, "get_json", fake_get_json)
+    return calls
+
+
+def test_groups_by_chain_and_chunks(etherscan):
+    pairs = [(_address(i), "ethereum") for i in range(45)]
+    pairs += [(_address(i), "polygon") for i in range(5)]
+    # Mixed-case duplicate of an address already requested
+    pairs.append((_address(1).upper().replace("0X", "0x"), "ethereum"))
+
+    result = ght.evm_get_balances(pairs)
+
+    assert result["upstream_calls"] == 4  # 20 + 20 + 5 on ethereum, 5 on polygon
+    assert sorted(p["chainid"] for p in etherscan) == [1, 1, 1, 137]
+    assert result["balances"][(_address(44), "ethereum")] == "44"
+    assert result["balances"][(_address(1).upper().replace("0X", "0x"), "ethereum")] == "1"
+    assert not result["errors"]
+
+
+def test_error_result_marks_only_its_chunk(monkeypatch, etherscan):
+    ok = ght.http_client.get_json
+
+    def flaky(url, params=None, **kwargs):
+        if params["chainid"] == 137:
+            return {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+        return ok(url, params=params, **kwargs)
+
+    monkeypatch.setattr(ght.http_client, "get_json", flaky)
+    result = ght.evm_get_balances([(_address(1), "ethereum"), (_address(2), "polygon")])
+
+    assert result["balances"] == {(_address(1), "ethereum"): "1"}
+    assert result["errors"] == {(_address(2), "polygon"): "Max rate limit reached"}
+
+
+def test_portfolio_refresh_batches_evm(tmp_path, monkeypatch, etherscan):
+    monkeypatch.setattr(portfolio, "DB_PATH", str(tmp_path / "portfolio.db"))
+    portfolio._init_db()
+    with sqlite3.connect(portfolio.DB_PATH) as conn:
+        conn.executemany(
+            "INSERT INTO portfolio (address, chain, family) VALUES (?, 'ethereum', 'evm')",
+            [(_address(i),) for i in range(200)],
+        )
+
+    result = portfolio.refresh_and_aggregate_portfolio()
+
+    assert len(etherscan) == 10  # was 400 (txlist + balance per address)
+    assert result["total_addresses"] == 200
+    assert result["by_chain"][0]["total_native"] == str(sum(range(200)))
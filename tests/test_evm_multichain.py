@@ -0,0 +1,82 @@
+"""
+Tests for the concurrent multi-chain EVM scan.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+
+EVM_ADDRESS = "0x" + "ab" * 20
+ID_TO_CHAIN = {chain_id: chain for chain, chain_id in ght.CHAIN_IDS.items()}
+
+
+@pytest.fixture
+def etherscan(monkeypatch):
+    """Per-chain latency/activity for a fake async Etherscan."""
+    chains = {chain: {"delay": 0.1, "balance": "0", "txs": []} for chain in ght.CHAIN_IDS}
+
+    async def fake_aget_json(url, params=None, **kwargs):
+        chain = chains[ID_TO_CHAIN[params["chainid"]]]
+        await asyncio.sleep(chain["delay"])
+        if chain.get("fail"):
+            return {"status": "0", "message": "NOTOK", "result": chain["fail"]}
+        if params["action"] == "balance":
+            return {"status": "1", "result": chain["balance"]}
+        return {"status": "1", "result": chain["txs"]}
+
+    def no_tip(url, **kwargs):
+        raise ConnectionError("no tip")
+
+    monkeypatch.setattr(ght, "ETHERSCAN_API_KEY", "test")
+    monkeypatch.setattr(ght.http_client, "aget_json", fake_aget_json)
+    monkeypatch.setattr(ght.http_client, "get_json", no_tip)
+    return chains
+
+
+def test_sweep_takes_as_long_as_slowest_chain(etherscan):
+    etherscan["polygon"].update(delay=0.3, balance="5")
+    etherscan["base"]["txs"] = [{"hash": "0x1", "timeStamp": "1700000000", "blockNumber": "9"}]
+    etherscan["bsc"]["fail"] = "Invalid chain"
+
+    started = time.perf_counter()
+    result = asyncio.run(ght.evm_scan_all_chains_async(EVM_ADDRESS))
+    elapsed = time.perf_counter() - started
+
+    # Serially: 7 chains x 2 legs, ~1.6s
+    assert elapsed < 0.8
+    assert result["active_chains"] == ["base", "polygon"]  # in order of completion
+    assert [s["chain"] for s in result["chains"][:2]] == ["base", "polygon"]
+    assert len(result["chains"]) == len(ght.CHAIN_IDS)
+    bsc = next(s for s in result["chains"] if s["chain"] == "bsc")
+    assert "Invalid chain" in bsc["error"]
+
+
+def test_stream_yields_as_chains_finish(etherscan):
+    for i, chain in enumerate(ght.CHAIN_IDS):
+        etherscan[chain]["delay"] = 0.05 * (len(ght.CHAIN_IDS) - i)
+
+    async def first_chain():
+        async for snapshot in ght.evm_scan_chains_async(EVM_ADDRESS):
+            return snapshot["chain"], time.perf_counter() - started
+
+    started = time.perf_counter()
+    chain, elapsed = asyncio.run(first_chain())
+    assert chain == list(ght.CHAIN_IDS)[-1]
+    assert elapsed < 0.2
+
+
+def test_deadline_reports_slow_chains(etherscan):
+    etherscan["avalanche"]["delay"] = 1.0
+
+    async def sweep():
+        return [s async for s in ght.evm_scan_chains_async(EVM_ADDRESS, deadline=0.3)]
+
+    snapshots = asyncio.run(sweep())
+    slow = [s for s in snapshots if s.get("error")]
+    assert [s["chain"] for s in slow] == ["avalanche"]
+    assert "timed out" in slow[0]["error"]
+    assert len(snapshots) == len(ght.CHAIN_IDS)
@@ -0,0 +1,21 @@
+"""
+Tests for the shared HTTP session.
+"""
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import http_client
+from Seam_CryptoPurr.config import HTTP_USER_AGENT
+
+
+def test_session_is_shared_and_reset_on_close():
+    first = http_client.get_session()
+    assert http_client.get_session() is first
+    assert first.headers["User-Agent"] == HTTP_USER_AGENT
+
+    http_client.close_session()
+    assert http_client.get_session() is not first
+
+
+def test_forked_child_gets_own_session(monkeypatch):
+    parent = http_client.get_session()
+    monkeypatch.setattr(http_client.os, "getpid", lambda: -1)
+    assert http_client.get_session() is not parent
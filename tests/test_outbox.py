@@ -0,0 +1,153 @@
+"""
+Tests for the alert email outbox: single enqueue per alert, delivery over
+a local aiosmtpd stand-in, retry with backoff, no re-send after a crash.
+"""
+
+import functools
+import sqlite3
+import time
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.outbox_sender import drain_outbox
+from Seam_CryptoPurr.sub_agents.helper_func_tools.smtp_tools import SMTPSession
+
+
+def _factory(controller):
+    return functools.partial(
+        SMTPSession, host=controller.hostname, port=controller.port,
+        user=None, password=None, starttls=False,
+    )
+
+
+def test_alert_is_queued_once(alerts_db):
+    alert_id = alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    assert alerts_db.trigger_alert(alert_id, "a@example.com", "s", "b") is True
+    assert alerts_db.trigger_alert(alert_id, "a@example.com", "s", "b") is False
+    assert alerts_db.outbox_stats()["pending"] == 1
+    assert alerts_db.get_active_alerts() == []
+
+
+def test_drain_sends_one_digest_per_recipient(alerts_db, smtp_server):
+    controller, inbox = smtp_server
+    for token in ("btc", "eth"):
+        alert_id = alerts_db.add_alert(token, 1.0, "above", "a@example.com")
+        alerts_db.trigger_alert(alert_id, "a@example.com", f"{token} hit", "body")
+    alert_id = alerts_db.add_alert("sol", 1.0, "above", "b@example.com")
+    alerts_db.trigger_alert(alert_id, "b@example.com", "sol hit", "body")
+
+    result = drain_outbox(max_workers=2, session_factory=_factory(controller))
+
+    assert result == {"sent": 3, "failed": 0, "emails": 2}
+    assert len(inbox.messages) == 2
+    # Nothing left to send on the next drain
+    assert drain_outbox(session_factory=_factory(controller))["sent"] == 0
+
+
+def test_failed_delivery_is_retried_later(alerts_db):
+    alert_id = alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    alerts_db.trigger_alert(alert_id, "a@example.com", "s", "b")
+
+    def unreachable():
+        return SMTPSession(host="127.0.0.1", port=1, user=None, starttls=False, timeout=1)
+
+    result = drain_outbox(session_factory=unreachable)
+
+    assert result["failed"] == 1
+    stats = alerts_db.outbox_stats()
+    assert stats["pending"] == 1
+    # Backoff pushes the retry into the future, so nothing is due right now
+    assert alerts_db.claim_outbox() == []
+
+
+def test_interrupted_delivery_is_not_resent(alerts_db):
+    alert_id = alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    alerts_db.trigger_alert(alert_id, "a@example.com", "s", "b")
+    # A sender claims the row and dies before marking it sent
+    assert len(alerts_db.claim_outbox()) == 1
+
+    assert alerts_db.claim_outbox(lease_seconds=0) == []
+    assert alerts_db.outbox_stats()["failed"] == 1
+
+
+class FlakySession:
+    """Accepts the first message, then fails every send."""
+
+    def __init__(self, accepted):
+        self.accepted = accepted
+
+    def send(self, to, subject, body):
+        if self.accepted:
+            raise OSError("connection reset")
+        self.accepted.append(subject)
+
+    def close(self):
+        pass
+
+
+def test_partial_group_failure_only_retries_unsent(alerts_db):
+    for token in ("btc", "eth"):
+        alert_id = alerts_db.add_alert(token, 1.0, "above", "a@example.com")
+        alerts_db.trigger_alert(alert_id, "a@example.com", f"{token} hit", "body")
+
+    accepted = []
+    result = drain_outbox(digest=False, session_factory=lambda: FlakySession(accepted))
+    assert result == {"sent": 1, "failed": 1, "emails": 1}
+    assert alerts_db.outbox_stats()["sent"] == 1
+
+    # Make the backed-off retry due now: it only holds the unsent row
+    with sqlite3.connect(alerts_db.DB_NAME) as conn:
+        conn.execute("UPDATE outbox SET next_attempt_at=0 WHERE status='pending'")
+    retry = alerts_db.claim_outbox()
+    assert [r["subject"] for r in retry] == ["eth hit"]
+    assert accepted == ["btc hit"]
+
+
+def test_failed_sent_marking_does_not_resend(alerts_db, monkeypatch):
+    from Seam_CryptoPurr.sub_agents.helper_func_tools import outbox_sender
+
+    alert_id = alerts_db.add_alert("btc", 1.0, "above", "a@example.com")
+    alerts_db.trigger_alert(alert_id, "a@example.com", "btc hit", "body")
+
+    def locked(outbox_ids):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(outbox_sender, "mark_outbox_sent", locked)
+    accepted = []
+    result = drain_outbox(digest=False, session_factory=lambda: FlakySession(accepted))
+
+    assert result == {"sent": 1, "failed": 0, "emails": 1}
+    # Not handed back for a retry; failed once its lease lapses
+    assert alerts_db.claim_outbox(lease_seconds=0) == []
+    assert accepted == ["btc hit"]
+
+
+class SlowSession:
+    """Each send takes `delay`; the third checks for expired leases."""
+
+    def __init__(self, alerts_db, delay, lease):
+        self.alerts_db, self.delay, self.lease = alerts_db, delay, lease
+        self.sends = 0
+        self.failed = None
+
+    def send(self, to, subject, body):
+        self.sends += 1
+        time.sleep(self.delay)
+        if self.sends == 3:
+            self.alerts_db.claim_outbox(lease_seconds=self.lease)
+            self.failed = self.alerts_db.outbox_stats()["failed"]
+
+    def close(self):
+        pass
+
+
+def test_lease_is_renewed_during_a_long_drain(alerts_db):
+    for token in ("btc", "eth", "sol"):
+        alert_id = alerts_db.add_alert(token, 1.0, "above", "a@example.com")
+        alerts_db.trigger_alert(alert_id, "a@example.com", f"{token} hit", "body")
+
+    # Each send fits in the lease; the whole drain doesn't
+    session = SlowSession(alerts_db, 0.2, lease=0.3)
+    result = drain_outbox(digest=False, session_factory=lambda: session)
+
+    assert session.failed == 0
+    assert result == {"sent": 3, "failed": 0, "emails": 3}
+    assert alerts_db.outbox_stats()["sent"] == 3
@@ -0,0 +1,112 @@
+"""
+Tests for the concurrent, deadline-bounded portfolio refresh.
+"""
+
+import importlib
+import sqlite3
+import threading
+import time
+
+import pytest
+
+portfolio = importlib.import_module("Seam_CryptoPurr.sub_agents.portfolio_manager_agent")
+
+
+def _btc(i: int) -> str:
+    return f"bc1q{i:038d}"
+
+
+@pytest.fixture
+def portfolio_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio, "DB_PATH", str(tmp_path / "portfolio.db"))
+    portfolio._init_db()
+
+    def add(address, chain, family, balance=None, updated=None):
+        with sqlite3.connect(portfolio.DB_PATH) as conn:
+            conn.execute(
+                "INSERT INTO portfolio (address, chain, family, native_balance, native_unit, last_updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (address, chain, family, balance, None, updated),
+            )
+
+    return add
+
+
+def _addresses(result):
+    return {a["address"]: a for chain in result["by_chain"] for a in chain["addresses"]}
+
+
+def test_btc_scans_run_concurrently_under_family_cap(monkeypatch, portfolio_db):
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def slow_scan(address, balance_only=False):
+        assert balance_only
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return {"native_balance": "10", "native_unit": "sats"}
+
+    monkeypatch.setattr(portfolio, "btc_scan_address", slow_scan)
+    monkeypatch.setitem(portfolio.PORTFOLIO_FAMILY_CONCURRENCY, "btc", 3)
+    for i in range(9):
+        portfolio_db(_btc(i), "btc", "btc")
+
+    started = time.perf_counter()
+    result = portfolio.refresh_and_aggregate_portfolio()
+
+    assert time.perf_counter() - started < 0.6  # serially 0.9s
+    assert peak[0] == 3
+    assert result["by_chain"][0]["total_native"] == "90"
+    with sqlite3.connect(portfolio.DB_PATH) as conn:
+        assert {r[0] for r in conn.execute("SELECT native_balance FROM portfolio")} == {"10"}
+
+
+def test_slow_and_failed_addresses_fall_back_to_stored_balance(monkeypatch, portfolio_db):
+    def scan(address, balance_only=False):
+        if address == _btc(1):
+            time.sleep(0.5)
+        if address == _btc(2):
+            raise RuntimeError("upstream down")
+        return {"native_balance": "7", "native_unit": "sats"}
+
+    monkeypatch.setattr(portfolio, "btc_scan_address", scan)
+    monkeypatch.setattr(portfolio, "PORTFOLIO_REFRESH_DEADLINE", 0.2)
+    portfolio_db(_btc(0), "btc", "btc", "1", 100)
+    portfolio_db(_btc(1), "btc", "btc", "2", 200)
+    portfolio_db(_btc(2), "btc", "btc", "3", 300)
+
+    result = portfolio.refresh_and_aggregate_portfolio()
+    entries = _addresses(result)
+
+    assert "stale" not in entries[_btc(0)]
+    assert entries[_btc(1)]["stale"] and entries[_btc(1)]["native_balance"] == "2"
+    assert entries[_btc(1)]["last_updated"] == 200
+    assert "not refreshed" in entries[_btc(1)]["error"]
+    assert entries[_btc(2)]["error"] == "upstream down"
+    assert entries[_btc(2)]["native_unit"] == "sats"
+    assert result["by_chain"][0]["total_native"] == str(7 + 2 + 3)
+
+
+def test_failed_balance_chunk_falls_back_to_stored_balance(monkeypatch, portfolio_db):
+    def sol_balances(addresses):
+        return {
+            "balances": {},
+            "errors": {a: "getMultipleAccounts: node overloaded" for a in addresses},
+            "upstream_calls": 1,
+        }
+
+    monkeypatch.setattr(portfolio, "sol_get_balances", sol_balances)
+    address = "So1" + "1" * 41
+    portfolio_db(address, "solana", "solana", "500", 100)
+
+    result = portfolio.refresh_and_aggregate_portfolio()
+    entry = _addresses(result)[address]
+
+    assert entry["stale"] and entry["native_balance"] == "500"
+    assert entry["error"] == "getMultipleAccounts: node overloaded"
+    assert entry["native_unit"] == "lamports"
+    assert result["by_chain"][0]["total_native"] == "500"
@@ -0,0 +1,86 @@
+"""
+Tests for per-host token buckets and 429 handling in the HTTP client.
+"""
+
+import pytest
+import requests
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import http_client, rate_limit
+from Seam_CryptoPurr.sub_agents.helper_func_tools.rate_limit import TokenBucket, retry_delay
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bucket_spaces_requests_after_burst():
+    clock = Clock()
+    bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(10)]
+
+    assert waits[:5] == [0] * 5
+    assert all(w == pytest.approx(0.2) for w in waits[5:])
+    assert clock.now == pytest.approx(1.0)
+    assert bucket.stats()["throttled"] == 5
+
+
+def test_unlimited_bucket_still_honours_pause():
+    clock = Clock()
+    bucket = TokenBucket(rate=0, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    bucket.pause(2.5)
+    assert bucket.acquire() == pytest.approx(2.5)
+
+
+def test_retry_delay():
+    assert retry_delay("7", 0) == 7
+    assert retry_delay("100000", 0) == rate_limit.HTTP_BACKOFF_MAX
+    base = rate_limit.HTTP_BACKOFF_BASE
+    assert base * 2 <= retry_delay(None, 2) <= base * 4
+
+
+class FakeResponse(requests.Response):
+    def __init__(self, status, retry_after=None):
+        super().__init__()
+        self.status_code = status
+        self._content, self._content_consumed = b"", True
+        self.url = "https://api.example.test/x"
+        if retry_after is not None:
+            self.headers["Retry-After"] = retry_after
+
+
+def test_get_retries_429_with_retry_after(monkeypatch):
+    responses = [FakeResponse(429, "3"), FakeResponse(200)]
+    pauses = []
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            return responses.pop(0)
+
+    bucket = TokenBucket(rate=0, sleep=lambda s: None)
+    monkeypatch.setattr(bucket, "pause", pauses.append)
+    monkeypatch.setattr(http_client, "bucket_for", lambda host: bucket)
+    monkeypatch.setattr(http_client, "get_session", Session)
+
+    assert http_client.get("https://api.example.test/x").status_code == 200
+    assert pauses == [3.0]
+
+
+def test_get_gives_up_after_max_retries(monkeypatch):
+    class Session:
+        def request(self, method, url, **kwargs):
+            return FakeResponse(429, "0")
+
+    monkeypatch.setattr(http_client, "bucket_for", lambda host: TokenBucket(rate=0))
+    monkeypatch.setattr(http_client, "get_session", Session)
+
+    with pytest.raises(requests.HTTPError):
+        http_client.get("https://api.example.test/x")
@@ -0,0 +1,144 @@
+"""
+Tests for the scan result cache.
+"""
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.scan_cache import ScanCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scanner(cache, tips, calls):
+    @cache.cached("evm", chain_tip=lambda chain: tips[chain])
+    def scan(address, chain="ethereum", limit=20, tool_context=None):
+        calls.append((address, chain, limit))
+        return {"address": address, "chain": chain, "transactions": []}
+
+    return scan
+
+
+def test_hit_until_tip_advances():
+    clock = Clock()
+    # Ethereum's ~12s blocks are slower than the TTL, so its tip is tracked
+    cache = ScanCache(maxsize=10, ttl=10, tip_interval=5, clock=clock)
+    tips, calls = {"ethereum": 100, "polygon": 7}, []
+    scan = _scanner(cache, tips, calls)
+
+    scan("0xa")
+    scan("0xa", chain="ethereum", limit=20)
+    scan("0xa", limit=5)
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+
+    # New block, but the tip is only re-polled after tip_interval
+    tips["ethereum"] = 101
+    scan("0xa")
+    assert len(calls) == 2
+    clock.now = 6
+    scan("0xa")
+    assert len(calls) == 3
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_ttl_and_lru_eviction():
+    clock = Clock()
+    cache = ScanCache(maxsize=2, ttl=10, clock=clock)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_partial_snapshots_not_cached():
+    cache = ScanCache()
+    calls = []
+
+    @cache.cached("btc", default_chain="btc")
+    def scan(address, limit=20):
+        calls.append(address)
+        return {"address": address, "error": "txs: timed out"}
+
+    scan("bc1x")
+    scan("bc1x")
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_returned_snapshot_is_a_copy():
+    cache = ScanCache()
+    cache.put("a", {"transactions": [1]})
+    cache.get("a")["transactions"].append(2)
+    assert cache.get("a") == {"transactions": [1]}
+
+
+def test_balance_only_entries_are_separate():
+    cache = ScanCache()
+    calls = []
+
+    @cache.cached("btc", default_chain="btc")
+    def scan(address, limit=20, balance_only=False):
+        calls.append((limit, balance_only))
+        return {"address": address}
+
+    scan("bc1x", balance_only=True)
+    scan("bc1x", limit=5, balance_only=True)  # limit is irrelevant here
+    scan("bc1x")
+    assert calls == [(20, True), (20, False)]
+
+
+def test_evm_checksum_casing_shares_an_entry():
+    cache = ScanCache()
+    tips, calls = {"ethereum": 1}, []
+    scan = _scanner(cache, tips, calls)
+
+    scan("0xAbCdEf0000000000000000000000000000000001")
+    scan("0xabcdef0000000000000000000000000000000001")
+    assert len(calls) == 1
+
+
+def test_fast_chains_rely_on_the_ttl():
+    clock = Clock()
+    cache = ScanCache(ttl=30, tip_interval=5, clock=clock)
+    polls, calls = [], []
+
+    @cache.cached("evm", chain_tip=lambda chain: polls.append(chain) or len(polls))
+    def scan(address, chain="ethereum", limit=20):
+        calls.append(chain)
+        return {"address": address}
+
+    scan("0xa", chain="arbitrum")
+    clock.now = 10
+    scan("0xa", chain="arbitrum")
+    assert calls == ["arbitrum"] and polls == []
+    clock.now = 31
+    scan("0xa", chain="arbitrum")
+    assert calls == ["arbitrum"] * 2 and polls == []
+
+
+def test_invalid_address_fails_before_the_tip_poll():
+    cache = ScanCache(block_times={})
+    polls = []
+
+    def check(address):
+        if not address.startswith("0x"):
+            raise ValueError("Invalid EVM address")
+
+    @cache.cached("evm", chain_tip=polls.append, check=check)
+    def scan(address, chain="ethereum", limit=20):
+        return {"address": address}
+
+    with pytest.raises(ValueError):
+        scan("nope")
+    assert polls == []
@@ -0,0 +1,56 @@
+"""
+Tests for concurrent scanner legs and partial snapshots.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+
+BTC_ADDRESS = "bc1q" + "x" * 38
+
+
+def test_legs_run_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+    results, errors = ght._run_legs({"a": barrier.wait, "b": barrier.wait})
+    assert set(results) == {"a", "b"} and not errors
+
+
+def test_slow_leg_misses_deadline():
+    started = time.perf_counter()
+    results, errors = ght._run_legs(
+        {"fast": lambda: 1, "slow": lambda: time.sleep(0.5)}, deadline=0.05
+    )
+    assert time.perf_counter() - started < 0.4
+    assert results == {"fast": 1}
+    assert "timed out" in errors["slow"]
+
+
+def test_all_legs_failing_raises():
+    def boom():
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        ght._run_legs({"a": boom, "b": boom})
+
+
+def test_btc_partial_snapshot(monkeypatch):
+    def fake_get_json(url, **kwargs):
+        if url.endswith("/txs"):
+            raise requests.HTTPError("502 Server Error")
+        return {"chain_stats": {"funded_txo_sum": 10, "spent_txo_sum": 4}}
+
+    def no_tip(url, **kwargs):
+        raise requests.ConnectionError("no tip")
+
+    monkeypatch.setattr(ght.http_client, "get_json", fake_get_json)
+    monkeypatch.setattr(ght.http_client, "get", no_tip)
+    snap = ght.btc_scan_address(BTC_ADDRESS)
+
+    assert snap["native_balance"] == "6"
+    assert snap["transactions"] == []
+    assert snap["error"] == "txs: 502 Server Error"
@@ -0,0 +1,126 @@
+"""
+Tests for coalescing identical in-flight upstream calls.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import http_client
+from Seam_CryptoPurr.sub_agents.helper_func_tools.single_flight import SingleFlight
+
+
+class FakeResponse:
+    def __init__(self, url):
+        self.url = url
+
+    def json(self):
+        return {"url": self.url, "pairs": []}
+
+
+@pytest.fixture
+def flights(monkeypatch):
+    flights = SingleFlight()
+    monkeypatch.setattr(http_client, "flights", flights)
+    return flights
+
+
+def test_threads_share_one_request(monkeypatch, flights):
+    sent = []
+
+    def slow_get(url, **kwargs):
+        sent.append(url)
+        time.sleep(0.2)
+        return FakeResponse(url)
+
+    monkeypatch.setattr(http_client, "get", slow_get)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(http_client.get_json("https://x.test/a", {"q": "pepe"})))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sent == ["https://x.test/a"]
+    assert len(results) == 8 and all(r == results[0] for r in results)
+    # Followers get their own copy
+    assert len({id(r) for r in results}) == 8
+    assert flights.stats() == {"calls": 8, "shared": 7, "dedup_ratio": 0.875, "in_flight": 0}
+
+
+def test_coroutines_share_one_request_and_its_error(monkeypatch, flights):
+    sent = []
+
+    async def slow_aget(url, **kwargs):
+        sent.append(url)
+        await asyncio.sleep(0.1)
+        if url.endswith("bad"):
+            raise ValueError("upstream down")
+        return FakeResponse(url)
+
+    monkeypatch.setattr(http_client, "aget", slow_aget)
+
+    async def main():
+        ok = await asyncio.gather(*(http_client.aget_json("https://x.test/a") for _ in range(5)))
+        bad = await asyncio.gather(
+            *(http_client.aget_json("https://x.test/bad") for _ in range(3)),
+            return_exceptions=True,
+        )
+        return ok, bad
+
+    ok, bad = asyncio.run(main())
+    assert sent == ["https://x.test/a", "https://x.test/bad"]
+    assert ok == [{"url": "https://x.test/a", "pairs": []}] * 5
+    assert all(isinstance(e, ValueError) for e in bad)
+    assert flights.stats()["shared"] == 6
+
+
+def test_coroutine_does_not_join_failing_thread(flights):
+    started, release = threading.Event(), threading.Event()
+
+    def leader():
+        started.set()
+        release.wait(2)
+        raise requests.ConnectionError("sync transport down")
+
+    errors = []
+
+    def run_leader():
+        try:
+            flights.do("k", leader)
+        except requests.RequestException as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=run_leader)
+    thread.start()
+    started.wait(2)
+
+    async def own_call():
+        raise httpx.ConnectError("async transport down")
+
+    async def follower():
+        try:
+            # Runs its own call and sees the async transport's error type
+            return await flights.do_async("k", own_call)
+        finally:
+            release.set()
+
+    with pytest.raises(httpx.HTTPError):
+        asyncio.run(follower())
+    thread.join()
+    assert len(errors) == 1
+    assert flights.stats()["shared"] == 0
+
+
+def test_different_params_are_not_coalesced(monkeypatch, flights):
+    monkeypatch.setattr(http_client, "get", lambda url, **kwargs: FakeResponse(url))
+    http_client.get_json("https://x.test/a", {"q": "a"})
+    http_client.get_json("https://x.test/a", {"q": "b"})
+    assert flights.stats()["shared"] == 0
@@ -0,0 +1,44 @@
+"""
+Tests for the persistent SMTP session against a local aiosmtpd stand-in.
+"""
+
+import socket
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.smtp_tools import SMTPSession
+
+
+def _session(controller) -> SMTPSession:
+    return SMTPSession(host=controller.hostname, port=controller.port, user=None, password=None, starttls=False)
+
+
+def test_session_reuses_one_connection(smtp_server):
+    controller, inbox = smtp_server
+    with _session(controller) as smtp:
+        for i in range(5):
+            smtp.send(f"user{i}@example.com", f"subject {i}", "body")
+        assert smtp.connects == 1
+        assert smtp.sent == 5
+    assert len(inbox.messages) == 5
+
+
+def test_session_reconnects_after_drop(smtp_server):
+    controller, inbox = smtp_server
+    with _session(controller) as smtp:
+        smtp.send("a@example.com", "first", "body")
+        # Simulate the server closing an idle connection
+        smtp._server.sock.shutdown(socket.SHUT_RDWR)
+        smtp.send("a@example.com", "second", "body")
+        assert smtp.connects == 2
+    assert len(inbox.messages) == 2
+
+
+def test_digest_combines_alerts_for_recipient(smtp_server):
+    controller, inbox = smtp_server
+    with _session(controller) as smtp:
+        smtp.send_digest("a@example.com", [
+            ("ALERT: BTC price hit target!", "BTC body"),
+            ("ALERT: ETH price hit target!", "ETH body"),
+        ])
+    assert len(inbox.messages) == 1
+    content = inbox.messages[0].content.decode()
+    assert "BTC body" in content and "ETH body" in content
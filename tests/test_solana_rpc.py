@@ -0,0 +1,127 @@
+"""
+Tests for the Solana JSON-RPC backend (against a local stand-in node).
+"""
+
+import asyncio
+import importlib
+import sqlite3
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+portfolio = importlib.import_module("Seam_CryptoPurr.sub_agents.portfolio_manager_agent")
+
+
+def _address(i: int) -> str:
+    return f"So1{i:041d}"
+
+
+def test_balances_chunk_getmultipleaccounts(solana_rpc):
+    addresses = [_address(i) for i in range(250)]
+    solana_rpc.accounts = {a: i for i, a in enumerate(addresses) if i % 7}
+
+    result = ght.sol_get_balances(addresses + addresses[:5])
+
+    assert result["upstream_calls"] == solana_rpc.requests == 3
+    assert not result["errors"]
+    assert result["balances"][_address(8)] == "8"
+    assert result["balances"][_address(7)] == "0"  # no account on chain
+
+
+def test_signatures_batched_per_request(solana_rpc):
+    for i in range(3):
+        solana_rpc.add_signatures(_address(i), count=5 + i)
+
+    result = ght.sol_get_signatures([_address(i) for i in range(3)], limit=6)
+
+    assert solana_rpc.requests == 1 and len(solana_rpc.calls) == 3
+    assert [len(result["signatures"][_address(i)]) for i in range(3)] == [5, 6, 6]
+    assert result["signatures"][_address(0)][0] == {
+        "hash": "So10-5", "timestamp": 1_700_000_005, "status": "finalized",
+    }
+
+
+def test_scan_is_one_request_and_resumes_at_cursor(solana_rpc, tx_db):
+    address = _address(1)
+    solana_rpc.accounts[address] = 42
+    solana_rpc.add_signatures(address, count=3)
+    scan = ght.sol_scan_address.__wrapped__
+
+    first = scan(address)
+    assert solana_rpc.requests == 1
+    assert first["native_balance"] == "42" and first["tx_count"] == 3
+
+    solana_rpc.add_signatures(address, count=2, start=4)
+    second = scan(address)
+    options = solana_rpc.calls[-2]["params"][1]
+    assert options["until"] == "So10-3"
+    assert [tx["hash"] for tx in second["transactions"]] == [f"So10-{s}" for s in range(5, 0, -1)]
+
+
+def test_balance_only_scan_sends_get_balance_alone(solana_rpc, tx_db):
+    address = _address(2)
+    solana_rpc.accounts[address] = 7
+    solana_rpc.add_signatures(address, count=3)
+
+    snap = ght.sol_scan_address.__wrapped__(address, balance_only=True)
+
+    assert [call["method"] for call in solana_rpc.calls] == ["getBalance"]
+    assert snap["native_balance"] == "7" and "tx_count" not in snap
+
+
+def test_full_page_past_cursor_replaces_history(solana_rpc, tx_db):
+    address = _address(1)
+    solana_rpc.add_signatures(address, count=3)
+    scan = ght.sol_scan_address.__wrapped__
+    scan(address, limit=5)
+
+    # More new signatures than `limit`: the stored ones are no longer contiguous
+    solana_rpc.add_signatures(address, count=10, start=4)
+    snap = scan(address, limit=5)
+    assert [tx["hash"] for tx in tx_db.recent("solana", "solana", address, 50)] == [
+        f"So10-{s}" for s in range(13, 8, -1)
+    ]
+    assert snap["tx_count"] == 5
+
+
+def test_deeper_scan_backfills_past_oldest_stored(solana_rpc, tx_db):
+    address = _address(1)
+    solana_rpc.add_signatures(address, count=30)
+    scan = ght.sol_scan_address.__wrapped__
+    scan(address, limit=5)
+
+    solana_rpc.add_signatures(address, count=2, start=31)
+    snap = scan(address, limit=20)
+
+    assert solana_rpc.requests == 2
+    assert solana_rpc.calls[-1]["params"][1] == {"limit": 15, "commitment": "confirmed", "before": "So10-26"}
+    assert [tx["hash"] for tx in snap["transactions"]] == [f"So10-{s}" for s in range(32, 12, -1)]
+
+
+def test_async_scan_matches_sync(solana_rpc, tx_db):
+    address = _address(2)
+    solana_rpc.accounts[address] = 7
+    solana_rpc.add_signatures(address, count=4)
+
+    async def scan():
+        return await ght.sol_scan_address_async.__wrapped__(address)
+
+    snap_async = asyncio.run(scan())
+    assert snap_async == ght.sol_scan_address.__wrapped__(address)
+    assert snap_async["native_balance"] == "7"
+
+
+def test_portfolio_refresh_batches_solana(tmp_path, monkeypatch, solana_rpc):
+    monkeypatch.setattr(portfolio, "DB_PATH", str(tmp_path / "portfolio.db"))
+    portfolio._init_db()
+    addresses = [_address(i) for i in range(150)]
+    solana_rpc.accounts = {a: i for i, a in enumerate(addresses)}
+    with sqlite3.connect(portfolio.DB_PATH) as conn:
+        conn.executemany(
+            "INSERT INTO portfolio (address, chain, family) VALUES (?, 'solana', 'solana')",
+            [(a,) for a in addresses],
+        )
+
+    result = portfolio.refresh_and_aggregate_portfolio()
+
+    assert solana_rpc.requests == 2  # was 300 (account + transactions per address)
+    assert result["by_chain"][0]["total_native"] == str(sum(range(150)))
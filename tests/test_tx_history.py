@@ -0,0 +1,46 @@
+"""
+Tests for the columnar transaction container.
+"""
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools.tx_history import TxHistory
+
+
+def _evm_tx(i, pending=False):
+    return {
+        "hash": f"0x{i:064x}",
+        "from": "0x" + "ab" * 20,
+        "to": "0x" + f"{i % 3:02x}" * 20,
+        "value": str(10 ** 20 + i),
+        "timestamp": None if pending else 1_700_000_000 + i,
+        "status": "failed" if i % 5 == 0 else "success",
+    }
+
+
+def test_round_trips_scanner_dicts():
+    txs = [_evm_tx(3, pending=True)] + [_evm_tx(i) for i in range(20, 0, -1)]
+    history = TxHistory.from_dicts(txs)
+
+    assert history.transfers and len(history) == 21
+    assert history.to_dicts() == txs
+    assert history.to_dicts(limit=2) == txs[:2]
+    assert list(history) == txs
+    assert history.latest_timestamp() == 1_700_000_020
+
+
+def test_btc_shape_has_no_transfer_fields():
+    txs = [
+        {"hash": "b", "timestamp": None, "status": "unconfirmed"},
+        {"hash": "a", "timestamp": 100, "status": "confirmed"},
+    ]
+    history = TxHistory.from_dicts(txs)
+
+    assert history.to_dicts() == txs
+    assert TxHistory.from_dicts([]).latest_timestamp() is None
+
+
+def test_addresses_are_interned():
+    history = TxHistory.from_dicts(
+        {**_evm_tx(i), "from": "".join(["0x", "cd" * 20])} for i in range(3)
+    )
+    assert history.senders[0] is history.senders[2]
+    assert len(history._status_names) == 2
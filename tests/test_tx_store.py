@@ -0,0 +1,123 @@
+"""
+Tests for incremental transaction sync.
+"""
+
+import pytest
+
+from Seam_CryptoPurr.sub_agents.helper_func_tools import general_helper_tools as ght
+
+EVM_ADDRESS = "0x" + "AB" * 20
+BTC_ADDRESS = "bc1q" + "x" * 38
+
+
+def _evm_tx(block):
+    return {"hash": f"0x{block}", "blockNumber": str(block), "timeStamp": str(1_700_000_000 + block)}
+
+
+@pytest.fixture
+def etherscan(monkeypatch):
+    chain = {"txs": [_evm_tx(b) for b in range(1, 31)], "calls": []}
+
+    def fake_get_json(url, params=None, **kwargs):
+        if params["action"] == "balance":
+            return {"status": "1", "result": "5"}
+        chain["calls"].append(params)
+        newer = [t for t in chain["txs"] if int(t["blockNumber"]) >= params["startblock"]]
+        newer.sort(key=lambda t: -int(t["blockNumber"]))
+        return {"status": "1", "result": newer[:params["offset"]]}
+
+    monkeypatch.setattr(ght, "ETHERSCAN_API_KEY", "test")
+    monkeypatch.setattr(ght.http_client, "get_json", fake_get_json)
+    return chain
+
+
+def test_evm_fetches_from_cursor(etherscan, tx_db):
+    scan = ght.evm_scan_address.__wrapped__
+
+    first = scan(EVM_ADDRESS, limit=20)
+    assert [t["hash"] for t in first["transactions"][:2]] == ["0x30", "0x29"]
+    assert tx_db.get_cursor("evm", "ethereum", EVM_ADDRESS.lower()) == "30"
+
+    etherscan["txs"] += [_evm_tx(31), _evm_tx(32)]
+    second = scan(EVM_ADDRESS, limit=20)
+
+    assert etherscan["calls"][-1]["startblock"] == 30
+    assert [t["hash"] for t in second["transactions"][:3]] == ["0x32", "0x31", "0x30"]
+    assert second["tx_count"] == 20
+    assert second["latest_timestamp"] == 1_700_000_032
+
+
+def test_evm_deeper_scan_backfills(etherscan, tx_db):
+    etherscan["txs"] = [_evm_tx(b) for b in range(1, 101)]
+    scan = ght.evm_scan_address.__wrapped__
+
+    scan(EVM_ADDRESS, limit=5)
+    snap = scan(EVM_ADDRESS, limit=50)
+
+    assert etherscan["calls"][-1]["startblock"] == 0
+    assert [t["hash"] for t in snap["transactions"]] == [f"0x{b}" for b in range(100, 50, -1)]
+
+
+def test_evm_gap_past_cursor_replaces_history(etherscan, tx_db):
+    etherscan["txs"] = [_evm_tx(b) for b in range(1, 101)]
+    scan = ght.evm_scan_address.__wrapped__
+    scan(EVM_ADDRESS, limit=5)
+
+    # More new txs than `limit`: a page from the cursor can't reach it
+    etherscan["txs"] += [_evm_tx(b) for b in range(101, 121)]
+    scan(EVM_ADDRESS, limit=5)
+    assert [t["hash"] for t in tx_db.recent("evm", "ethereum", EVM_ADDRESS.lower(), 50)] == [
+        f"0x{b}" for b in range(120, 115, -1)
+    ]
+
+    snap = scan(EVM_ADDRESS, limit=30)
+    assert [t["hash"] for t in snap["transactions"]] == [f"0x{b}" for b in range(120, 90, -1)]
+
+
+def test_evm_growing_limit_after_new_activity_stays_contiguous(etherscan, tx_db):
+    etherscan["txs"] = [_evm_tx(b) for b in range(1, 6)]
+    scan = ght.evm_scan_address.__wrapped__
+    scan(EVM_ADDRESS, limit=5)
+
+    etherscan["txs"] += [_evm_tx(b) for b in range(6, 106)]
+    scan(EVM_ADDRESS, limit=20)
+    snap = scan(EVM_ADDRESS, limit=22)
+
+    assert [t["hash"] for t in snap["transactions"]] == [f"0x{b}" for b in range(105, 83, -1)]
+
+
+def test_btc_stops_at_cursor_and_refreshes_pending(monkeypatch, tx_db):
+    def tx(txid, height=None):
+        status = {"confirmed": height is not None, "block_time": height}
+        return {"txid": txid, "status": status}
+
+    pages = [
+        [tx("p1"), tx("c2", 2), tx("c1", 1)],
+        # p1 was replaced by p2; c3 confirmed since
+        [tx("p2"), tx("c3", 3), tx("c2", 2), tx("c1", 1)],
+    ]
+
+    def fake_get_json(url, **kwargs):
+        if url.endswith("/txs"):
+            return pages.pop(0)
+        return {"chain_stats": {}}
+
+    monkeypatch.setattr(ght.http_client, "get_json", fake_get_json)
+    written = []
+    monkeypatch.setattr(ght.tx_store, "sync", _counting(tx_db.sync, written))
+    scan = ght.btc_scan_address.__wrapped__
+
+    scan(BTC_ADDRESS)
+    snap = scan(BTC_ADDRESS)
+
+    assert written == [3, 2]  # second scan stops at c2
+    assert [t["hash"] for t in snap["transactions"]] == ["p2", "c3", "c2", "c1"]
+
+
+def _counting(sync, written):
+    def wrapper(*args, **kwargs):
+        n = sync(*args, **kwargs)
+        written.append(n)
+        return n
+
+    return wrapper